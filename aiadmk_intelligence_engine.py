@@ -7,12 +7,31 @@ Complete automated intelligence system for AIADMK political monitoring
 import os
 import asyncio
 import logging
+import logging.handlers
+import queue
+import atexit
 import json
+import time
 from typing import Dict, List, Optional, Any
+from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
-from concurrent.futures import ThreadPoolExecutor
 import signal
 import sys
+import httpx
+
+# Optional libuv-based event loop
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# Optional fast JSON serializer
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Import all components
 from config import get_config, validate_system_config
@@ -28,26 +47,75 @@ from scrapers.twitter_scraper import get_twitter_scraper
 from scrapers.reddit_scraper import get_reddit_scraper
 from scrapers.tamil_news_processor import get_tamil_news_processor
 
-# Configure logging
+# Configure logging - records are formatted on the caller's thread and
+# written to stdout/file by a background listener so the event loop never
+# blocks on log I/O
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue,
+    logging.StreamHandler(sys.stdout),
+    logging.FileHandler('logs/aiadmk_intelligence.log', encoding='utf-8')
+)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('logs/aiadmk_intelligence.log', encoding='utf-8')
-    ]
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
 )
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 logger = logging.getLogger(__name__)
 
+_BANNER = "🏛️ " + "=" * 60
+
+@dataclass(slots=True)
+class PlatformStats:
+    """Per-platform scraping counters"""
+    runs: int = 0
+    content: int = 0
+    errors: int = 0
+
+def _dump_json(data: Any) -> str:
+    """Pretty-print data as JSON, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data, indent=2, ensure_ascii=False, default=str)
+
+async def _capture_exception(coro):
+    """Await a coroutine, returning any exception instead of raising it"""
+    try:
+        return await coro
+    except Exception as e:
+        return e
+
+# Result key holding the AIADMK content count for each platform
+CONTENT_KEY = {
+    'facebook': 'aiadmk_posts',
+    'youtube': 'aiadmk_videos',
+    'instagram': 'aiadmk_posts',
+    'twitter': 'aiadmk_tweets',
+    'reddit': 'aiadmk_posts',
+    'tamil_news': 'aiadmk_articles'
+}
+
+# Name under which ConfigManager.get_enabled_platforms() reports a scraper,
+# where it differs from the scraper's own platform name
+ENABLED_PLATFORM_KEY = {
+    'tamil_news': 'news_crawl'
+}
+
 class AIADMKIntelligenceEngine:
     """Complete AIADMK Political Intelligence System"""
     
     def __init__(self):
         self.config = get_config()
+        self._max_concurrent = self.config.system['max_concurrent_scrapers']
+        self._batch_size = self.config.system['batch_size']
         self.db = None
+        self.http_session = None
         self.running = False
-        self.executor = ThreadPoolExecutor(max_workers=self.config.system['max_concurrent_scrapers'])
+        self._shut_down = False
+        self._stop_event = asyncio.Event()
         
         # Initialize all scrapers
         self.scrapers = {
@@ -59,6 +127,12 @@ class AIADMKIntelligenceEngine:
             'tamil_news': get_tamil_news_processor()
         }
         
+        # Monitoring entry point per platform, resolved once
+        self._monitor_fns = {
+            platform: getattr(scraper, f'run_{platform}_monitoring', None)
+            for platform, scraper in self.scrapers.items()
+        }
+        
         # Discovery services
         self.discovery_services = {
             'serpapi': None,
@@ -74,8 +148,7 @@ class AIADMKIntelligenceEngine:
             'last_run_time': None,
             'total_content_discovered': 0,
             'total_content_processed': 0,
-            'platform_stats': {platform: {'runs': 0, 'content': 0, 'errors': 0} 
-                             for platform in self.scrapers.keys()}
+            'platform_stats': {platform: PlatformStats() for platform in self.scrapers.keys()}
         }
         
         logger.info("🏛️ AIADMK Political Intelligence System initialized")
@@ -93,10 +166,19 @@ class AIADMKIntelligenceEngine:
             # Initialize database
             self.db = await get_database()
             
+            # One HTTP client (and connection pool) shared by all discovery services
+            self.http_session = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=200,
+                    max_keepalive_connections=32,
+                    keepalive_expiry=75
+                )
+            )
+            
             # Initialize discovery services
-            self.discovery_services['serpapi'] = await get_serpapi_service()
-            self.discovery_services['brave'] = await get_brave_service()
-            self.discovery_services['firecrawl'] = await get_firecrawl_service()
+            self.discovery_services['serpapi'] = await get_serpapi_service(session=self.http_session)
+            self.discovery_services['brave'] = await get_brave_service(session=self.http_session)
+            self.discovery_services['firecrawl'] = await get_firecrawl_service(session=self.http_session)
             
             # Create logs directory
             os.makedirs('logs', exist_ok=True)
@@ -105,7 +187,7 @@ class AIADMKIntelligenceEngine:
             return True
             
         except Exception as e:
-            logger.error(f"❌ Initialization failed: {e}")
+            logger.error("❌ Initialization failed: %s", e)
             return False
     
     async def run_content_discovery_cycle(self) -> Dict[str, Any]:
@@ -121,12 +203,16 @@ class AIADMKIntelligenceEngine:
         
         try:
             # Parallel content discovery
-            serpapi_task = self.discovery_services['serpapi'].discover_aiadmk_content()
-            brave_task = self.discovery_services['brave'].automated_aiadmk_monitoring()
+            async with asyncio.TaskGroup() as tg:
+                serpapi_task = tg.create_task(_capture_exception(
+                    self.discovery_services['serpapi'].discover_aiadmk_content()
+                ))
+                brave_task = tg.create_task(_capture_exception(
+                    self.discovery_services['brave'].automated_aiadmk_monitoring()
+                ))
             
-            serpapi_result, brave_result = await asyncio.gather(
-                serpapi_task, brave_task, return_exceptions=True
-            )
+            serpapi_result = serpapi_task.result()
+            brave_result = brave_task.result()
             
             # Process SerpAPI results
             if not isinstance(serpapi_result, Exception) and serpapi_result.get('total_urls_found', 0) > 0:
@@ -154,20 +240,24 @@ class AIADMKIntelligenceEngine:
             
             self.metrics['total_content_discovered'] += discovery_results['total_urls_discovered']
             
-            logger.info(f"✅ Content discovery completed: {discovery_results['total_urls_discovered']} URLs discovered")
+            logger.info("✅ Content discovery completed: %d URLs discovered", discovery_results['total_urls_discovered'])
             return discovery_results
             
         except Exception as e:
-            logger.error(f"Content discovery cycle failed: {e}")
+            logger.error("Content discovery cycle failed: %s", e)
             discovery_results['errors'].append(str(e))
             return discovery_results
     
     async def run_platform_scraping_cycle(self) -> Dict[str, Any]:
         """Run scraping cycle for all platforms"""
-        logger.info("🔄 Starting platform scraping cycle...")
+        enabled_platforms = set(self.config.get_enabled_platforms())
+        platforms = {
+            platform: monitor_fn for platform, monitor_fn in self._monitor_fns.items()
+            if ENABLED_PLATFORM_KEY.get(platform, platform) in enabled_platforms
+        }
         
         scraping_results = {
-            'total_platforms': len(self.scrapers),
+            'total_platforms': len(platforms),
             'successful_platforms': 0,
             'failed_platforms': 0,
             'platform_results': {},
@@ -175,95 +265,92 @@ class AIADMKIntelligenceEngine:
             'errors': []
         }
         
-        # Create scraping tasks for all platforms
+        if not platforms:
+            logger.debug("No scraping platforms enabled, skipping scraping cycle")
+            return scraping_results
+        
+        logger.info("🔄 Starting platform scraping cycle...")
+        
+        # Create scraping tasks for all enabled platforms
         scraping_tasks = {}
-        for platform, scraper in self.scrapers.items():
+        for platform, monitor_fn in platforms.items():
             try:
-                if hasattr(scraper, 'run_facebook_monitoring'):
-                    scraping_tasks[platform] = scraper.run_facebook_monitoring()
-                elif hasattr(scraper, 'run_youtube_monitoring'):
-                    scraping_tasks[platform] = scraper.run_youtube_monitoring()
-                elif hasattr(scraper, 'run_instagram_monitoring'):
-                    scraping_tasks[platform] = scraper.run_instagram_monitoring()
-                elif hasattr(scraper, 'run_twitter_monitoring'):
-                    scraping_tasks[platform] = scraper.run_twitter_monitoring()
-                elif hasattr(scraper, 'run_reddit_monitoring'):
-                    scraping_tasks[platform] = scraper.run_reddit_monitoring()
-                elif hasattr(scraper, 'run_tamil_news_monitoring'):
-                    scraping_tasks[platform] = scraper.run_tamil_news_monitoring()
-                else:
-                    logger.warning(f"⚠️ No monitoring method found for {platform}")
+                if monitor_fn is None:
+                    logger.warning("⚠️ No monitoring method found for %s", platform)
                     continue
                 
-                logger.info(f"📱 Queued {platform} scraper")
+                scraping_tasks[platform] = monitor_fn()
+                
+                logger.info("📱 Queued %s scraper", platform)
                 
             except Exception as e:
-                logger.error(f"Failed to queue {platform} scraper: {e}")
+                logger.error("Failed to queue %s scraper: %s", platform, e)
                 scraping_results['errors'].append(f"{platform}: {str(e)}")
         
-        # Execute scraping tasks with limited concurrency
-        semaphore = asyncio.Semaphore(self.config.system['max_concurrent_scrapers'])
-        
+        # Concurrency is bounded by the scrapers' own connection pools
         async def run_scraper(platform: str, task):
-            async with semaphore:
-                try:
-                    logger.info(f"🚀 Starting {platform} scraper...")
-                    result = await task
-                    
-                    self.metrics['platform_stats'][platform]['runs'] += 1
+            pstats = self.metrics['platform_stats'][platform]
+            try:
+                logger.info("🚀 Starting %s scraper...", platform)
+                result = await task
+                
+                pstats.runs += 1
+                
+                if result.get('success'):
+                    scraping_results['successful_platforms'] += 1
                     
-                    if result.get('success'):
-                        scraping_results['successful_platforms'] += 1
-                        
-                        # Extract content counts
-                        content_count = 0
-                        if 'scraping' in result:
-                            content_count = result['scraping'].get('aiadmk_posts', 0) or result['scraping'].get('aiadmk_videos', 0) or result['scraping'].get('aiadmk_tweets', 0) or result['scraping'].get('aiadmk_articles', 0) or 0
-                        elif 'processing' in result:
-                            content_count = result['processing'].get('aiadmk_articles', 0)
-                        
-                        self.metrics['platform_stats'][platform]['content'] += content_count
-                        scraping_results['total_content_processed'] += content_count
-                        
-                        logger.info(f"✅ {platform.upper()} scraping completed: {content_count} items processed")
-                    else:
-                        scraping_results['failed_platforms'] += 1
-                        self.metrics['platform_stats'][platform]['errors'] += 1
-                        error_msg = result.get('error', 'Unknown error')
-                        scraping_results['errors'].append(f"{platform}: {error_msg}")
-                        logger.error(f"❌ {platform.upper()} scraping failed: {error_msg}")
+                    # Extract content counts
+                    section = result.get('scraping') or result.get('processing') or {}
+                    content_count = section.get(CONTENT_KEY[platform], 0)
                     
-                    scraping_results['platform_results'][platform] = result
-                    return result
+                    pstats.content += content_count
+                    scraping_results['total_content_processed'] += content_count
                     
-                except Exception as e:
+                    logger.info("✅ %s scraping completed: %d items processed", platform.upper(), content_count)
+                else:
                     scraping_results['failed_platforms'] += 1
-                    self.metrics['platform_stats'][platform]['errors'] += 1
-                    error_msg = str(e)
+                    pstats.errors += 1
+                    error_msg = result.get('error', 'Unknown error')
                     scraping_results['errors'].append(f"{platform}: {error_msg}")
-                    logger.error(f"❌ {platform.upper()} scraper exception: {error_msg}")
-                    return {'success': False, 'error': error_msg}
+                    logger.error("❌ %s scraping failed: %s", platform.upper(), error_msg)
+                
+                scraping_results['platform_results'][platform] = result
+                return result
+                
+            except Exception as e:
+                scraping_results['failed_platforms'] += 1
+                pstats.errors += 1
+                error_msg = str(e)
+                scraping_results['errors'].append(f"{platform}: {error_msg}")
+                logger.error("❌ %s scraper exception: %s", platform.upper(), error_msg)
+                return {'success': False, 'error': error_msg}
         
-        # Execute all scrapers
+        # Execute all scrapers; run_scraper handles its own errors, so the
+        # group is only torn down by cancellation (e.g. shutdown)
         if scraping_tasks:
-            await asyncio.gather(*[
-                run_scraper(platform, task) 
-                for platform, task in scraping_tasks.items()
-            ], return_exceptions=True)
+            async with asyncio.TaskGroup() as tg:
+                for platform, task in scraping_tasks.items():
+                    tg.create_task(run_scraper(platform, task))
         
         self.metrics['total_content_processed'] += scraping_results['total_content_processed']
         
-        logger.info(f"✅ Platform scraping cycle completed: {scraping_results['successful_platforms']}/{scraping_results['total_platforms']} platforms successful, {scraping_results['total_content_processed']} items processed")
+        logger.info(
+            "✅ Platform scraping cycle completed: %d/%d platforms successful, %d items processed",
+            scraping_results['successful_platforms'],
+            scraping_results['total_platforms'],
+            scraping_results['total_content_processed']
+        )
         return scraping_results
     
     async def run_intelligence_cycle(self) -> Dict[str, Any]:
         """Run complete intelligence gathering cycle"""
         cycle_start = datetime.now()
+        cycle_t0 = time.monotonic()
         self.metrics['total_runs'] += 1
         
-        logger.info("🏛️ " + "="*60)
+        logger.info(_BANNER)
         logger.info("🏛️  AIADMK POLITICAL INTELLIGENCE CYCLE STARTED")
-        logger.info("🏛️ " + "="*60)
+        logger.info(_BANNER)
         
         cycle_results = {
             'cycle_id': f"cycle_{int(cycle_start.timestamp())}",
@@ -279,18 +366,16 @@ class AIADMKIntelligenceEngine:
         }
         
         try:
-            # Phase 1: Content Discovery
-            logger.info("📊 PHASE 1: Content Discovery")
-            discovery_results = await self.run_content_discovery_cycle()
+            # Content discovery and platform scraping run side by side; scrapers
+            # work from known seeds plus whatever is already in the URL queue,
+            # so URLs discovered now are picked up on the next cycle
+            logger.info("📊 PHASE 1+2: Content Discovery & Platform Scraping")
+            discovery_results, scraping_results = await asyncio.gather(
+                self.run_content_discovery_cycle(),
+                self.run_platform_scraping_cycle()
+            )
             cycle_results['discovery'] = discovery_results
             cycle_results['total_content_discovered'] = discovery_results['total_urls_discovered']
-            
-            # Small delay to allow URLs to be queued
-            await asyncio.sleep(5)
-            
-            # Phase 2: Platform Scraping
-            logger.info("📊 PHASE 2: Platform Scraping")
-            scraping_results = await self.run_platform_scraping_cycle()
             cycle_results['scraping'] = scraping_results
             cycle_results['total_content_processed'] = scraping_results['total_content_processed']
             
@@ -313,31 +398,31 @@ class AIADMKIntelligenceEngine:
         except Exception as e:
             self.metrics['failed_runs'] += 1
             error_msg = f"Intelligence cycle failed: {str(e)}"
-            logger.error(f"❌ {error_msg}")
+            logger.error("❌ %s", error_msg)
             cycle_results['errors'].append(error_msg)
             cycle_results['success'] = False
         
         # Finalize cycle metrics
-        cycle_end = datetime.now()
-        cycle_results['end_time'] = cycle_end.isoformat()
-        cycle_results['duration_seconds'] = (cycle_end - cycle_start).total_seconds()
-        self.metrics['last_run_time'] = cycle_end.isoformat()
+        cycle_results['duration_seconds'] = time.monotonic() - cycle_t0
+        cycle_results['end_time'] = datetime.now().isoformat()
+        self.metrics['last_run_time'] = cycle_results['end_time']
         
         # Log summary
-        logger.info("🏛️ " + "="*60)
-        logger.info(f"🏛️  CYCLE SUMMARY - Duration: {cycle_results['duration_seconds']:.1f}s")
-        logger.info(f"🏛️  Content Discovered: {cycle_results['total_content_discovered']}")
-        logger.info(f"🏛️  Content Processed: {cycle_results['total_content_processed']}")
-        logger.info(f"🏛️  Success: {'✅ YES' if cycle_results['success'] else '❌ NO'}")
-        if cycle_results['errors']:
-            logger.info(f"🏛️  Errors: {len(cycle_results['errors'])}")
-        logger.info("🏛️ " + "="*60)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(_BANNER)
+            logger.info("🏛️  CYCLE SUMMARY - Duration: %.1fs", cycle_results['duration_seconds'])
+            logger.info("🏛️  Content Discovered: %d", cycle_results['total_content_discovered'])
+            logger.info("🏛️  Content Processed: %d", cycle_results['total_content_processed'])
+            logger.info("🏛️  Success: %s", '✅ YES' if cycle_results['success'] else '❌ NO')
+            if cycle_results['errors']:
+                logger.info("🏛️  Errors: %d", len(cycle_results['errors']))
+            logger.info(_BANNER)
         
         return cycle_results
     
     async def run_continuous_monitoring(self, cycle_interval_minutes: int = 60):
         """Run continuous intelligence monitoring"""
-        logger.info(f"🔄 Starting continuous monitoring (cycle every {cycle_interval_minutes} minutes)...")
+        logger.info("🔄 Starting continuous monitoring (cycle every %d minutes)...", cycle_interval_minutes)
         self.running = True
         
         cycle_count = 0
@@ -345,26 +430,31 @@ class AIADMKIntelligenceEngine:
         try:
             while self.running:
                 cycle_count += 1
-                logger.info(f"🔄 Starting monitoring cycle #{cycle_count}")
+                logger.info("🔄 Starting monitoring cycle #%d", cycle_count)
                 
                 # Run intelligence cycle
                 cycle_results = await self.run_intelligence_cycle()
                 
                 # Log cycle completion
                 status = "✅ SUCCESS" if cycle_results['success'] else "❌ FAILED"
-                logger.info(f"📊 Cycle #{cycle_count} completed: {status}")
+                logger.info("📊 Cycle #%d completed: %s", cycle_count, status)
                 
                 if not self.running:
                     break
                 
-                # Wait for next cycle
-                logger.info(f"⏱️ Waiting {cycle_interval_minutes} minutes until next cycle...")
-                await asyncio.sleep(cycle_interval_minutes * 60)
+                # Wait for next cycle, waking early if shutdown is requested
+                logger.info("⏱️ Waiting %d minutes until next cycle...", cycle_interval_minutes)
+                try:
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=cycle_interval_minutes * 60)
+                except asyncio.TimeoutError:
+                    pass
+                if self._stop_event.is_set():
+                    break
                 
         except KeyboardInterrupt:
             logger.info("🛑 Monitoring stopped by user")
         except Exception as e:
-            logger.error(f"❌ Continuous monitoring failed: {e}")
+            logger.error("❌ Continuous monitoring failed: %s", e)
         finally:
             self.running = False
     
@@ -384,31 +474,43 @@ class AIADMKIntelligenceEngine:
                 'total_processed': self.metrics['total_content_processed'],
                 'database_stats': db_stats
             },
-            'platform_stats': self.metrics['platform_stats'],
+            # Snapshot so callers see stable values while scrapers keep counting
+            'platform_stats': {
+                platform: asdict(stats)
+                for platform, stats in self.metrics['platform_stats'].items()
+            },
             'configuration': {
                 'enabled_platforms': self.config.get_enabled_platforms(),
-                'max_concurrent_scrapers': self.config.system['max_concurrent_scrapers'],
-                'batch_size': self.config.system['batch_size']
+                'max_concurrent_scrapers': self._max_concurrent,
+                'batch_size': self._batch_size
             }
         }
     
     async def shutdown(self):
         """Graceful system shutdown"""
+        if self._shut_down:
+            return
+        self._shut_down = True
+        
         logger.info("🛑 Shutting down AIADMK Intelligence System...")
         self.running = False
+        self._stop_event.set()
         
         # Close all services
         try:
             await close_serpapi_service()
             await close_brave_service()
             await close_firecrawl_service()
-            await close_database()
             
-            self.executor.shutdown(wait=True)
+            if self.http_session:
+                await self.http_session.aclose()
+                self.http_session = None
+            
+            await close_database()
             
             logger.info("✅ AIADMK Intelligence System shutdown completed")
         except Exception as e:
-            logger.error(f"❌ Shutdown error: {e}")
+            logger.error("❌ Shutdown error: %s", e)
 
 # Global engine instance
 intelligence_engine = None
@@ -420,29 +522,32 @@ def get_intelligence_engine():
         intelligence_engine = AIADMKIntelligenceEngine()
     return intelligence_engine
 
-# Signal handlers for graceful shutdown
-def signal_handler(signum, frame):
-    logger.info(f"🛑 Received signal {signum}, initiating shutdown...")
-    if intelligence_engine:
-        asyncio.create_task(intelligence_engine.shutdown())
-    sys.exit(0)
+# Signal handling for graceful shutdown
+async def _graceful_stop(engine: AIADMKIntelligenceEngine, signum: int):
+    """Stop the monitoring loop and release all services"""
+    logger.info("🛑 Received signal %s, initiating shutdown...", signum)
+    engine.running = False
+    await engine.shutdown()
 
 # Main execution
 async def main():
     """Main execution function"""
-    # Set up signal handlers
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
-    
     engine = get_intelligence_engine()
     
+    # Set up signal handlers on the running loop so shutdown actually gets to run
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(
+            signum, lambda s=signum: asyncio.create_task(_graceful_stop(engine, s))
+        )
+    
     if await engine.initialize():
         try:
             # Run single cycle or continuous monitoring based on args
             if len(sys.argv) > 1 and sys.argv[1] == "--single-cycle":
                 logger.info("🔄 Running single intelligence cycle...")
                 result = await engine.run_intelligence_cycle()
-                print(json.dumps(result, indent=2, ensure_ascii=False))
+                print(_dump_json(result))
             else:
                 # Run continuous monitoring (default)
                 await engine.run_continuous_monitoring(cycle_interval_minutes=30)
@@ -453,4 +558,6 @@ async def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    if UVLOOP_AVAILABLE:
+        uvloop.install()
     asyncio.run(main())
\ No newline at end of file
@@ -7,9 +7,28 @@ Removes old AIADMK-specific tables and prepares for multi-competitor schema
 import asyncio
 import os
 import sys
+import json
 import logging
-from typing import List, Dict
-from dotenv import load_dotenv
+import contextlib
+from typing import List, Dict, Optional, Set
+from env import load_env
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import zstandard as zstd
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Rows serialized per file write in JSON Lines backups
+BACKUP_WRITE_CHUNK = 1000
+# Row batches buffered between the cursor and the writer thread
+BACKUP_QUEUE_DEPTH = 4
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -17,19 +36,44 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from database.connection import DatabaseConnection
 
 # Load environment variables
-load_dotenv()
+load_env()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _quote_ident(name: str) -> str:
+    """Quote a SQL identifier (same rules as asyncpg.utils._quote_ident)"""
+    return '"' + name.replace('"', '""') + '"'
+
+def _backup_sink(raw, compress: bool):
+    """Wrap an open binary backup file in a zstd stream writer when compressing"""
+    if compress:
+        return zstd.ZstdCompressor(level=3, threads=-1).stream_writer(raw, closefd=False)
+    return contextlib.nullcontext(raw)
+
+def _write_rows(f, rows: List[Dict]) -> None:
+    """Serialize and write one batch of rows (runs in a worker thread)"""
+    f.write(b''.join(_json_line(row) for row in rows))
+
+def _json_line(record: Dict) -> bytes:
+    """Serialize one row as a JSON Lines entry"""
+    if ORJSON_AVAILABLE:
+        # datetime/UUID are encoded natively; default=str only sees rarer types like Decimal
+        return orjson.dumps(
+            record, default=str,
+            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NAIVE_UTC
+        )
+    return (json.dumps(record, default=str, ensure_ascii=False) + "\n").encode('utf-8')
+
 class SupabaseCleanup:
     """
     Handles cleanup of old Supabase tables
     """
     
     def __init__(self):
-        self.db = DatabaseConnection()
+        # Cleanup leaves no session state behind, so skip the per-release reset round trip
+        self.db = DatabaseConnection(reset_on_release=False)
         
         # Tables that should be removed (old AIADMK-specific structure)
         self.tables_to_remove = [
@@ -64,6 +108,21 @@ class SupabaseCleanup:
             'update_analytics_summary',
             'process_discovery_results'
         ]
+        
+        # Only these names may ever be interpolated into DDL/DML
+        self._all_known_names = frozenset(
+            self.tables_to_remove + self.views_to_remove + self.functions_to_remove
+        )
+    
+    def _ident(self, name: str) -> str:
+        """Return the quoted identifier for a whitelisted table/view/function name"""
+        if name not in self._all_known_names:
+            raise ValueError(f"Refusing to touch unknown object: {name!r}")
+        return _quote_ident(name)
+    
+    def _ident_list(self, names: List[str]) -> str:
+        """Comma-separated, schema-qualified quoted identifiers for a DROP statement"""
+        return ', '.join(f"public.{self._ident(name)}" for name in names)
     
     async def connect(self):
         """Connect to database"""
@@ -78,11 +137,12 @@ class SupabaseCleanup:
     async def list_existing_tables(self) -> List[str]:
         """List all existing tables in the database"""
         query = """
-        SELECT table_name 
-        FROM information_schema.tables 
-        WHERE table_schema = 'public' 
-        AND table_type = 'BASE TABLE'
-        ORDER BY table_name;
+        SELECT c.relname AS table_name
+        FROM pg_catalog.pg_class c
+        JOIN pg_catalog.pg_namespace n ON c.relnamespace = n.oid
+        WHERE n.nspname = 'public'
+        AND c.relkind IN ('r', 'p')
+        ORDER BY 1;
         """
         
         results = await self.db.execute_query(query)
@@ -97,10 +157,12 @@ class SupabaseCleanup:
     async def list_existing_views(self) -> List[str]:
         """List all existing views in the database"""
         query = """
-        SELECT table_name 
-        FROM information_schema.views 
-        WHERE table_schema = 'public'
-        ORDER BY table_name;
+        SELECT c.relname AS table_name
+        FROM pg_catalog.pg_class c
+        JOIN pg_catalog.pg_namespace n ON c.relnamespace = n.oid
+        WHERE n.nspname = 'public'
+        AND c.relkind = 'v'
+        ORDER BY 1;
         """
         
         results = await self.db.execute_query(query)
@@ -112,55 +174,137 @@ class SupabaseCleanup:
         
         return views
     
-    async def backup_table_data(self, table_name: str, backup_dir: str = "backups") -> bool:
+    async def backup_table_data(self, table_name: str, backup_dir: str = "backups",
+                                backup_format: str = 'csv', compress: bool = False,
+                                known_nonempty: bool = False) -> bool:
         """
-        Create a backup of table data before deletion
+        Create a backup of table data before deletion.
+        'csv' streams the table with COPY TO STDOUT straight into the file;
+        'jsonl' streams rows through a server-side cursor as JSON Lines.
+        Either way memory use stays bounded regardless of table size.
+        With compress=True (and zstandard installed) the output is a .zst stream.
+        known_nonempty=True skips the existence/emptiness probes (see backup_tables).
         """
         try:
             os.makedirs(backup_dir, exist_ok=True)
             
-            # Check if table exists and has data
-            count_query = f"SELECT COUNT(*) as count FROM {table_name}"
-            count_result = await self.db.execute_query(count_query)
-            record_count = count_result[0]['count']
+            table_ident = self._ident(table_name)
             
-            if record_count == 0:
-                logger.info(f"Table {table_name} is empty, skipping backup")
-                return True
+            if not known_nonempty:
+                # Check if table exists (without touching a missing relation) and has data
+                present = await self.db.execute_scalar(
+                    "SELECT to_regclass($1)::text IS NOT NULL", f"public.{table_ident}"
+                )
+                if not present:
+                    logger.info(f"Table {table_name} does not exist, skipping backup")
+                    return True
+                
+                # EXISTS stops at the first row instead of counting the whole table
+                has_rows = await self.db.execute_scalar(
+                    f"SELECT EXISTS (SELECT 1 FROM public.{table_ident})"
+                )
+                if not has_rows:
+                    logger.info(f"Table {table_name} is empty, skipping backup")
+                    return True
             
-            # Export table data to JSON
-            data_query = f"SELECT * FROM {table_name}"
-            data = await self.db.execute_query(data_query)
+            if compress and not ZSTD_AVAILABLE:
+                logger.warning("zstandard not installed, writing uncompressed backup")
+                compress = False
             
-            backup_file = os.path.join(backup_dir, f"{table_name}_backup.json")
+            backup_file = os.path.join(backup_dir, f"{table_name}_backup.{backup_format}")
+            if compress:
+                backup_file += '.zst'
             
-            import json
-            with open(backup_file, 'w') as f:
-                json.dump([dict(row) for row in data], f, indent=2, default=str)
+            async with self.db.acquire() as conn:
+                with open(backup_file, 'wb') as raw, _backup_sink(raw, compress) as f:
+                    if backup_format == 'csv':
+                        # COPY ships rows in wire format with no per-row Python objects
+                        status = await conn.copy_from_query(
+                            f"SELECT * FROM public.{table_ident}", output=f, format='csv', header=True
+                        )
+                        rows_written = int(status.split()[-1])
+                    else:
+                        rows_written = await self._stream_jsonl(conn, table_ident, f)
             
-            logger.info(f"Backed up {record_count} records from {table_name} to {backup_file}")
+            logger.info(f"Backed up {rows_written} records from {table_name} to {backup_file}")
             return True
             
         except Exception as e:
             logger.error(f"Failed to backup table {table_name}: {e}")
             return False
     
-    async def drop_table_safe(self, table_name: str, backup: bool = True) -> bool:
+    async def _stream_jsonl(self, conn, table_ident: str, f) -> int:
         """
-        Safely drop a table with optional backup
+        Pipe rows from a server-side cursor to f as JSON Lines.
+        The cursor keeps fetching while a writer task serializes and writes
+        the previous batches in a worker thread; the bounded queue applies
+        backpressure if the disk falls behind.
         """
-        try:
-            # Check if table exists
-            check_query = """
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_schema = 'public' 
-                AND table_name = $1
-            );
-            """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=BACKUP_QUEUE_DEPTH)
+        
+        async def writer():
+            while (rows := await queue.get()) is not None:
+                await asyncio.to_thread(_write_rows, f, rows)
+        
+        rows_read = 0
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(writer())
             
-            exists_result = await self.db.execute_query(check_query, [table_name])
-            if not exists_result[0]['exists']:
+            chunk = []
+            async with conn.transaction():
+                async for row in conn.cursor(f"SELECT * FROM public.{table_ident}", prefetch=1000):
+                    chunk.append(dict(row))
+                    if len(chunk) >= BACKUP_WRITE_CHUNK:
+                        await queue.put(chunk)
+                        rows_read += len(chunk)
+                        chunk = []
+            if chunk:
+                await queue.put(chunk)
+                rows_read += len(chunk)
+            await queue.put(None)
+        
+        return rows_read
+    
+    async def backup_tables(self, tables: List[str], backup_format: str = 'csv',
+                            compress: bool = False) -> List[str]:
+        """
+        Back up several tables concurrently, leaving one pool connection free.
+        Returns the tables whose backup failed.
+        """
+        semaphore = asyncio.Semaphore(max(1, self.db.pool.get_max_size() - 1))
+        
+        # One stats lookup for every table. n_live_tup is an estimate, so a zero
+        # only means "check it"; a positive count lets the backup skip its probes.
+        stats = await self.db.execute_query(
+            "SELECT relname, n_live_tup FROM pg_stat_user_tables "
+            "WHERE schemaname = 'public' AND relname = ANY($1::text[])",
+            [list(tables)]
+        )
+        nonempty = {row['relname'] for row in stats if row['n_live_tup'] > 0}
+        
+        async def backup_one(table_name: str) -> bool:
+            async with semaphore:
+                return await self.backup_table_data(table_name, backup_format=backup_format,
+                                                    compress=compress,
+                                                    known_nonempty=table_name in nonempty)
+        
+        outcomes = await asyncio.gather(*(backup_one(t) for t in tables))
+        
+        failed = [t for t, ok in zip(tables, outcomes) if not ok]
+        for table_name in failed:
+            logger.warning(f"Backup failed for {table_name}, proceeding with caution")
+        return failed
+    
+    async def drop_table_safe(self, table_name: str, backup: bool = True,
+                              existing_set: Optional[Set[str]] = None) -> bool:
+        """
+        Safely drop a table with optional backup.
+        Pass existing_set (from list_existing_tables) to skip tables known to be missing.
+        Without it no separate existence query is made: the backup probes the
+        table itself and DROP ... IF EXISTS is a no-op for a missing table.
+        """
+        try:
+            if existing_set is not None and table_name not in existing_set:
                 logger.info(f"Table {table_name} does not exist, skipping")
                 return True
             
@@ -171,8 +315,8 @@ class SupabaseCleanup:
                     logger.warning(f"Backup failed for {table_name}, proceeding with caution")
             
             # Drop the table
-            drop_query = f"DROP TABLE IF EXISTS {table_name} CASCADE"
-            await self.db.execute_query(drop_query)
+            drop_query = f"DROP TABLE IF EXISTS public.{self._ident(table_name)} CASCADE"
+            await self.db.execute(drop_query)
             
             logger.info(f"Successfully dropped table: {table_name}")
             return True
@@ -186,8 +330,8 @@ class SupabaseCleanup:
         Safely drop a view
         """
         try:
-            drop_query = f"DROP VIEW IF EXISTS {view_name} CASCADE"
-            await self.db.execute_query(drop_query)
+            drop_query = f"DROP VIEW IF EXISTS public.{self._ident(view_name)} CASCADE"
+            await self.db.execute(drop_query)
             
             logger.info(f"Successfully dropped view: {view_name}")
             return True
@@ -201,8 +345,8 @@ class SupabaseCleanup:
         Safely drop a function
         """
         try:
-            drop_query = f"DROP FUNCTION IF EXISTS {function_name} CASCADE"
-            await self.db.execute_query(drop_query)
+            drop_query = f"DROP FUNCTION IF EXISTS public.{self._ident(function_name)} CASCADE"
+            await self.db.execute(drop_query)
             
             logger.info(f"Successfully dropped function: {function_name}")
             return True
@@ -211,7 +355,34 @@ class SupabaseCleanup:
             logger.error(f"Failed to drop function {function_name}: {e}")
             return False
     
-    async def cleanup_all(self, backup: bool = True) -> Dict[str, any]:
+    async def drop_all_batch(self, tables: List[str], views: List[str], functions: List[str]) -> bool:
+        """
+        Drop tables, views and functions in a single transaction / round trip
+        """
+        statements = []
+        
+        try:
+            if views:
+                statements.append(f"DROP VIEW IF EXISTS {self._ident_list(views)} CASCADE;")
+            if tables:
+                statements.append(f"DROP TABLE IF EXISTS {self._ident_list(tables)} CASCADE;")
+            if functions:
+                statements.append(f"DROP FUNCTION IF EXISTS {self._ident_list(functions)} CASCADE;")
+            
+            if not statements:
+                return True
+            
+            drop_script = "BEGIN;\n" + "\n".join(statements) + "\nCOMMIT;"
+            await self.db.execute(drop_script)
+            logger.info(f"Dropped {len(tables)} tables, {len(views)} views, {len(functions)} functions in one batch")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Batch drop failed: {e}")
+            return False
+    
+    async def cleanup_all(self, backup: bool = True, backup_format: str = 'csv',
+                          compress: bool = False) -> Dict[str, any]:
         """
         Perform complete cleanup of old tables, views, and functions
         """
@@ -227,38 +398,25 @@ class SupabaseCleanup:
         
         logger.info("Starting comprehensive Supabase cleanup...")
         
-        # Get existing tables and views
-        existing_tables = await self.list_existing_tables()
-        existing_views = await self.list_existing_views()
-        
-        # Drop tables
-        logger.info("Cleaning up tables...")
-        for table_name in self.tables_to_remove:
-            if table_name in existing_tables:
-                success = await self.drop_table_safe(table_name, backup=backup)
-                if success:
-                    results['tables_dropped'].append(table_name)
-                else:
-                    results['tables_failed'].append(table_name)
-        
-        # Drop views
-        logger.info("Cleaning up views...")
-        for view_name in self.views_to_remove:
-            if view_name in existing_views:
-                success = await self.drop_view_safe(view_name)
-                if success:
-                    results['views_dropped'].append(view_name)
-                else:
-                    results['views_failed'].append(view_name)
+        # Get existing tables and views once; everything below is a set lookup
+        existing_tables = set(await self.list_existing_tables())
+        existing_views = set(await self.list_existing_views())
+        
+        tables = [t for t in self.tables_to_remove if t in existing_tables]
+        views = [v for v in self.views_to_remove if v in existing_views]
+        functions = list(self.functions_to_remove)
+        
+        # Back up tables concurrently before anything is dropped
+        if backup:
+            logger.info("Backing up tables...")
+            await self.backup_tables(tables, backup_format=backup_format, compress=compress)
         
-        # Drop functions
-        logger.info("Cleaning up functions...")
-        for function_name in self.functions_to_remove:
-            success = await self.drop_function_safe(function_name)
-            if success:
-                results['functions_dropped'].append(function_name)
-            else:
-                results['functions_failed'].append(function_name)
+        # Drop tables, views and functions in one transaction
+        logger.info("Cleaning up tables, views and functions...")
+        outcome = 'dropped' if await self.drop_all_batch(tables, views, functions) else 'failed'
+        results[f'tables_{outcome}'] = tables
+        results[f'views_{outcome}'] = views
+        results[f'functions_{outcome}'] = functions
         
         # Clean up any remaining orphaned data
         await self.cleanup_orphaned_data()
@@ -286,22 +444,26 @@ class SupabaseCleanup:
         try:
             # Clean up sequences that might be left over
             sequences_query = """
-            SELECT sequence_name 
-            FROM information_schema.sequences 
-            WHERE sequence_schema = 'public'
-            AND sequence_name LIKE '%aiadmk%'
-            OR sequence_name LIKE '%discovery%'
-            OR sequence_name LIKE '%engagement%'
+            SELECT c.relname AS sequence_name
+            FROM pg_catalog.pg_class c
+            JOIN pg_catalog.pg_namespace n ON c.relnamespace = n.oid
+            WHERE n.nspname = 'public'
+            AND c.relkind = 'S'
+            AND c.relname ~ '(aiadmk|discovery|engagement)'
             """
             
-            sequences = await self.db.execute_query(sequences_query)
+            sequences = [row['sequence_name'] for row in await self.db.execute_query(sequences_query)]
+            if not sequences:
+                return
             
-            for seq in sequences:
-                try:
-                    await self.db.execute_query(f"DROP SEQUENCE IF EXISTS {seq['sequence_name']} CASCADE")
-                    logger.info(f"Dropped orphaned sequence: {seq['sequence_name']}")
-                except Exception as e:
-                    logger.warning(f"Could not drop sequence {seq['sequence_name']}: {e}")
+            # One statement for all sequences; names come from the catalog, not the
+            # whitelist, so quoting is the guard here
+            seq_list = ', '.join(f"public.{_quote_ident(name)}" for name in sequences)
+            try:
+                await self.db.execute(f"DROP SEQUENCE IF EXISTS {seq_list} CASCADE")
+                logger.info(f"Dropped {len(sequences)} orphaned sequences: {', '.join(sequences)}")
+            except Exception as e:
+                logger.warning(f"Could not drop orphaned sequences {sequences}: {e}")
             
         except Exception as e:
             logger.warning(f"Error during orphaned data cleanup: {e}")
@@ -312,6 +474,9 @@ async def main():
     
     parser = argparse.ArgumentParser(description='Supabase Cleanup Tool')
     parser.add_argument('--no-backup', action='store_true', help='Skip backup creation')
+    parser.add_argument('--backup-format', choices=['csv', 'jsonl'], default='csv',
+                        help='Backup file format (default: csv via COPY)')
+    parser.add_argument('--compress', action='store_true', help='Compress backups with zstd (.zst)')
     parser.add_argument('--list-only', action='store_true', help='Only list existing tables/views')
     parser.add_argument('--dry-run', action='store_true', help='Show what would be deleted without actually deleting')
     
@@ -354,18 +519,19 @@ async def main():
             
             return
         
-        # Confirm before proceeding
+        # Confirm before proceeding (off the event loop so the open pool stays serviced)
         if not args.no_backup:
-            response = input("This will cleanup old Supabase tables with backup. Continue? (y/N): ")
+            response = await asyncio.to_thread(input, "This will cleanup old Supabase tables with backup. Continue? (y/N): ")
         else:
-            response = input("This will cleanup old Supabase tables WITHOUT backup. Continue? (y/N): ")
+            response = await asyncio.to_thread(input, "This will cleanup old Supabase tables WITHOUT backup. Continue? (y/N): ")
         
         if response.lower() != 'y':
             logger.info("Cleanup cancelled by user")
             return
         
         # Perform cleanup
-        results = await cleanup.cleanup_all(backup=not args.no_backup)
+        results = await cleanup.cleanup_all(backup=not args.no_backup, backup_format=args.backup_format,
+                                            compress=args.compress)
         
         print("\n" + "="*50)
         print("CLEANUP SUMMARY")
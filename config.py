@@ -5,16 +5,29 @@ Centralized configuration management for all APIs and system settings
 """
 
 import os
+import sys
 import logging
-from typing import Dict, List, Optional, Any
+import functools
+from functools import cached_property
+from typing import Dict, List, Optional, Any, Tuple, FrozenSet
 from dataclasses import dataclass
-from dotenv import load_dotenv
+from env import load_env
 
 # Load environment variables
-load_dotenv()
+load_env()
 
 logger = logging.getLogger(__name__)
 
+# Platform-specific search terms added on top of the shared AIADMK keywords
+PLATFORM_EXTRA_KEYWORDS = {
+    'youtube': ('AIADMK speech', 'Edappadi interview', 'அதிமுக பேச்சு'),
+    'facebook': ('AIADMK page', 'அதிமுக அறிக்கை'),
+    'twitter': ('#AIADMK', '#அதிமுக', '#EPS', '#OPS'),
+    'instagram': ('#AIADMK', '#TamilNaduPolitics'),
+    'reddit': ('TamilNadu politics', 'AIADMK discussion'),
+    'tamil_news': ('அதிமுக செய்தி', 'AIADMK news', 'எடப்பாடி செய்தி')
+}
+
 @dataclass
 class APIConfig:
     """API configuration data class"""
@@ -37,14 +50,23 @@ class ApifyActorConfig:
 class ConfigManager:
     """Centralized configuration manager for AIADMK system"""
     
+    # Sections are built from environment variables on first access
+    _SECTIONS = ('database', 'apis', 'apify_actors', 'aiadmk_keywords',
+                 'system', 'monitoring', 'retention', '_platform_keywords',
+                 '_platform_keyword_sets')
+    
     def __init__(self):
-        self.load_config()
+        logger.info("✅ Configuration manager initialized")
     
     def load_config(self):
-        """Load all configuration from environment variables"""
-        
-        # Database Configuration
-        self.database = {
+        """Discard loaded sections so they are re-read from the environment on next access"""
+        for section in self._SECTIONS:
+            self.__dict__.pop(section, None)
+    
+    @cached_property
+    def database(self) -> Dict[str, Any]:
+        """Database Configuration"""
+        return {
             'supabase_url': os.getenv('SUPABASE_URL'),
             'supabase_key': os.getenv('SUPABASE_ANON_KEY'),
             'db_host': os.getenv('SUPABASE_DB_HOST'),
@@ -52,13 +74,21 @@ class ConfigManager:
             'db_name': os.getenv('SUPABASE_DB_NAME', 'postgres'),
             'db_user': os.getenv('SUPABASE_DB_USER'),
             'db_password': os.getenv('SUPABASE_DB_PASSWORD'),
-            'pool_min_size': 2,
-            'pool_max_size': 10,
-            'command_timeout': 30
+            # Supavisor transaction-mode pooler (port 6543); preferred over db_host when set
+            'pooler_host': os.getenv('SUPABASE_POOLER_HOST'),
+            'pooler_port': int(os.getenv('SUPABASE_POOLER_PORT', '6543')),
+            'pool_mode': 'transaction',
+            'pool_min_size': int(os.getenv('SUPABASE_POOL_MIN', '10')),
+            'pool_max_size': int(os.getenv('SUPABASE_POOL_MAX', '50')),
+            'command_timeout': 30,
+            # Close idle pooled connections before the pooler/server drops them
+            'max_inactive_connection_lifetime': int(os.getenv('SUPABASE_POOL_MAX_INACTIVE', '300'))
         }
-        
-        # API Configurations
-        self.apis = {
+    
+    @cached_property
+    def apis(self) -> Dict[str, APIConfig]:
+        """API Configurations"""
+        return {
             'serpapi': APIConfig(
                 name='SerpAPI',
                 base_url='https://serpapi.com/search',
@@ -92,9 +122,11 @@ class ConfigManager:
                 retry_attempts=2
             )
         }
-        
-        # Apify Actor Configurations
-        self.apify_actors = {
+    
+    @cached_property
+    def apify_actors(self) -> Dict[str, ApifyActorConfig]:
+        """Apify Actor Configurations"""
+        return {
             'facebook': ApifyActorConfig(
                 platform='facebook',
                 actor_id=os.getenv('APIFY_FACEBOOK_ACTOR', 'apify/facebook-posts-scraper'),
@@ -157,9 +189,11 @@ class ConfigManager:
                 memory=1024
             )
         }
-        
-        # AIADMK-specific keywords for monitoring
-        self.aiadmk_keywords = {
+    
+    @cached_property
+    def aiadmk_keywords(self) -> Dict[str, List[str]]:
+        """AIADMK-specific keywords for monitoring"""
+        return {
             'tamil': [
                 'அ.இ.அ.த.மு.க', 'அதிமுக', 'எடப்பாடி பழனிசாமி', 'ஓ.பன்னீர்செல்வம்',
                 'ஜெயலலிதா', 'புரட்சித்தலைவி', 'இரட்டை இலை', 'தமிழக அரசியல்'
@@ -170,9 +204,11 @@ class ConfigManager:
                 'Jayalalithaa', 'Amma', 'Tamil Nadu politics'
             ]
         }
-        
-        # System Configuration
-        self.system = {
+    
+    @cached_property
+    def system(self) -> Dict[str, Any]:
+        """System Configuration"""
+        return {
             'max_concurrent_scrapers': int(os.getenv('MAX_WORKERS', '3')),
             'batch_size': int(os.getenv('BATCH_SIZE', '50')),
             'default_delay_min': int(os.getenv('DELAY_MIN', '2')),
@@ -183,33 +219,44 @@ class ConfigManager:
             'headless_mode': os.getenv('HEADLESS_MODE', 'true').lower() == 'true',
             'user_agent_rotation': os.getenv('USER_AGENT_ROTATION', 'true').lower() == 'true'
         }
-        
-        # Monitoring frequencies (in seconds)
-        self.monitoring = {
+    
+    @cached_property
+    def monitoring(self) -> Dict[str, int]:
+        """Monitoring frequencies (in seconds)"""
+        return {
             'keyword_search_frequency': 1800,    # 30 minutes
             'channel_check_frequency': 3600,     # 1 hour
             'news_crawl_frequency': 1800,        # 30 minutes
             'system_health_check': 300,          # 5 minutes
             'database_cleanup_frequency': 86400   # 24 hours
         }
-        
-        # Data retention policies
-        self.retention = {
+    
+    @cached_property
+    def retention(self) -> Dict[str, int]:
+        """Data retention policies"""
+        return {
             'raw_data_days': 90,      # Keep raw data for 90 days
             'processed_data_days': 365, # Keep processed data for 1 year
             'log_files_days': 30,     # Keep logs for 30 days
             'temp_files_hours': 24    # Clean temp files after 24 hours
         }
-        
-        logger.info("✅ Configuration loaded successfully")
     
     def validate_config(self) -> Dict[str, bool]:
-        """Validate all configuration settings"""
+        """Validate all configuration settings
+        
+        Connections through the Supavisor pooler (port 6543, transaction mode)
+        must be created with statement_cache_size=0: a pooled backend is not
+        pinned to the client, so named prepared statements would not exist
+        on the next transaction's server connection.
+        """
         validation_results = {}
         
-        # Validate database config
-        db_required = ['supabase_url', 'supabase_key', 'db_host', 'db_user', 'db_password']
-        validation_results['database'] = all(self.database.get(key) for key in db_required)
+        # Validate database config (either the direct host or the pooler host will do)
+        db_required = ['supabase_url', 'supabase_key', 'db_user', 'db_password']
+        validation_results['database'] = (
+            all(self.database.get(key) for key in db_required)
+            and bool(self.database.get('pooler_host') or self.database.get('db_host'))
+        )
         
         # Validate API keys
         for api_name, api_config in self.apis.items():
@@ -234,25 +281,35 @@ class ConfigManager:
         """Get Apify actor configuration by platform"""
         return self.apify_actors.get(platform)
     
-    def get_keywords_for_platform(self, platform: str) -> List[str]:
-        """Get AIADMK keywords optimized for specific platform"""
-        all_keywords = self.aiadmk_keywords['tamil'] + self.aiadmk_keywords['english']
+    @cached_property
+    def _platform_keywords(self) -> Dict[str, Tuple[str, ...]]:
+        """Keyword tuples per platform, plus the shared list under 'default'"""
+        def intern(keywords):
+            # Only ASCII keywords are interned; Tamil strings are left as-is
+            return tuple(sys.intern(k) if k.isascii() else k for k in keywords)
         
-        # Platform-specific keyword optimization
-        if platform == 'youtube':
-            return all_keywords + ['AIADMK speech', 'Edappadi interview', 'அதிமுக பேச்சு']
-        elif platform == 'facebook':
-            return all_keywords + ['AIADMK page', 'அதிமுக அறிக்கை']
-        elif platform == 'twitter':
-            return all_keywords + ['#AIADMK', '#அதிமுக', '#EPS', '#OPS']
-        elif platform == 'instagram':
-            return all_keywords + ['#AIADMK', '#TamilNaduPolitics']
-        elif platform == 'reddit':
-            return all_keywords + ['TamilNadu politics', 'AIADMK discussion']
-        elif platform == 'tamil_news':
-            return all_keywords + ['அதிமுக செய்தி', 'AIADMK news', 'எடப்பாடி செய்தி']
+        all_keywords = intern((*self.aiadmk_keywords['tamil'], *self.aiadmk_keywords['english']))
         
-        return all_keywords
+        platform_keywords = {
+            platform: all_keywords + intern(extras)
+            for platform, extras in PLATFORM_EXTRA_KEYWORDS.items()
+        }
+        platform_keywords['default'] = all_keywords
+        return platform_keywords
+    
+    @cached_property
+    def _platform_keyword_sets(self) -> Dict[str, FrozenSet[str]]:
+        """Frozenset view of each platform keyword tuple for O(1) membership tests"""
+        return {platform: frozenset(keywords) for platform, keywords in self._platform_keywords.items()}
+    
+    def get_keywords_for_platform(self, platform: str) -> Tuple[str, ...]:
+        """Get AIADMK keywords optimized for specific platform (shared, immutable)"""
+        return self._platform_keywords.get(platform, self._platform_keywords['default'])
+    
+    def has_keyword_for_platform(self, platform: str, keyword: str) -> bool:
+        """Check whether keyword is one of the platform's AIADMK keywords"""
+        keyword_sets = self._platform_keyword_sets
+        return keyword in keyword_sets.get(platform, keyword_sets['default'])
     
     def get_search_frequency(self, search_type: str) -> int:
         """Get search frequency for different types"""
@@ -305,15 +362,14 @@ class ConfigManager:
             }
         }
 
-# Global configuration instance
-config_manager = ConfigManager()
-
+@functools.lru_cache(maxsize=1)
 def get_config() -> ConfigManager:
-    """Get global configuration manager instance"""
-    return config_manager
+    """Get global configuration manager instance (created on first call)"""
+    return ConfigManager()
 
+@functools.lru_cache(maxsize=1)
 def validate_system_config() -> bool:
-    """Validate system configuration and return overall status"""
+    """Validate system configuration and return overall status (computed once per process)"""
     config = get_config()
     validation_results = config.validate_config()
     
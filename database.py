@@ -2,13 +2,16 @@
 """
 AIADMK Political Intelligence System - Database Layer
 Production-ready Supabase PostgreSQL integration with party-platform segregated tables
+
+Entry points install uvloop (when available) before asyncio.run(); every pool
+acquire/fetch/execute here is an await, so a faster event loop helps throughout.
 """
 
 import os
 import logging
 import asyncio
-from datetime import datetime
-from typing import Dict, List, Optional, Any, Union
+import functools
+from typing import Dict, List, Optional, Any, Union, Iterable
 import json
 
 # Database imports
@@ -20,26 +23,180 @@ except ImportError:
     SUPABASE_AVAILABLE = False
     logging.error("Supabase libraries not available. Install: pip install supabase asyncpg")
 
-from dotenv import load_dotenv
-load_dotenv()
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Optional libuv-based event loop (used by the __main__ runner)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from env import load_env
+
+# Logging is configured by the application entry point
 logger = logging.getLogger(__name__)
 
+# Default seconds an idle pooled connection is kept before being closed and recycled
+# (override with SUPABASE_POOL_MAX_INACTIVE)
+POOL_MAX_INACTIVE_LIFETIME = 300
+
+# Prepared-statement cache used when connections are not behind a transaction pooler
+STATEMENT_CACHE_SETTINGS = {
+    'statement_cache_size': 512,
+    'max_cached_statement_lifetime': 3600,
+    'max_cacheable_statement_size': 1024 * 15
+}
+
+@functools.lru_cache(maxsize=64)
+def _update_clause(columns: tuple, conflict_column: str) -> str:
+    """SET list for ON CONFLICT DO UPDATE, built once per column set and conflict column"""
+    return ', '.join(f"{col} = EXCLUDED.{col}" for col in columns if col != conflict_column)
+
+@functools.lru_cache(maxsize=256)
+def _insert_sql(table: str, columns: tuple, returning: bool = True) -> str:
+    """Build (once per table/column set) the INSERT statement, optionally RETURNING id"""
+    placeholders = ', '.join(f"${i+1}" for i in range(len(columns)))
+    return f"""
+            INSERT INTO {table} ({', '.join(columns)})
+            VALUES ({placeholders})
+            {'RETURNING id' if returning else ''}
+        """
+
+@functools.lru_cache(maxsize=256)
+def _upsert_sql(table: str, columns: tuple, conflict_column: str, returning: bool = True) -> str:
+    """Build (once per table/column set/conflict column) the upsert statement"""
+    placeholders = ', '.join(f"${i+1}" for i in range(len(columns)))
+    
+    return f"""
+            INSERT INTO {table} ({', '.join(columns)})
+            VALUES ({placeholders})
+            ON CONFLICT ({conflict_column}) DO UPDATE SET
+            {_update_clause(columns, conflict_column)},
+            updated_at = NOW()
+            {'RETURNING id' if returning else ''}
+        """
+
+# Postgres caps bind parameters per statement at 65535
+MAX_BIND_PARAMS = 65535
+UPSERT_BATCH_ROWS = 1000
+
+@functools.lru_cache(maxsize=256)
+def _upsert_many_sql(table: str, columns: tuple, conflict_column: str, row_count: int) -> str:
+    """Build a multi-row upsert with row_count VALUES tuples"""
+    width = len(columns)
+    rows = ', '.join(
+        '(' + ', '.join(f"${r * width + c + 1}" for c in range(width)) + ')'
+        for r in range(row_count)
+    )
+    
+    return f"""
+            INSERT INTO {table} ({', '.join(columns)})
+            VALUES {rows}
+            ON CONFLICT ({conflict_column}) DO UPDATE SET
+            {_update_clause(columns, conflict_column)},
+            updated_at = NOW()
+            RETURNING id
+        """
+
+# Conflict (natural key) column of each platform table
+PLATFORM_CONFLICT_COLUMNS = {
+    'youtube': 'video_id',
+    'facebook': 'post_id',
+    'instagram': 'post_id',
+    'twitter': 'tweet_id',
+    'reddit': 'post_id',
+    'tamil_news': 'article_url'
+}
+
+STATS_PLATFORMS = ('youtube', 'facebook', 'instagram', 'twitter', 'reddit', 'tamil_news')
+
+# Count and latest post for every platform table in one round trip
+PLATFORM_STATS_SQL = ' UNION ALL '.join(
+    f"SELECT '{platform}' AS platform, COUNT(*) AS count, MAX(created_at) AS latest FROM admk_{platform}"
+    for platform in STATS_PLATFORMS
+)
+
+# Trigger-maintained counters (see SchemaManager.create_admk_stats_table); O(1) to read
+PLATFORM_COUNTERS_SQL = """
+    SELECT platform, post_count AS count, latest_created_at AS latest
+    FROM admk_stats
+    WHERE platform = ANY($1::text[])
+"""
+
+# A claimed url_queue row still 'in_progress' after this long is treated as abandoned
+# (worker killed before reporting) and may be claimed again
+CLAIM_TIMEOUT_SECONDS = 1800
+
+# created_at is left to the column's DEFAULT NOW()
+URL_QUEUE_COLUMNS = ('url', 'platform', 'priority', 'status', 'metadata', 'attempts')
+
+def _encode_jsonb(value: Any) -> bytes:
+    """Binary jsonb encoder: Python objects are serialized, str is taken as JSON text already"""
+    if isinstance(value, str):
+        return b'\x01' + value.encode('utf-8')
+    if ORJSON_AVAILABLE:
+        # NON_STR_KEYS keeps parity with json.dumps for int-keyed metadata
+        return b'\x01' + orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    # ensure_ascii=False sends Tamil text as UTF-8 instead of 6-byte \u escapes
+    return b'\x01' + json.dumps(value, ensure_ascii=False).encode('utf-8')
+
+def _decode_jsonb(data: bytes) -> str:
+    """Binary jsonb decoder returning JSON text, like asyncpg's default codec"""
+    return data[1:].decode('utf-8')
+
+async def _init_connection(conn):
+    """Per-connection setup: let jsonb parameters take dicts/lists directly"""
+    await conn.set_type_codec(
+        'jsonb', encoder=_encode_jsonb, decoder=_decode_jsonb,
+        schema='pg_catalog', format='binary'
+    )
+
+if SUPABASE_AVAILABLE:
+    class _NoResetConnection(asyncpg.Connection):
+        """Connection that skips the reset query (DISCARD ALL etc.) on pool release
+        
+        Only safe for callers that never leave session state behind
+        (LISTEN, advisory locks, temp tables, SET without LOCAL).
+        """
+        
+        def _get_reset_query(self):
+            return ''
+
 class DatabaseManager:
     """Production database manager for AIADMK Political Intelligence System"""
     
-    def __init__(self):
+    def __init__(self, reset_on_release: bool = True):
         if not SUPABASE_AVAILABLE:
             raise ImportError("Supabase libraries required for database operations")
         
+        # .env is parsed once per process; later managers reuse the cached load
+        load_env()
+        
         # Supabase configuration
         self.supabase_url = os.getenv('SUPABASE_URL')
         self.supabase_key = os.getenv('SUPABASE_ANON_KEY')
         self.db_host = os.getenv('SUPABASE_DB_HOST')
         self.db_port = int(os.getenv('SUPABASE_DB_PORT', '5432'))
+        
+        # Prefer the Supavisor transaction-mode pooler when it is configured
+        pooler_host = os.getenv('SUPABASE_POOLER_HOST')
+        if pooler_host:
+            self.db_host = pooler_host
+            self.db_port = int(os.getenv('SUPABASE_POOLER_PORT', '6543'))
         self.db_name = os.getenv('SUPABASE_DB_NAME', 'postgres')
+        self.pool_min_size = int(os.getenv('SUPABASE_POOL_MIN', '10'))
+        self.pool_max_size = int(os.getenv('SUPABASE_POOL_MAX', '50'))
+        self.pool_max_inactive_lifetime = int(os.getenv('SUPABASE_POOL_MAX_INACTIVE', str(POOL_MAX_INACTIVE_LIFETIME)))
+        
+        # pgbouncer/Supavisor transaction pooling hands each transaction a different
+        # server connection, so named prepared statements cannot be cached there
+        pgbouncer_default = 'true' if pooler_host or self.db_port == 6543 else 'false'
+        self.uses_pgbouncer = os.getenv('SUPABASE_PGBOUNCER', pgbouncer_default).lower() in ('1', 'true', 'yes')
         self.db_user = os.getenv('SUPABASE_DB_USER')
         self.db_password = os.getenv('SUPABASE_DB_PASSWORD')
         
@@ -49,6 +206,9 @@ class DatabaseManager:
         # Initialize clients
         self.supabase: Client = create_client(self.supabase_url, self.supabase_key)
         self.db_pool = None
+        self.reset_on_release = reset_on_release
+        # Cleared if the schema predates fn_channels_due/fn_keywords_due
+        self._due_functions_available = True
         
         logger.info("Database manager initialized")
     
@@ -61,12 +221,21 @@ class DatabaseManager:
                 user=self.db_user,
                 password=self.db_password,
                 database=self.db_name,
-                min_size=2,
-                max_size=10,
+                # create_pool opens min_size connections up front, so the first
+                # queries do not pay the TLS + auth handshake
+                min_size=self.pool_min_size,
+                max_size=self.pool_max_size,
+                max_queries=50000,
                 command_timeout=30,
-                statement_cache_size=0,  # Disable prepared statement cache for pgbouncer compatibility
+                # Required for Supavisor/pgbouncer transaction mode: prepared statements
+                # do not survive a switch to another server connection
+                **({'statement_cache_size': 0} if self.uses_pgbouncer else STATEMENT_CACHE_SETTINGS),
+                max_inactive_connection_lifetime=self.pool_max_inactive_lifetime,
+                connection_class=asyncpg.Connection if self.reset_on_release else _NoResetConnection,
+                init=_init_connection,
                 server_settings={
-                    'search_path': 'public'
+                    'search_path': 'public',
+                    'jit': 'off'
                 }
             )
             logger.info("✅ Database connection pool created")
@@ -81,73 +250,183 @@ class DatabaseManager:
             await self.db_pool.close()
             logger.info("✅ Database connections closed")
     
+    @property
+    def pool(self):
+        """The asyncpg pool; connect() (or get_database()) must have completed first"""
+        if self.db_pool is None:
+            raise RuntimeError("Database pool not initialized; await connect() or get_database() first")
+        return self.db_pool
+    
+    def acquire(self):
+        """Acquire a raw asyncpg connection from the pool (use with 'async with')"""
+        return self.pool.acquire()
+    
     async def execute_query(self, query: str, params: tuple = None):
         """Execute database query with connection pool"""
-        if not self.db_pool:
-            await self.connect()
-        
-        async with self.db_pool.acquire() as conn:
+        async with self.pool.acquire() as conn:
             try:
-                if params:
-                    result = await conn.fetch(query, *params)
-                else:
-                    result = await conn.fetch(query)
-                return result
+                try:
+                    return await conn.fetch(query, *(params or ()))
+                except asyncpg.exceptions.InvalidCachedStatementError:
+                    # Schema changed under a cached plan; drop cached statements and retry once
+                    await conn.reload_schema_state()
+                    return await conn.fetch(query, *(params or ()))
             except Exception as e:
                 logger.error(f"Query execution failed: {e}")
                 raise
     
-    async def insert_data(self, table: str, data: Dict[str, Any]):
-        """Insert data into specified table"""
-        if not self.db_pool:
-            await self.connect()
+    async def execute(self, query: str, *args) -> str:
+        """Execute a statement without fetching rows and return its status tag.
+        Without arguments the query may contain several ';'-separated statements."""
+        async with self.pool.acquire() as conn:
+            try:
+                return await conn.execute(query, *args)
+            except Exception as e:
+                logger.error(f"Statement execution failed: {e}")
+                raise
+    
+    async def execute_command(self, query: str, params: tuple = None) -> str:
+        """Run an UPDATE/DELETE/DDL statement (execute_query-style params) and return its status tag"""
+        return await self.execute(query, *(params or ()))
+    
+    async def execute_scalar(self, query: str, *args) -> Any:
+        """Execute a query and return the first column of the first row (None if no rows)"""
+        async with self.pool.acquire() as conn:
+            try:
+                return await conn.fetchval(query, *args)
+            except Exception as e:
+                logger.error(f"Scalar query failed: {e}")
+                raise
+    
+    async def insert_data(self, table: str, data: Dict[str, Any], return_id: bool = True):
+        """Insert data into specified table (return_id=False skips RETURNING and returns None)"""
+        # SQL text is cached per column set, so it is also identical for the statement cache
+        query = _insert_sql(table, tuple(data), return_id)
+        values = data.values()
         
-        # Prepare columns and values
-        columns = list(data.keys())
-        placeholders = [f"${i+1}" for i in range(len(columns))]
-        values = list(data.values())
+        async with self.pool.acquire() as conn:
+            try:
+                if not return_id:
+                    await conn.execute(query, *values)
+                    return None
+                result = await conn.fetchrow(query, *values)
+                return result['id'] if result else None
+            except Exception as e:
+                logger.error(f"Insert failed for table {table}: {e}")
+                raise
+    
+    async def upsert_data(self, table: str, data: Dict[str, Any], conflict_column: str = 'url',
+                          return_id: bool = True):
+        """Upsert data into specified table (insert or update on conflict)
         
-        query = f"""
-            INSERT INTO {table} ({', '.join(columns)})
-            VALUES ({', '.join(placeholders)})
-            RETURNING id
+        With return_id=False the statement has no RETURNING clause and None is returned.
         """
+        query = _upsert_sql(table, tuple(data), conflict_column, return_id)
+        values = data.values()
         
-        async with self.db_pool.acquire() as conn:
+        async with self.pool.acquire() as conn:
             try:
+                if not return_id:
+                    await conn.execute(query, *values)
+                    return None
                 result = await conn.fetchrow(query, *values)
                 return result['id'] if result else None
             except Exception as e:
-                logger.error(f"Insert failed for table {table}: {e}")
+                logger.error(f"Upsert failed for table {table}: {e}")
                 raise
     
-    async def upsert_data(self, table: str, data: Dict[str, Any], conflict_column: str = 'url'):
-        """Upsert data into specified table (insert or update on conflict)"""
-        if not self.db_pool:
-            await self.connect()
+    async def upsert_many(self, table: str, rows: List[Dict[str, Any]],
+                          conflict_column: str = 'url') -> List[int]:
+        """Upsert many rows with one multi-row INSERT ... ON CONFLICT per chunk
         
-        columns = list(data.keys())
-        placeholders = [f"${i+1}" for i in range(len(columns))]
-        values = list(data.values())
+        Rows are grouped by column set and chunked to stay under the bind-parameter
+        limit. Within a call the last row wins for a repeated conflict key, since
+        Postgres rejects a statement that updates the same row twice.
+        """
+        if not rows:
+            return []
         
-        # Update clause for conflict resolution
-        update_columns = [f"{col} = EXCLUDED.{col}" for col in columns if col != conflict_column]
+        # Group by column set; dict keeps the last row per conflict key
+        groups: Dict[tuple, Dict[Any, Dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault(tuple(row), {})[row.get(conflict_column, id(row))] = row
         
-        query = f"""
-            INSERT INTO {table} ({', '.join(columns)})
-            VALUES ({', '.join(placeholders)})
-            ON CONFLICT ({conflict_column}) DO UPDATE SET
-            {', '.join(update_columns)},
-            updated_at = NOW()
-            RETURNING id
+        ids = []
+        async with self.pool.acquire() as conn:
+            try:
+                for columns, keyed_rows in groups.items():
+                    group_rows = list(keyed_rows.values())
+                    chunk_size = max(1, min(UPSERT_BATCH_ROWS, MAX_BIND_PARAMS // len(columns)))
+                    
+                    for start in range(0, len(group_rows), chunk_size):
+                        chunk = group_rows[start:start + chunk_size]
+                        query = _upsert_many_sql(table, columns, conflict_column, len(chunk))
+                        values = [value for row in chunk for value in row.values()]
+                        records = await conn.fetch(query, *values)
+                        ids.extend(record['id'] for record in records)
+                return ids
+            except Exception as e:
+                logger.error(f"Bulk upsert failed for table {table}: {e}")
+                raise
+    
+    async def bulk_ingest(self, platform: str, rows: List[Dict[str, Any]]) -> int:
+        """Bulk-load platform rows via binary COPY into a staging table, then upsert
+        
+        All rows must have the same keys. The staging table is a temp table
+        dropped on commit, so it works through a transaction pooler as well.
+        Returns the number of rows inserted or updated.
+        """
+        if not rows:
+            return 0
+        
+        columns = tuple(rows[0])
+        if any(tuple(row) != columns for row in rows):
+            raise ValueError(f"bulk_ingest rows for admk_{platform} must share the same columns")
+        
+        return await self.bulk_copy(platform, (tuple(row.values()) for row in rows), columns)
+    
+    async def bulk_copy(self, platform: str, records: Iterable[tuple], columns: tuple,
+                        upsert: bool = True) -> int:
+        """Bulk-load positional records (ordered as columns) into admk_<platform> via binary COPY
+        
+        With upsert=True rows go through a temp staging table and are merged with
+        ON CONFLICT; with upsert=False they are copied straight into the table,
+        which is fastest but fails the whole batch on a duplicate key.
+        Returns the number of rows written.
         """
+        table = f"admk_{platform}"
         
-        async with self.db_pool.acquire() as conn:
+        async with self.pool.acquire() as conn:
             try:
-                result = await conn.fetchrow(query, *values)
-                return result['id'] if result else None
+                if not upsert:
+                    status = await conn.copy_records_to_table(table, records=records, columns=columns)
+                    return int(status.split()[-1])
+                
+                conflict_column = PLATFORM_CONFLICT_COLUMNS[platform]
+                column_list = ', '.join(columns)
+                update_columns = _update_clause(columns, conflict_column)
+                staging = f"{table}_staging"
+                
+                async with conn.transaction():
+                    # copy_ord numbers rows in COPY order so repeated keys can be resolved
+                    await conn.execute(
+                        f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS, "
+                        f"copy_ord bigint GENERATED ALWAYS AS IDENTITY) ON COMMIT DROP"
+                    )
+                    await conn.copy_records_to_table(staging, records=records, columns=columns)
+                    # DISTINCT ON keeps one row per key (the last one, as upsert_many does);
+                    # ON CONFLICT cannot touch a row twice
+                    status = await conn.execute(f"""
+                        INSERT INTO {table} ({column_list})
+                        SELECT DISTINCT ON ({conflict_column}) {column_list} FROM {staging}
+                        ORDER BY {conflict_column}, copy_ord DESC
+                        ON CONFLICT ({conflict_column}) DO UPDATE SET
+                        {update_columns},
+                        updated_at = NOW()
+                    """)
+                return int(status.split()[-1])
             except Exception as e:
-                logger.error(f"Upsert failed for table {table}: {e}")
+                logger.error(f"Bulk ingest failed for table {table}: {e}")
                 raise
     
     async def get_statistics(self) -> Dict[str, Any]:
@@ -159,60 +438,97 @@ class DatabaseManager:
             'last_updated': None
         }
         
-        platforms = ['youtube', 'facebook', 'instagram', 'twitter', 'reddit', 'tamil_news']
-        
-        for platform in platforms:
-            table_name = f"admk_{platform}"
+        platform_rows = await self._platform_counters()
+        if platform_rows is None:
             try:
-                # Get post count
-                posts_query = f"SELECT COUNT(*) as count FROM {table_name}"
-                posts_result = await self.execute_query(posts_query)
-                post_count = posts_result[0]['count'] if posts_result else 0
-                
-                # Get latest post date
-                latest_query = f"SELECT MAX(created_at) as latest FROM {table_name}"
-                latest_result = await self.execute_query(latest_query)
-                latest_date = latest_result[0]['latest'] if latest_result and latest_result[0]['latest'] else None
-                
-                stats['platforms'][platform] = {
-                    'posts': post_count,
-                    'latest': latest_date.isoformat() if latest_date else None
-                }
-                stats['total_posts'] += post_count
-                
-                if latest_date and (not stats['last_updated'] or latest_date > stats['last_updated']):
-                    stats['last_updated'] = latest_date.isoformat()
-                
+                rows = await self.execute_query(PLATFORM_STATS_SQL)
+                platform_rows = [(row['platform'], row['count'], row['latest']) for row in rows]
             except Exception as e:
-                logger.warning(f"Failed to get stats for {platform}: {e}")
-                stats['platforms'][platform] = {'posts': 0, 'latest': None}
+                # A missing table fails the whole UNION; fall back to concurrent per-platform queries
+                logger.warning(f"Combined statistics query failed, querying platforms separately: {e}")
+                platform_rows = await asyncio.gather(
+                    *(self._platform_stats(platform) for platform in STATS_PLATFORMS)
+                )
+        
+        latest_overall = None
+        for platform, post_count, latest_date in platform_rows:
+            stats['platforms'][platform] = {
+                'posts': post_count,
+                'latest': latest_date.isoformat() if latest_date else None
+            }
+            stats['total_posts'] += post_count
+            
+            if latest_date and (not latest_overall or latest_date > latest_overall):
+                latest_overall = latest_date
         
+        stats['last_updated'] = latest_overall.isoformat() if latest_overall else None
         return stats
     
+    async def _platform_counters(self) -> Optional[List[tuple]]:
+        """Read the admk_stats counters; None if they are not installed for every platform"""
+        try:
+            rows = await self.execute_query(PLATFORM_COUNTERS_SQL, (list(STATS_PLATFORMS),))
+        except Exception as e:
+            logger.debug(f"admk_stats counters unavailable, counting tables instead: {e}")
+            return None
+        
+        if len(rows) != len(STATS_PLATFORMS):
+            return None
+        return [(row['platform'], row['count'], row['latest']) for row in rows]
+    
+    async def _platform_stats(self, platform: str) -> tuple:
+        """Post count and latest post date for one platform table (0/None on failure)"""
+        try:
+            row = (await self.execute_query(
+                f"SELECT COUNT(*) AS count, MAX(created_at) AS latest FROM admk_{platform}"
+            ))[0]
+            return platform, row['count'], row['latest']
+        except Exception as e:
+            logger.warning(f"Failed to get stats for {platform}: {e}")
+            return platform, 0, None
+    
     # Platform-specific insert methods
-    async def insert_youtube_data(self, data: Dict[str, Any]):
-        """Insert YouTube data into admk_youtube table"""
-        return await self.upsert_data('admk_youtube', data, 'video_id')
+    async def insert_youtube_data(self, data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                                  return_id: bool = True):
+        """Insert YouTube data (one row or a batch) into admk_youtube table"""
+        if isinstance(data, list):
+            return await self.upsert_many('admk_youtube', data, 'video_id')
+        return await self.upsert_data('admk_youtube', data, 'video_id', return_id)
     
-    async def insert_facebook_data(self, data: Dict[str, Any]):
-        """Insert Facebook data into admk_facebook table"""
-        return await self.upsert_data('admk_facebook', data, 'post_id')
+    async def insert_facebook_data(self, data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                                   return_id: bool = True):
+        """Insert Facebook data (one row or a batch) into admk_facebook table"""
+        if isinstance(data, list):
+            return await self.upsert_many('admk_facebook', data, 'post_id')
+        return await self.upsert_data('admk_facebook', data, 'post_id', return_id)
     
-    async def insert_instagram_data(self, data: Dict[str, Any]):
-        """Insert Instagram data into admk_instagram table"""
-        return await self.upsert_data('admk_instagram', data, 'post_id')
+    async def insert_instagram_data(self, data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                                    return_id: bool = True):
+        """Insert Instagram data (one row or a batch) into admk_instagram table"""
+        if isinstance(data, list):
+            return await self.upsert_many('admk_instagram', data, 'post_id')
+        return await self.upsert_data('admk_instagram', data, 'post_id', return_id)
     
-    async def insert_twitter_data(self, data: Dict[str, Any]):
-        """Insert Twitter data into admk_twitter table"""
-        return await self.upsert_data('admk_twitter', data, 'tweet_id')
+    async def insert_twitter_data(self, data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                                  return_id: bool = True):
+        """Insert Twitter data (one row or a batch) into admk_twitter table"""
+        if isinstance(data, list):
+            return await self.upsert_many('admk_twitter', data, 'tweet_id')
+        return await self.upsert_data('admk_twitter', data, 'tweet_id', return_id)
     
-    async def insert_reddit_data(self, data: Dict[str, Any]):
-        """Insert Reddit data into admk_reddit table"""
-        return await self.upsert_data('admk_reddit', data, 'post_id')
+    async def insert_reddit_data(self, data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                                 return_id: bool = True):
+        """Insert Reddit data (one row or a batch) into admk_reddit table"""
+        if isinstance(data, list):
+            return await self.upsert_many('admk_reddit', data, 'post_id')
+        return await self.upsert_data('admk_reddit', data, 'post_id', return_id)
     
-    async def insert_tamil_news_data(self, data: Dict[str, Any]):
-        """Insert Tamil News data into admk_tamil_news table"""
-        return await self.upsert_data('admk_tamil_news', data, 'article_url')
+    async def insert_tamil_news_data(self, data: Union[Dict[str, Any], List[Dict[str, Any]]],
+                                     return_id: bool = True):
+        """Insert Tamil News data (one row or a batch) into admk_tamil_news table"""
+        if isinstance(data, list):
+            return await self.upsert_many('admk_tamil_news', data, 'article_url')
+        return await self.upsert_data('admk_tamil_news', data, 'article_url', return_id)
     
     # Management table operations
     async def add_to_url_queue(self, url: str, platform: str, priority: int = 1, metadata: Dict = None):
@@ -222,28 +538,77 @@ class DatabaseManager:
             'platform': platform,
             'priority': priority,
             'status': 'pending',
-            'metadata': json.dumps(metadata or {}),
-            'created_at': datetime.now(),
+            'metadata': metadata or {},
             'attempts': 0
         }
         return await self.insert_data('url_queue', data)
     
+    async def add_urls_bulk(self, rows: List[Dict[str, Any]]) -> int:
+        """Add many URLs to the processing queue with one binary COPY
+        
+        Each row needs 'url' and 'platform'; 'priority' and 'metadata' are optional.
+        url_queue has no unique key, so rows are appended exactly as
+        add_to_url_queue would, just without a round trip per URL.
+        """
+        if not rows:
+            return 0
+        
+        records = [
+            (row['url'], row['platform'], row.get('priority', 1), 'pending',
+             row.get('metadata') or {}, 0)
+            for row in rows
+        ]
+        
+        async with self.pool.acquire() as conn:
+            try:
+                status = await conn.copy_records_to_table(
+                    'url_queue', records=records, columns=URL_QUEUE_COLUMNS
+                )
+                return int(status.split()[-1])
+            except Exception as e:
+                logger.error(f"Bulk URL queue insert failed: {e}")
+                raise
+    
     async def get_pending_urls(self, platform: str = None, limit: int = 100):
         """Get pending URLs from queue"""
+        # Constant SQL text (platform NULL = all) so one prepared statement/plan serves every call
         query = """
             SELECT * FROM url_queue 
             WHERE status = 'pending' AND attempts < 3
+            AND ($1::text IS NULL OR platform = $1)
+            ORDER BY priority DESC, created_at ASC
+            LIMIT $2
         """
-        params = []
         
-        if platform:
-            query += " AND platform = $1"
-            params.append(platform)
+        return await self.execute_query(query, (platform or None, limit))
+    
+    async def claim_pending_urls(self, platform: str = None, limit: int = 100):
+        """Claim pending URLs for this worker and mark them 'in_progress'
         
-        query += " ORDER BY priority DESC, created_at ASC LIMIT $" + str(len(params) + 1)
-        params.append(limit)
+        Rows are picked with FOR UPDATE SKIP LOCKED and updated in the same
+        statement, so concurrent workers never receive the same URL. Report the
+        outcome of each claimed URL with update_url_status. Rows left
+        'in_progress' for CLAIM_TIMEOUT_SECONDS are reclaimed, and the abandoned
+        claim counts as an attempt.
+        """
+        query = """
+            UPDATE url_queue
+            SET status = 'in_progress', updated_at = NOW(),
+                attempts = attempts + CASE WHEN status = 'in_progress' THEN 1 ELSE 0 END
+            WHERE id IN (
+                SELECT id FROM url_queue
+                WHERE (status = 'pending'
+                       OR (status = 'in_progress' AND updated_at < NOW() - $3::int * INTERVAL '1 second'))
+                AND attempts < 3
+                AND ($1::text IS NULL OR platform = $1)
+                ORDER BY priority DESC, created_at ASC
+                LIMIT $2
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING *
+        """
         
-        return await self.execute_query(query, tuple(params))
+        return await self.execute_query(query, (platform or None, limit, CLAIM_TIMEOUT_SECONDS))
     
     async def update_url_status(self, url_id: int, status: str, error_message: str = None):
         """Update URL processing status"""
@@ -252,7 +617,26 @@ class DatabaseManager:
             SET status = $1, error_message = $2, updated_at = NOW(), attempts = attempts + 1
             WHERE id = $3
         """
-        await self.execute_query(query, (status, error_message, url_id))
+        await self.execute_command(query, (status, error_message, url_id))
+    
+    async def update_url_statuses(self, updates: List[tuple]):
+        """Apply many (url_id, status, error_message) updates with one UPDATE ... FROM VALUES per chunk"""
+        if not updates:
+            return
+        
+        chunk_size = MAX_BIND_PARAMS // 3
+        for start in range(0, len(updates), chunk_size):
+            chunk = updates[start:start + chunk_size]
+            rows = ', '.join(
+                f"(${i * 3 + 1}::bigint, ${i * 3 + 2}::text, ${i * 3 + 3}::text)" for i in range(len(chunk))
+            )
+            query = f"""
+                UPDATE url_queue
+                SET status = v.status, error_message = v.error, updated_at = NOW(), attempts = attempts + 1
+                FROM (VALUES {rows}) AS v(id, status, error)
+                WHERE url_queue.id = v.id
+            """
+            await self.execute(query, *(value for update in chunk for value in update))
     
     async def add_monitored_channel(self, platform: str, channel_id: str, channel_name: str, 
                                   check_frequency: int = 3600, metadata: Dict = None):
@@ -263,29 +647,30 @@ class DatabaseManager:
             'channel_name': channel_name,
             'check_frequency_seconds': check_frequency,
             'is_active': True,
-            'metadata': json.dumps(metadata or {}),
-            'created_at': datetime.now(),
+            'metadata': metadata or {},
             'last_checked': None
         }
         return await self.upsert_data('monitored_channels', data, 'channel_id')
     
     async def get_channels_to_check(self, platform: str = None):
         """Get channels that need to be checked"""
+        if self._due_functions_available:
+            try:
+                return await self.execute_query("SELECT * FROM fn_channels_due($1)", (platform or None,))
+            except asyncpg.exceptions.UndefinedFunctionError:
+                logger.warning("fn_channels_due missing; re-run schema.py. Using inline queries")
+                self._due_functions_available = False
+        
         query = """
             SELECT * FROM monitored_channels 
             WHERE is_active = true 
             AND (last_checked IS NULL OR 
                  last_checked < NOW() - INTERVAL '1 second' * check_frequency_seconds)
+            AND ($1::text IS NULL OR platform = $1)
+            ORDER BY priority DESC, last_checked ASC NULLS FIRST
         """
-        params = []
-        
-        if platform:
-            query += " AND platform = $1"
-            params.append(platform)
         
-        query += " ORDER BY priority DESC, last_checked ASC NULLS FIRST"
-        
-        return await self.execute_query(query, tuple(params))
+        return await self.execute_query(query, (platform or None,))
     
     async def update_channel_check(self, channel_id: str, posts_found: int = 0):
         """Update channel last check time"""
@@ -294,7 +679,7 @@ class DatabaseManager:
             SET last_checked = NOW(), posts_found_last_check = $1
             WHERE channel_id = $2
         """
-        await self.execute_query(query, (posts_found, channel_id))
+        await self.execute_command(query, (posts_found, channel_id))
     
     async def add_search_keyword(self, keyword: str, platform: str, is_active: bool = True, 
                                search_frequency: int = 1800, metadata: Dict = None):
@@ -304,8 +689,7 @@ class DatabaseManager:
             'platform': platform,
             'is_active': is_active,
             'search_frequency_seconds': search_frequency,
-            'metadata': json.dumps(metadata or {}),
-            'created_at': datetime.now(),
+            'metadata': metadata or {},
             'last_searched': None,
             'results_found_last_search': 0
         }
@@ -313,21 +697,23 @@ class DatabaseManager:
     
     async def get_keywords_to_search(self, platform: str = None):
         """Get keywords that need to be searched"""
+        if self._due_functions_available:
+            try:
+                return await self.execute_query("SELECT * FROM fn_keywords_due($1)", (platform or None,))
+            except asyncpg.exceptions.UndefinedFunctionError:
+                logger.warning("fn_keywords_due missing; re-run schema.py. Using inline queries")
+                self._due_functions_available = False
+        
         query = """
             SELECT * FROM search_keywords 
             WHERE is_active = true 
             AND (last_searched IS NULL OR 
                  last_searched < NOW() - INTERVAL '1 second' * search_frequency_seconds)
+            AND ($1::text IS NULL OR platform = $1)
+            ORDER BY last_searched ASC NULLS FIRST
         """
-        params = []
-        
-        if platform:
-            query += " AND platform = $1"
-            params.append(platform)
         
-        query += " ORDER BY last_searched ASC NULLS FIRST"
-        
-        return await self.execute_query(query, tuple(params))
+        return await self.execute_query(query, (platform or None,))
     
     async def update_keyword_search(self, keyword: str, results_found: int):
         """Update keyword search results"""
@@ -336,17 +722,25 @@ class DatabaseManager:
             SET last_searched = NOW(), results_found_last_search = $1
             WHERE keyword = $2
         """
-        await self.execute_query(query, (results_found, keyword))
+        await self.execute_command(query, (results_found, keyword))
 
 # Global database manager instance
 db_manager = None
+_db_manager_lock = asyncio.Lock()
 
 async def get_database():
-    """Get global database manager instance"""
+    """Get global database manager instance (the single place the shared pool is created)"""
     global db_manager
-    if not db_manager:
-        db_manager = DatabaseManager()
-        await db_manager.connect()
+    if db_manager:
+        return db_manager
+    
+    # Concurrent first callers wait here instead of each creating a pool
+    async with _db_manager_lock:
+        if not db_manager:
+            manager = DatabaseManager()
+            if not await manager.connect():
+                raise RuntimeError("Database connection failed")
+            db_manager = manager
     return db_manager
 
 async def close_database():
@@ -379,4 +773,7 @@ async def test_database_connection():
         await close_database()
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if UVLOOP_AVAILABLE:
+        uvloop.install()
     asyncio.run(test_database_connection())
\ No newline at end of file
@@ -9,11 +9,19 @@ import sys
 import os
 import importlib.util
 
-# Import from the root database.py file
+# The root database.py imports sibling top-level modules (env), so the project root must be importable
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-spec = importlib.util.spec_from_file_location("root_database", os.path.join(parent_dir, "database.py"))
-root_database = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(root_database)
+if parent_dir not in sys.path:
+    sys.path.insert(0, parent_dir)
+
+# Load the root database.py exactly once; registering it in sys.modules lets
+# submodules share this instance (one DatabaseManager class, one global pool)
+root_database = sys.modules.get("root_database")
+if root_database is None:
+    spec = importlib.util.spec_from_file_location("root_database", os.path.join(parent_dir, "database.py"))
+    root_database = importlib.util.module_from_spec(spec)
+    sys.modules["root_database"] = root_database
+    spec.loader.exec_module(root_database)
 
 # Import the DatabaseConnection alias from connection module
 from .connection import DatabaseConnection
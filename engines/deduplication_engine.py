@@ -5,13 +5,45 @@ Multi-level deduplication for URLs and content with similarity detection
 """
 
 import asyncio
+import functools
+from concurrent.futures import ProcessPoolExecutor
 import logging
 import hashlib
+import multiprocessing
 import re
-from datetime import datetime
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple, Set, Any
-from urllib.parse import urlparse, parse_qs, urlunparse
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse, unquote
 import difflib
+import os
+
+import asyncpg
+import numpy as np
+
+try:
+    from datasketch import MinHash, MinHashLSH
+    DATASKETCH_AVAILABLE = True
+except ImportError:
+    DATASKETCH_AVAILABLE = False
+
+try:
+    from ada_url import URL as AdaURL
+    ADA_AVAILABLE = True
+except ImportError:
+    ADA_AVAILABLE = False
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+try:
+    from rapidfuzz import fuzz, process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
 
 import sys
 sys.path.append('..')
@@ -19,6 +51,303 @@ from database import get_database
 
 logger = logging.getLogger(__name__)
 
+# Redis lookup cache: positive answers live for a week, misses briefly absorb repeated probes
+DUP_CACHE_TTL = 7 * 24 * 3600
+DUP_MISS_TTL = 3600
+
+# Rows removed per DELETE statement in cleanup_old_duplicates
+CLEANUP_BATCH_ROWS = 10000
+
+# Near-duplicate URL index: MinHash over character 3-grams of the normalized URL
+URL_LSH_NUM_PERM = 64
+URL_SHINGLE_SIZE = 3
+URL_INDEX_WINDOW = timedelta(days=7)
+
+# Rows inserted this long before the previous refresh are re-read, so stage_ids
+# whose transactions committed out of order are not missed
+URL_INDEX_REFRESH_OVERLAP = timedelta(minutes=5)
+
+def _url_shingles(normalized_url: str) -> Set[bytes]:
+    """Character 3-grams of a normalized URL, encoded for MinHash"""
+    if len(normalized_url) < URL_SHINGLE_SIZE:
+        return {normalized_url.encode('utf-8')}
+    return {normalized_url[i:i + URL_SHINGLE_SIZE].encode('utf-8')
+            for i in range(len(normalized_url) - URL_SHINGLE_SIZE + 1)}
+
+def _url_similarity(url1: str, url2: str, threshold: float) -> float:
+    """Similarity ratio of two normalized URLs (0.0 when rapidfuzz can tell it is below threshold)"""
+    if RAPIDFUZZ_AVAILABLE:
+        # Same metric as SequenceMatcher.ratio() in C; score_cutoff stops hopeless pairs early
+        return fuzz.ratio(url1, url2, score_cutoff=threshold * 100) / 100
+    return difflib.SequenceMatcher(None, url1, url2).ratio()
+
+# Tracking parameters removed during URL normalization
+TRACKING_PARAMS = {
+    'youtube': ['t', 'feature', 'app', 'si'],
+    'facebook': ['fbclid', 'ref', 'source', 'hash'],
+    'instagram': ['igshid', 'img_index'],
+    'twitter': ['s', 'ref_src', 'ref_url'],
+    'reddit': ['utm_source', 'utm_medium', 'utm_campaign'],
+    'common': ['utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content']
+}
+
+# Common + platform parameter sets, built once instead of on every normalization
+_COMMON_TRACKING_PARAMS = frozenset(TRACKING_PARAMS['common'])
+_PARAMS_BY_PLATFORM = {
+    platform: _COMMON_TRACKING_PARAMS | frozenset(params)
+    for platform, params in TRACKING_PARAMS.items()
+}
+
+# Host prefixes that only select a mobile/desktop variant of the same page
+_HOST_VARIANT_RE = re.compile(r'^(?:www|m|mobile|web)\.')
+
+def _canonical_default(host: str, path: str, query_pairs: list) -> Tuple[str, str]:
+    return host, path
+
+def _canonical_youtube(host: str, path: str, query_pairs: list) -> Tuple[str, str]:
+    """Convert youtu.be/<id> to youtube.com/watch?v=<id>"""
+    if host == 'youtu.be':
+        query_pairs.append(('v', path.lstrip('/')))
+        return 'youtube.com', '/watch'
+    return host, path
+
+def _canonical_twitter(host: str, path: str, query_pairs: list) -> Tuple[str, str]:
+    """Handle both twitter.com and x.com"""
+    return ('x.com' if host == 'twitter.com' else host), path
+
+# Per-platform canonicalization, chosen by one dict lookup instead of an if/elif chain
+_PLATFORM_CANONICALIZERS = {
+    'youtube': _canonical_youtube,
+    'twitter': _canonical_twitter,
+}
+
+def _host_key(hostname: str, port) -> str:
+    """Host part of the canonical URL: lowercase hostname, plus the port unless it is 80/443"""
+    port = str(port or '')
+    return f"{hostname}:{port}" if port and port not in ('80', '443') else hostname
+
+def _remove_dot_segments(path: str) -> str:
+    """Resolve '.' and '..' path segments (RFC 3986 5.2.4), as Ada does while parsing"""
+    if '/.' not in path:
+        return path
+    segments = []
+    for segment in path.split('/')[1:]:
+        if segment == '..':
+            if segments:
+                segments.pop()
+        elif segment != '.':
+            segments.append(segment)
+    return '/' + '/'.join(segments)
+
+def _split_url(url: str) -> Tuple[str, str, str, str]:
+    """(host, path, params, query) of url; parsed by Ada (C++ WHATWG parser) when installed
+    
+    Both parsers must give the same canonical form (hashes and cache keys depend on it),
+    so the host drops userinfo and default ports, IDN hosts are punycode, dot segments
+    are resolved and the path is percent-decoded (Tamil paths stay readable for the
+    URL shingles).
+    """
+    if ADA_AVAILABLE:
+        try:
+            parsed = AdaURL(url)
+            return _host_key(parsed.hostname, parsed.port), unquote(parsed.pathname), '', parsed.search[1:]
+        except ValueError:
+            pass  # Not an absolute URL; urlparse is more forgiving
+    
+    parsed = urlparse(url)
+    hostname = parsed.hostname or ''
+    if not hostname.isascii():
+        try:
+            hostname = hostname.encode('idna').decode('ascii')
+        except UnicodeError:
+            pass
+    try:
+        port = parsed.port
+    except ValueError:
+        port = None
+    return _host_key(hostname, port), unquote(_remove_dot_segments(parsed.path)), parsed.params, parsed.query
+
+@functools.lru_cache(maxsize=131072)
+def _normalize_url(url: str, platform: str = '') -> str:
+    """Normalize URL to one canonical form: https, bare lowercase host, no trailing slash,
+    tracking and empty query parameters removed, remaining parameters sorted"""
+    
+    try:
+        netloc, path, params, query = _split_url(url.strip())
+        
+        # Lowercase host without www./m./mobile./web. variants
+        host = _HOST_VARIANT_RE.sub('', netloc)
+        path = path.rstrip('/')
+        
+        # Remove tracking and empty parameters; sort the rest so parameter order doesn't matter
+        params_to_remove = _PARAMS_BY_PLATFORM.get(platform, _COMMON_TRACKING_PARAMS)
+        query_pairs = [(k, v) for k, v in parse_qsl(query) if k not in params_to_remove]
+        
+        # Platform-specific canonical hosts
+        host, path = _PLATFORM_CANONICALIZERS.get(platform, _canonical_default)(host, path, query_pairs)
+        
+        return urlunparse(('https', host, path, params, urlencode(sorted(query_pairs)), ''))
+        
+    except Exception as e:
+        logger.warning(f"URL normalization failed for {url}: {e}")
+        return url.lower().strip()
+
+@functools.lru_cache(maxsize=131072)
+def _url_hash(url: str, platform: str = '') -> str:
+    """SHA-256 of the normalized URL (memoized)"""
+    # Not the stored key: stage_results.url_hash is the trigger's digest of the raw url (see _stored_url_hash)
+    return hashlib.sha256(_normalize_url(url, platform).encode(), usedforsecurity=False).hexdigest()
+
+@functools.lru_cache(maxsize=131072)
+def _stored_url_hash(url: str) -> str:
+    """stage_results.url_hash for url: hex SHA-256 of the URL exactly as stored (memoized)"""
+    # Must match the generate_url_hash() trigger: encode(sha256(url::bytea), 'hex')
+    return hashlib.sha256(url.encode(), usedforsecurity=False).hexdigest()
+
+# Punctuation = anything but word characters, whitespace and the Tamil block
+_PUNCT_RE = re.compile(r'[^\w\s\u0B80-\u0BFF]')
+
+# ASCII fast path: str.translate runs in C without the regex engine
+_ASCII_PUNCT = [c for c in map(chr, range(128)) if _PUNCT_RE.match(c)]
+_ASCII_PUNCT_TO_SPACE = str.maketrans(dict.fromkeys(_ASCII_PUNCT, ' '))
+_ASCII_PUNCT_REMOVE = str.maketrans(dict.fromkeys(_ASCII_PUNCT))
+
+def _replace_punctuation(text: str, replacement: str = ' ') -> str:
+    """Replace punctuation (keeping Tamil) with replacement, which is ' ' or ''"""
+    if text.isascii():
+        return text.translate(_ASCII_PUNCT_TO_SPACE if replacement else _ASCII_PUNCT_REMOVE)
+    return _PUNCT_RE.sub(replacement, text)
+
+def _clean_text(text: str) -> str:
+    """Lowercase, replace punctuation with spaces (keeping Tamil) and collapse whitespace"""
+    return ' '.join(_replace_punctuation(text.lower()).split())
+
+# Character n-grams are hashed by packing code points (21 bits each; exact up to n=3)
+_CODEPOINT_BASE = np.uint64(1 << 21)
+
+def _ngram_hashes(text: str, n: int) -> np.ndarray:
+    """Unique hashes of the character n-grams of text, computed with numpy sliding windows"""
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    n = min(n, len(codes))
+    if n == 0:
+        return np.empty(0, dtype=np.uint64)
+    
+    windows = np.lib.stride_tricks.sliding_window_view(codes, n)
+    weights = _CODEPOINT_BASE ** np.arange(n - 1, -1, -1, dtype=np.uint64)
+    return np.unique((windows * weights).sum(axis=1))
+
+# Text MinHash: 128 universal hashes h(x) = (a*x + b) mod p over the n-gram hashes
+TEXT_MINHASH_PERM = 128
+TEXT_SHINGLE_SIZE = 3
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_minhash_rng = np.random.RandomState(1)
+_MINHASH_A = _minhash_rng.randint(1, (1 << 61) - 1, size=TEXT_MINHASH_PERM, dtype=np.uint64)
+_MINHASH_B = _minhash_rng.randint(0, (1 << 61) - 1, size=TEXT_MINHASH_PERM, dtype=np.uint64)
+
+@functools.lru_cache(maxsize=4096)
+def _text_minhash(cleaned_text: str) -> np.ndarray:
+    """128-slot MinHash signature of a cleaned text's character 3-grams (computed once per text)"""
+    hashes = _ngram_hashes(cleaned_text, TEXT_SHINGLE_SIZE)
+    
+    # uint64 products wrap around, as in datasketch; the result is still a valid hash family
+    permuted = ((hashes[:, None] * _MINHASH_A + _MINHASH_B) % _MERSENNE_PRIME) & _MAX_HASH
+    signature = permuted.min(axis=0).astype(np.uint32)
+    signature.flags.writeable = False
+    return signature
+
+def _same_author_or_day(result1: Dict, result2: Dict) -> bool:
+    """Same author OR published within 1 day"""
+    same_author = (result1.get('author', '') or '').lower() == (result2.get('author', '') or '').lower()
+    
+    date_diff = 0
+    if result1.get('published_at') and result2.get('published_at'):
+        date_diff = abs((result1['published_at'] - result2['published_at']).days)
+    
+    return same_author or date_diff <= 1
+
+def _later_result_id(result1: Dict, result2: Dict) -> int:
+    """Keep the earlier result, return the later one's id to mark as duplicate"""
+    if result1.get('published_at', datetime.min) <= result2.get('published_at', datetime.min):
+        return result2['result_id']
+    return result1['result_id']
+
+def _candidate_blocks(results: List[Dict]) -> List[Tuple[List[int], List[int]]]:
+    """(rows, cols) index blocks that together contain every pair _same_author_or_day can accept.
+    Pairs are only compared inside a block: same author, publish days at most 2 apart, or undated."""
+    by_author = defaultdict(list)
+    by_day = defaultdict(list)
+    undated = []
+    
+    for index, result in enumerate(results):
+        by_author[(result.get('author', '') or '').lower()].append(index)
+        if result.get('published_at'):
+            by_day[result['published_at'].date().toordinal()].append(index)
+        else:
+            undated.append(index)
+    
+    blocks = [(indexes, indexes) for indexes in by_author.values() if len(indexes) > 1]
+    
+    # |timedelta.days| <= 1 means under 2 days apart, i.e. at most 2 calendar days
+    for day, indexes in by_day.items():
+        window = indexes + by_day.get(day + 1, []) + by_day.get(day + 2, [])
+        if len(window) > 1:
+            blocks.append((indexes, window))
+    
+    # A missing publish date counts as date_diff 0, so undated results pair with everything
+    if undated:
+        blocks.append((undated, list(range(len(results)))))
+    
+    return blocks
+
+def _mark_duplicate_pairs(results: List[Dict], pairs: Set[Tuple[int, int]]) -> Set[int]:
+    """Walk similar (i, j) pairs in nested-loop order, keeping the earlier result of each"""
+    duplicates = set()
+    row, row_skipped = None, False
+    
+    for i, j in sorted(pairs):
+        result1, result2 = results[i], results[j]
+        
+        # Like the nested loop: a row is skipped only if it was already a duplicate when reached
+        if i != row:
+            row, row_skipped = i, result1['result_id'] in duplicates
+        if row_skipped or result2['result_id'] in duplicates:
+            continue
+        
+        if _same_author_or_day(result1, result2):
+            duplicates.add(_later_result_id(result1, result2))
+            logger.debug(f"🔄 Content duplicate: result {result1['result_id']} ~ {result2['result_id']}")
+    
+    return duplicates
+
+def _vectorized_group_dedup(results: List[Dict], thresholds: Dict[str, float], workers: int = -1) -> Set[int]:
+    """Find content duplicates from rapidfuzz similarity matrices computed in C, one per candidate block.
+    Module-level so it can run in the engine's process pool."""
+    
+    titles = [_clean_text(r.get('title') or '') for r in results]
+    contents = [_clean_text((r.get('content') or '')[:500]) for r in results]
+    
+    title_cutoff = thresholds['title_similarity'] * 100
+    content_cutoff = thresholds['content_similarity'] * 100
+    
+    # Empty text never matches (ratio('', '') would be 100)
+    has_text = [bool(t) and bool(c) for t, c in zip(titles, contents)]
+    
+    similar_pairs = set()
+    for rows, cols in _candidate_blocks(results):
+        # score_cutoff lets rapidfuzz abandon pairs early
+        title_matrix = process.cdist([titles[i] for i in rows], [titles[j] for j in cols],
+                                     scorer=fuzz.ratio, score_cutoff=title_cutoff, workers=workers)
+        content_matrix = process.cdist([contents[i] for i in rows], [contents[j] for j in cols],
+                                       scorer=fuzz.ratio, score_cutoff=content_cutoff, workers=workers)
+        
+        for a, b in np.argwhere((title_matrix >= title_cutoff) & (content_matrix >= content_cutoff)):
+            i, j = rows[a], cols[b]
+            if i != j and has_text[i] and has_text[j]:
+                similar_pairs.add((min(i, j), max(i, j)))
+    
+    return _mark_duplicate_pairs(results, similar_pairs)
+
 class DeduplicationEngine:
     """Multi-level deduplication system"""
     
@@ -26,14 +355,7 @@ class DeduplicationEngine:
         self.db = None
         
         # Tracking parameters removal patterns
-        self.tracking_params = {
-            'youtube': ['t', 'feature', 'app', 'si'],
-            'facebook': ['fbclid', 'ref', 'source', 'hash'],
-            'instagram': ['igshid', 'img_index'],
-            'twitter': ['s', 'ref_src', 'ref_url'],
-            'reddit': ['utm_source', 'utm_medium', 'utm_campaign'],
-            'common': ['utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content']
-        }
+        self.tracking_params = TRACKING_PARAMS
         
         # Content similarity thresholds
         self.similarity_thresholds = {
@@ -43,6 +365,21 @@ class DeduplicationEngine:
             'metadata_similarity': 0.95  # High threshold for metadata (author+date)
         }
         
+        # In-process URL indexes, warmed from stage_results in initialize()
+        self.url_lsh = {}            # (competitor_id, platform_id) -> MinHashLSH keyed by stage_id
+        self.lsh_urls = {}           # stage_id -> normalized URL, to confirm LSH candidates
+        self.lsh_entries = deque()   # (inserted_at, stage_id, lsh key) in insertion order, for eviction
+        self.lsh_refreshed_at = None
+        
+        # Cleared when the pg_trgm extension turns out to be missing
+        self.trgm_available = True
+        
+        # Optional Redis cache in front of the exact hash lookups
+        self.redis = None
+        
+        # Worker processes for the CPU-bound group similarity scan
+        self.cpu_pool = None
+        
         self.stats = {
             'urls_processed': 0,
             'url_duplicates_found': 0,
@@ -55,71 +392,133 @@ class DeduplicationEngine:
         """Initialize deduplication engine"""
         try:
             self.db = await get_database()
+            await self.connect_cache()
+            await self.load_url_indexes()
+            
+            if RAPIDFUZZ_AVAILABLE and self.cpu_pool is None:
+                # Never fork the running event loop (open pool, Redis client): start workers clean
+                start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+                self.cpu_pool = ProcessPoolExecutor(
+                    max_workers=os.cpu_count(),
+                    mp_context=multiprocessing.get_context(start_method)
+                )
             logger.info("✅ Deduplication Engine initialized")
             return True
         except Exception as e:
             logger.error(f"❌ Deduplication Engine initialization failed: {e}")
             return False
     
-    def normalize_url(self, url: str, platform: str = '') -> str:
-        """Normalize URL by removing tracking parameters and standardizing format"""
+    async def connect_cache(self):
+        """Connect the Redis lookup cache (skipped when redis is not installed or reachable)"""
+        if not REDIS_AVAILABLE:
+            return
         
         try:
-            parsed = urlparse(url)
-            
-            # Remove tracking parameters
-            params_to_remove = set(self.tracking_params.get('common', []))
-            if platform in self.tracking_params:
-                params_to_remove.update(self.tracking_params[platform])
-            
-            # Parse query parameters
-            query_params = parse_qs(parsed.query)
-            cleaned_params = {k: v for k, v in query_params.items() if k not in params_to_remove}
-            
-            # Rebuild query string
-            new_query = '&'.join([f"{k}={v[0]}" for k, v in cleaned_params.items()])
-            
-            # Rebuild URL
-            cleaned_parsed = parsed._replace(query=new_query)
-            normalized_url = urlunparse(cleaned_parsed)
-            
-            # Additional platform-specific normalization
-            if platform == 'youtube':
-                # Convert youtu.be to youtube.com/watch
-                if 'youtu.be/' in normalized_url:
-                    video_id = normalized_url.split('youtu.be/')[1].split('?')[0]
-                    normalized_url = f"https://www.youtube.com/watch?v={video_id}"
-                
-                # Ensure consistent youtube.com domain
-                normalized_url = normalized_url.replace('m.youtube.com', 'www.youtube.com')
-            
-            elif platform == 'facebook':
-                # Standardize Facebook URLs
-                normalized_url = normalized_url.replace('m.facebook.com', 'www.facebook.com')
-                normalized_url = normalized_url.replace('web.facebook.com', 'www.facebook.com')
-            
-            elif platform == 'twitter':
-                # Handle both twitter.com and x.com
-                normalized_url = normalized_url.replace('twitter.com', 'x.com')
-                normalized_url = normalized_url.replace('mobile.x.com', 'x.com')
-            
-            return normalized_url.lower().strip()
-            
+            client = aioredis.from_url(os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+            await client.ping()
+            self.redis = client
+            logger.info("✅ Redis duplicate cache connected")
         except Exception as e:
-            logger.warning(f"URL normalization failed for {url}: {e}")
-            return url.lower().strip()
+            logger.warning(f"⚠️ Redis duplicate cache unavailable, using database only: {e}")
+    
+    async def close(self):
+        """Close the Redis lookup cache and the worker processes"""
+        if self.redis:
+            await self.redis.close()
+            self.redis = None
+        
+        if self.cpu_pool:
+            self.cpu_pool.shutdown(wait=False, cancel_futures=True)
+            self.cpu_pool = None
+    
+    async def cached_lookup(self, key: str, lookup) -> Optional[int]:
+        """Resolve key from Redis, or await lookup() and cache its id (0 marks a cached miss)"""
+        if self.redis:
+            try:
+                cached = await self.redis.get(key)
+                if cached is not None:
+                    return int(cached) or None
+            except Exception as e:
+                logger.debug(f"Redis get failed for {key}: {e}")
+        
+        found_id = await lookup()
+        
+        if self.redis:
+            try:
+                await self.redis.setex(key, DUP_CACHE_TTL if found_id else DUP_MISS_TTL, found_id or 0)
+            except Exception as e:
+                logger.debug(f"Redis set failed for {key}: {e}")
+        
+        return found_id
+    
+    async def load_url_indexes(self):
+        """Build the MinHash-LSH index from the last URL_INDEX_WINDOW of stage_results"""
+        if DATASKETCH_AVAILABLE:
+            await self.refresh_url_index()
+            logger.info(f"🔎 URL LSH index loaded with {len(self.lsh_urls)} recent URLs")
+    
+    async def refresh_url_index(self):
+        """Index stage_results URLs inserted since the last refresh (by any process) and
+        evict entries older than URL_INDEX_WINDOW"""
+        refreshed_at = datetime.now(timezone.utc)
+        since = refreshed_at - URL_INDEX_WINDOW
+        if self.lsh_refreshed_at is not None:
+            since = max(since, self.lsh_refreshed_at - URL_INDEX_REFRESH_OVERLAP)
+        
+        rows = await self.db.execute_query("""
+            SELECT stage_id, competitor_id, platform_id, url, inserted_at FROM stage_results
+            WHERE inserted_at >= $1
+            ORDER BY inserted_at
+        """, (since,))
+        for row in rows:
+            self.index_url_minhash(row['stage_id'], row['url'], row['competitor_id'], row['platform_id'], row['inserted_at'])
+        self.lsh_refreshed_at = refreshed_at
+        
+        # Entries are appended in inserted_at order, so expired ones sit at the front
+        cutoff = refreshed_at - URL_INDEX_WINDOW
+        while self.lsh_entries and self.lsh_entries[0][0] < cutoff:
+            _, stage_id, key = self.lsh_entries.popleft()
+            self.url_lsh[key].remove(stage_id)
+            del self.lsh_urls[stage_id]
+    
+    def url_minhash(self, normalized_url: str) -> 'MinHash':
+        """MinHash signature of a normalized URL"""
+        minhash = MinHash(num_perm=URL_LSH_NUM_PERM)
+        minhash.update_batch(list(_url_shingles(normalized_url)))
+        return minhash
+    
+    def index_url_minhash(self, stage_id: int, url: str, competitor_id: int, platform_id: int, inserted_at: datetime):
+        """Add a URL to the near-duplicate LSH index of its competitor/platform"""
+        if stage_id in self.lsh_urls:
+            return
+        
+        key = (competitor_id, platform_id)
+        lsh = self.url_lsh.get(key)
+        if lsh is None:
+            lsh = self.url_lsh[key] = MinHashLSH(
+                threshold=self.similarity_thresholds['url_similarity'],
+                num_perm=URL_LSH_NUM_PERM
+            )
+        
+        normalized_url = self.normalize_url(url)
+        lsh.insert(stage_id, self.url_minhash(normalized_url))
+        self.lsh_urls[stage_id] = normalized_url
+        self.lsh_entries.append((inserted_at, stage_id, key))
+    
+    def normalize_url(self, url: str, platform: str = '') -> str:
+        """Normalize URL by removing tracking parameters and standardizing format"""
+        return _normalize_url(url, platform)
     
     def generate_url_hash(self, url: str, platform: str = '') -> str:
         """Generate hash for normalized URL"""
-        normalized_url = self.normalize_url(url, platform)
-        return hashlib.sha256(normalized_url.encode()).hexdigest()
+        return _url_hash(url, platform)
     
     def generate_content_hash(self, title: str, content: str, author: str, published_at: datetime = None) -> str:
         """Generate hash for content similarity matching"""
         
         # Normalize text
-        title_clean = re.sub(r'[^\w\s\u0B80-\u0BFF]', '', title or '').lower().strip()
-        content_clean = re.sub(r'[^\w\s\u0B80-\u0BFF]', '', content or '').lower().strip()
+        title_clean = _replace_punctuation(title or '', '').lower().strip()
+        content_clean = _replace_punctuation(content or '', '').lower().strip()
         author_clean = (author or '').lower().strip()
         
         # Create content signature
@@ -130,26 +529,28 @@ class DeduplicationEngine:
             date_str = published_at.strftime('%Y-%m-%d')
             content_signature += f"|{date_str}"
         
-        return hashlib.md5(content_signature.encode()).hexdigest()
+        return hashlib.md5(content_signature.encode(), usedforsecurity=False).hexdigest()
+    
+    def generate_content_signature(self, title: str, content: str, author: str) -> str:
+        """Same md5 as the final_results.content_sig generated column"""
+        signature = f"{title or ''}|{(content or '')[:500]}|{author or ''}"
+        return hashlib.md5(signature.encode('utf-8'), usedforsecurity=False).hexdigest()
     
     async def check_url_duplicate(self, url: str, competitor_id: int, platform_id: int, platform_name: str = '') -> Tuple[bool, Optional[int]]:
         """Check if URL is duplicate (hard deduplication)"""
         
         try:
-            url_hash = self.generate_url_hash(url, platform_name)
+            # Exact matches use the stored key; normalized-form matches are left to the similarity check
+            url_hash = _stored_url_hash(url)
             
-            # Check for exact hash match
-            existing_query = """
-            SELECT stage_id, url FROM stage_results 
-            WHERE competitor_id = $1 AND platform_id = $2 AND url_hash = $3
-            LIMIT 1
-            """
-            
-            existing = await self.db.execute_query(existing_query, (competitor_id, platform_id, url_hash))
+            existing = await self.cached_lookup(
+                f"dup:u:{competitor_id}:{platform_id}:{url_hash}",
+                lambda: self.find_url_hash(url_hash, competitor_id, platform_id)
+            )
             
             if existing:
                 logger.debug(f"🔄 URL duplicate found: {url}")
-                return True, existing[0]['stage_id']
+                return True, existing
             
             # Check for similar URLs (fuzzy matching)
             similar_stage_id = await self.check_url_similarity(url, competitor_id, platform_id)
@@ -162,10 +563,26 @@ class DeduplicationEngine:
             logger.error(f"URL duplicate check failed: {e}")
             return False, None
     
+    async def find_url_hash(self, url_hash: str, competitor_id: int, platform_id: int) -> Optional[int]:
+        """Look up the stage_id stored under an exact URL hash"""
+        
+        existing_query = """
+        SELECT stage_id FROM stage_results 
+        WHERE competitor_id = $1 AND platform_id = $2 AND url_hash = $3
+        LIMIT 1
+        """
+        
+        existing = await self.db.execute_query(existing_query, (competitor_id, platform_id, url_hash))
+        
+        return existing[0]['stage_id'] if existing else None
+    
     async def check_url_similarity(self, url: str, competitor_id: int, platform_id: int) -> Optional[int]:
         """Check for similar URLs using fuzzy matching"""
         
         try:
+            if DATASKETCH_AVAILABLE:
+                return await self.check_url_similarity_lsh(url, competitor_id, platform_id)
+            
             # Get recent URLs from same competitor and platform
             recent_urls_query = """
             SELECT stage_id, url FROM stage_results 
@@ -184,7 +601,8 @@ class DeduplicationEngine:
                 normalized_existing = self.normalize_url(existing_url)
                 
                 # Calculate URL similarity
-                similarity = difflib.SequenceMatcher(None, normalized_new_url, normalized_existing).ratio()
+                similarity = _url_similarity(normalized_new_url, normalized_existing,
+                                             self.similarity_thresholds['url_similarity'])
                 
                 if similarity >= self.similarity_thresholds['url_similarity']:
                     logger.debug(f"🔄 Similar URL found: {similarity:.2f} similarity")
@@ -196,30 +614,49 @@ class DeduplicationEngine:
             logger.error(f"URL similarity check failed: {e}")
             return None
     
+    async def check_url_similarity_lsh(self, url: str, competitor_id: int, platform_id: int) -> Optional[int]:
+        """Find a similar recent URL through the in-process LSH index"""
+        
+        # Other processes (Celery workers, the discovery engine) insert too; catch up first
+        await self.refresh_url_index()
+        
+        lsh = self.url_lsh.get((competitor_id, platform_id))
+        if lsh is None:
+            return None
+        
+        normalized_new_url = self.normalize_url(url)
+        
+        # LSH candidates are approximate; confirm each against the stored normalized URL
+        for stage_id in lsh.query(self.url_minhash(normalized_new_url)):
+            similarity = _url_similarity(normalized_new_url, self.lsh_urls[stage_id],
+                                         self.similarity_thresholds['url_similarity'])
+            
+            if similarity >= self.similarity_thresholds['url_similarity']:
+                logger.debug(f"🔄 Similar URL found: {similarity:.2f} similarity")
+                return stage_id
+        
+        return None
+    
     async def check_content_duplicate(self, title: str, content: str, author: str, 
                                     published_at: datetime, competitor_id: int, platform_id: int) -> Tuple[bool, Optional[int]]:
         """Check for content duplicates (soft deduplication)"""
         
         try:
-            content_hash = self.generate_content_hash(title, content, author, published_at)
+            content_sig = self.generate_content_signature(title, content, author)
             
-            # Check for exact content hash match
-            existing_query = """
-            SELECT fr.result_id, fr.title, fr.author 
-            FROM final_results fr
-            WHERE fr.competitor_id = $1 AND fr.platform_id = $2
-            AND md5(CONCAT(COALESCE(fr.title, ''), '|', COALESCE(SUBSTRING(fr.content, 1, 500), ''), '|', COALESCE(fr.author, ''))) = $3
-            AND DATE(fr.published_at) = DATE($4)
-            LIMIT 1
-            """
+            # published_at_date is the UTC calendar day (asyncpg sends naive datetimes as UTC)
+            published_date = None
+            if published_at:
+                published_date = (published_at.astimezone(timezone.utc) if published_at.tzinfo else published_at).date()
             
-            existing = await self.db.execute_query(existing_query, (
-                competitor_id, platform_id, content_hash, published_at
-            ))
+            existing = await self.cached_lookup(
+                f"dup:c:{competitor_id}:{platform_id}:{published_date}:{content_sig}",
+                lambda: self.find_content_hash(content_sig, competitor_id, platform_id, published_date)
+            )
             
             if existing:
                 logger.debug(f"🔄 Content duplicate found: {title}")
-                return True, existing[0]['result_id']
+                return True, existing
             
             # Check for similar content using trigram similarity
             similar_result_id = await self.check_content_similarity(
@@ -235,6 +672,24 @@ class DeduplicationEngine:
             logger.error(f"Content duplicate check failed: {e}")
             return False, None
     
+    async def find_content_hash(self, content_sig: str, competitor_id: int, platform_id: int,
+                                published_date) -> Optional[int]:
+        """Look up the result_id stored under an exact content signature (index probe)"""
+        
+        existing_query = """
+        SELECT fr.result_id
+        FROM final_results fr
+        WHERE fr.competitor_id = $1 AND fr.platform_id = $2
+        AND fr.published_at_date = $3 AND fr.content_sig = $4
+        LIMIT 1
+        """
+        
+        existing = await self.db.execute_query(existing_query, (
+            competitor_id, platform_id, published_date, content_sig
+        ))
+        
+        return existing[0]['result_id'] if existing else None
+    
     async def check_content_similarity(self, title: str, content: str, author: str,
                                      published_at: datetime, competitor_id: int, platform_id: int) -> Optional[int]:
         """Check for similar content using text similarity"""
@@ -283,33 +738,6 @@ class DeduplicationEngine:
             logger.error(f"Content similarity check failed: {e}")
             return None
     
-    def calculate_text_similarity(self, text1: str, text2: str) -> float:
-        """Calculate text similarity using multiple methods"""
-        
-        if not text1 or not text2:
-            return 0.0
-        
-        # Normalize texts
-        text1_clean = re.sub(r'[^\w\s\u0B80-\u0BFF]', ' ', text1.lower()).strip()
-        text2_clean = re.sub(r'[^\w\s\u0B80-\u0BFF]', ' ', text2.lower()).strip()
-        
-        # Sequence similarity
-        seq_similarity = difflib.SequenceMatcher(None, text1_clean, text2_clean).ratio()
-        
-        # Word-based similarity
-        words1 = set(text1_clean.split())
-        words2 = set(text2_clean.split())
-        
-        if not words1 or not words2:
-            return seq_similarity
-        
-        word_similarity = len(words1.intersection(words2)) / len(words1.union(words2))
-        
-        # Combined similarity (weighted average)
-        combined_similarity = (seq_similarity * 0.6) + (word_similarity * 0.4)
-        
-        return combined_similarity
-    
     async def deduplicate_stage_results(self, competitor_ids: List[int] = None, platform_ids: List[int] = None) -> Dict[str, Any]:
         """Run deduplication on stage_results"""
         
@@ -317,52 +745,41 @@ class DeduplicationEngine:
         start_time = datetime.now()
         
         try:
-            # Get potentially duplicate URLs
+            # Find and mark duplicate URLs server-side; only the count comes back.
+            # NULL filters mean "all", so the SQL text (and its cached plan) never changes.
             duplicates_query = """
-            SELECT sr1.stage_id, sr1.url, sr1.url_hash, sr1.competitor_id, sr1.platform_id,
-                   sr1.title, sr1.author, sr1.published_at, sr1.inserted_at
-            FROM stage_results sr1
-            WHERE EXISTS (
-                SELECT 1 FROM stage_results sr2 
-                WHERE sr2.url_hash = sr1.url_hash 
-                AND sr2.stage_id < sr1.stage_id
+            WITH marked AS (
+                UPDATE stage_results sr
+                SET status = 'duplicate'
+                FROM (
+                    SELECT sr1.stage_id
+                    FROM stage_results sr1
+                    WHERE EXISTS (
+                        SELECT 1 FROM stage_results sr2 
+                        WHERE sr2.url_hash = sr1.url_hash 
+                        AND sr2.stage_id < sr1.stage_id
+                    )
+                    AND sr1.status != 'duplicate'
+                    AND ($1::int[] IS NULL OR sr1.competitor_id = ANY($1))
+                    AND ($2::int[] IS NULL OR sr1.platform_id = ANY($2))
+                    ORDER BY sr1.inserted_at DESC
+                    LIMIT 1000
+                ) d
+                WHERE sr.stage_id = d.stage_id
+                RETURNING 1
             )
-            AND sr1.status != 'duplicate'
+            SELECT COUNT(*) FROM marked
             """
             
-            params = []
-            if competitor_ids:
-                query += f" AND sr1.competitor_id = ANY($1)"
-                params.append(competitor_ids)
-            
-            if platform_ids:
-                param_num = len(params) + 1
-                query += f" AND sr1.platform_id = ANY(${param_num})"
-                params.append(platform_ids)
-            
-            duplicates_query += " ORDER BY sr1.inserted_at DESC LIMIT 1000"
-            
-            potential_duplicates = await self.db.execute_query(duplicates_query, tuple(params) if params else ())
-            
-            duplicates_marked = 0
-            
-            for duplicate in potential_duplicates:
-                try:
-                    # Mark as duplicate
-                    await self.db.execute_query(
-                        "UPDATE stage_results SET status = 'duplicate' WHERE stage_id = $1",
-                        (duplicate['stage_id'],)
-                    )
-                    duplicates_marked += 1
-                    
-                except Exception as e:
-                    logger.error(f"Failed to mark duplicate: {e}")
+            duplicates_marked = await self.db.execute_scalar(
+                duplicates_query, competitor_ids or None, platform_ids or None
+            )
             
             duration = (datetime.now() - start_time).total_seconds()
             
             logger.info(f"✅ Stage deduplication completed in {duration:.1f}s: {duplicates_marked} duplicates marked")
             
-            self.stats['urls_processed'] += len(potential_duplicates)
+            self.stats['urls_processed'] += duplicates_marked
             self.stats['url_duplicates_found'] += duplicates_marked
             
             return {
@@ -387,53 +804,75 @@ class DeduplicationEngine:
         start_time = datetime.now()
         
         try:
-            # Get recent results for similarity checking
-            recent_results_query = """
-            SELECT result_id, title, content, author, published_at, competitor_id, platform_id
-            FROM final_results
-            WHERE scraped_at >= NOW() - INTERVAL '24 hours'
-            AND is_latest = TRUE
-            """
-            
-            params = []
-            if competitor_ids:
-                recent_results_query += f" AND competitor_id = ANY($1)"
-                params.append(competitor_ids)
-            
-            if platform_ids:
-                param_num = len(params) + 1
-                recent_results_query += f" AND platform_id = ANY(${param_num})"
-                params.append(platform_ids)
-            
-            recent_results_query += " ORDER BY published_at DESC LIMIT 1000"
-            
-            recent_results = await self.db.execute_query(recent_results_query, tuple(params) if params else ())
-            
-            # Group by competitor and platform for efficiency
+            duplicate_ids = None
             grouped_results = {}
-            for result in recent_results:
-                key = (result['competitor_id'], result['platform_id'])
-                if key not in grouped_results:
-                    grouped_results[key] = []
-                grouped_results[key].append(dict(result))
+            
+            # Let pg_trgm compare server-side; fall back to Python if the extension is missing
+            if self.trgm_available:
+                try:
+                    duplicate_ids = await self.find_content_duplicates_sql(competitor_ids, platform_ids)
+                except asyncpg.exceptions.UndefinedFunctionError:
+                    logger.warning("pg_trgm not installed; run new_schema.py. Comparing content in Python")
+                    self.trgm_available = False
+            
+            if duplicate_ids is None:
+                # Get recent results for similarity checking (only the compared 500 chars of content)
+                recent_results_query = """
+                SELECT result_id, title, LEFT(content, 500) AS content, author, published_at, competitor_id, platform_id
+                FROM final_results
+                WHERE scraped_at >= NOW() - INTERVAL '24 hours'
+                AND is_latest = TRUE
+                AND ($1::int[] IS NULL OR competitor_id = ANY($1))
+                AND ($2::int[] IS NULL OR platform_id = ANY($2))
+                ORDER BY published_at DESC LIMIT 1000
+                """
+                params = (competitor_ids or None, platform_ids or None)
+                
+                # Stream rows through a server-side cursor, grouping by competitor and platform.
+                # Exact repeats (same cleaned title/content/author) are resolved while streaming
+                # and never reach the pairwise comparison.
+                grouped_results = {}
+                duplicate_ids = []
+                async with self.db.acquire() as conn:
+                    async with conn.transaction():
+                        async for row in conn.cursor(recent_results_query, *params, prefetch=200):
+                            result = dict(row)
+                            group = grouped_results.setdefault((result['competitor_id'], result['platform_id']), {})
+                            signature = (
+                                _clean_text(result['title'] or ''),
+                                _clean_text(result['content'] or ''),
+                                (result['author'] or '').lower()
+                            )
+                            if not (signature[0] and signature[1]):
+                                signature = result['result_id']  # Empty text never matches
+                            
+                            seen = group.get(signature)
+                            if seen is not None:
+                                # Keep the earlier one; rows arrive newest first
+                                later_id = _later_result_id(seen, result)
+                                duplicate_ids.append(later_id)
+                                if later_id == seen['result_id']:
+                                    group[signature] = result
+                            else:
+                                group[signature] = result
+                
+                grouped_results = {key: list(group.values()) for key, group in grouped_results.items()}
+                
+                # Check for duplicates within each group; groups run in parallel across the pool
+                group_duplicates = await asyncio.gather(*(
+                    self.find_content_duplicates_in_group(results) for results in grouped_results.values()
+                ))
+                duplicate_ids.extend(result_id for duplicates in group_duplicates for result_id in duplicates)
             
             content_duplicates_found = 0
             
-            # Check for duplicates within each group
-            for (competitor_id, platform_id), results in grouped_results.items():
-                duplicates = await self.find_content_duplicates_in_group(results)
-                
-                for duplicate_id in duplicates:
-                    try:
-                        # Mark as not latest (soft deletion)
-                        await self.db.execute_query(
-                            "UPDATE final_results SET is_latest = FALSE WHERE result_id = $1",
-                            (duplicate_id,)
-                        )
-                        content_duplicates_found += 1
-                        
-                    except Exception as e:
-                        logger.error(f"Failed to mark content duplicate: {e}")
+            if duplicate_ids:
+                # Mark as not latest (soft deletion) in one statement
+                await self.db.execute(
+                    "UPDATE final_results SET is_latest = FALSE WHERE result_id = ANY($1::bigint[])",
+                    duplicate_ids
+                )
+                content_duplicates_found = len(duplicate_ids)
             
             duration = (datetime.now() - start_time).total_seconds()
             
@@ -457,51 +896,77 @@ class DeduplicationEngine:
                 'stats': self.stats
             }
     
+    async def find_content_duplicates_sql(self, competitor_ids: List[int] = None,
+                                          platform_ids: List[int] = None) -> List[int]:
+        """Find content duplicates among recent final_results with pg_trgm (GIN-indexed) in one query"""
+        
+        # The % operators prune candidates through the trigram indexes; similarity() applies
+        # the real thresholds. Of each similar pair, the later-published result is the duplicate.
+        query = """
+        SELECT DISTINCT b.result_id
+        FROM final_results a
+        JOIN final_results b
+          ON b.competitor_id = a.competitor_id
+         AND b.platform_id = a.platform_id
+         AND b.result_id <> a.result_id
+         AND b.title % a.title
+         AND LEFT(b.content, 500) % LEFT(a.content, 500)
+        WHERE a.scraped_at >= NOW() - INTERVAL '24 hours' AND a.is_latest = TRUE
+        AND b.scraped_at >= NOW() - INTERVAL '24 hours' AND b.is_latest = TRUE
+        AND ($1::int[] IS NULL OR a.competitor_id = ANY($1))
+        AND ($2::int[] IS NULL OR a.platform_id = ANY($2))
+        AND similarity(a.title, b.title) >= $3
+        AND similarity(LEFT(a.content, 500), LEFT(b.content, 500)) >= $4
+        AND (LOWER(COALESCE(a.author, '')) = LOWER(COALESCE(b.author, ''))
+             OR a.published_at IS NULL OR b.published_at IS NULL
+             OR ABS(EXTRACT(EPOCH FROM a.published_at - b.published_at)) < 172800)
+        AND (COALESCE(a.published_at, '-infinity'), a.result_id)
+          < (COALESCE(b.published_at, '-infinity'), b.result_id)
+        """
+        
+        rows = await self.db.execute_query(query, (
+            competitor_ids or None,
+            platform_ids or None,
+            self.similarity_thresholds['title_similarity'],
+            self.similarity_thresholds['content_similarity']
+        ))
+        
+        return [row['result_id'] for row in rows]
+    
     async def find_content_duplicates_in_group(self, results: List[Dict]) -> Set[int]:
         """Find content duplicates within a group of results"""
         
-        duplicates = set()
+        if RAPIDFUZZ_AVAILABLE:
+            # Off the event loop: the pool provides the parallelism, so each task uses one thread
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self.cpu_pool, _vectorized_group_dedup, results, self.similarity_thresholds, 1
+            )
+        
+        # Only pairs inside a same-author / nearby-day block can be duplicates
+        candidate_pairs = {
+            (min(i, j), max(i, j))
+            for rows, cols in _candidate_blocks(results)
+            for i in rows for j in cols if i != j
+        }
         
-        for i, result1 in enumerate(results):
-            if result1['result_id'] in duplicates:
-                continue
+        similar_pairs = set()
+        for i, j in candidate_pairs:
+            result1, result2 = results[i], results[j]
             
-            for j, result2 in enumerate(results[i+1:], i+1):
-                if result2['result_id'] in duplicates:
-                    continue
-                
-                # Calculate similarity
-                title_sim = self.calculate_text_similarity(
-                    result1.get('title', ''), result2.get('title', '')
-                )
-                content_sim = self.calculate_text_similarity(
-                    result1.get('content', ''), result2.get('content', '')
-                )
-                
-                # Check author and date similarity
-                same_author = (result1.get('author', '') or '').lower() == (result2.get('author', '') or '').lower()
-                
-                date_diff = 0
-                if result1.get('published_at') and result2.get('published_at'):
-                    date_diff = abs((result1['published_at'] - result2['published_at']).days)
-                
-                # Determine if duplicate
-                is_duplicate = (
-                    title_sim >= self.similarity_thresholds['title_similarity'] and
-                    content_sim >= self.similarity_thresholds['content_similarity'] and
-                    (same_author or date_diff <= 1)  # Same author OR published within 1 day
-                )
-                
-                if is_duplicate:
-                    # Keep the earlier result, mark later as duplicate
-                    if result1.get('published_at', datetime.min) <= result2.get('published_at', datetime.min):
-                        duplicates.add(result2['result_id'])
-                    else:
-                        duplicates.add(result1['result_id'])
-                    
-                    logger.debug(f"🔄 Content duplicate: title_sim={title_sim:.2f}, content_sim={content_sim:.2f}")
+            # Calculate similarity
+            title_sim = self.calculate_text_similarity(
+                result1.get('title', ''), result2.get('title', '')
+            )
+            content_sim = self.calculate_text_similarity(
+                result1.get('content', ''), result2.get('content', '')
+            )
+            
+            if (title_sim >= self.similarity_thresholds['title_similarity'] and
+                content_sim >= self.similarity_thresholds['content_similarity']):
+                similar_pairs.add((i, j))
         
-        return duplicates
+        return _mark_duplicate_pairs(results, similar_pairs)
     
     def calculate_text_similarity(self, text1: str, text2: str) -> float:
         """Calculate text similarity with Tamil language support"""
@@ -510,8 +975,8 @@ class DeduplicationEngine:
             return 0.0
         
         # Normalize texts (remove punctuation, lowercase)
-        text1_clean = re.sub(r'[^\w\s\u0B80-\u0BFF]', ' ', text1.lower()).strip()
-        text2_clean = re.sub(r'[^\w\s\u0B80-\u0BFF]', ' ', text2.lower()).strip()
+        text1_clean = _replace_punctuation(text1.lower()).strip()
+        text2_clean = _replace_punctuation(text2.lower()).strip()
         
         # Remove extra whitespace
         text1_clean = ' '.join(text1_clean.split())
@@ -520,42 +985,26 @@ class DeduplicationEngine:
         if not text1_clean or not text2_clean:
             return 0.0
         
-        # Sequence matcher similarity
-        seq_similarity = difflib.SequenceMatcher(None, text1_clean, text2_clean).ratio()
-        
-        # Word-based Jaccard similarity
-        words1 = set(text1_clean.split())
-        words2 = set(text2_clean.split())
-        
-        if words1 or words2:
-            jaccard_similarity = len(words1.intersection(words2)) / len(words1.union(words2))
-        else:
-            jaccard_similarity = 0.0
-        
-        # N-gram similarity (for better handling of word order differences)
-        ngram_similarity = self.calculate_ngram_similarity(text1_clean, text2_clean, n=3)
-        
-        # Weighted combination
-        combined_similarity = (seq_similarity * 0.4) + (jaccard_similarity * 0.4) + (ngram_similarity * 0.2)
+        if RAPIDFUZZ_AVAILABLE:
+            # Same scorer as _vectorized_group_dedup, so both paths share the 0.90/0.85 thresholds;
+            # below 0.80 is never a duplicate
+            return fuzz.ratio(text1_clean, text2_clean, score_cutoff=80) / 100
         
-        return combined_similarity
+        # MinHash estimate of the 3-gram Jaccard similarity: one vectorized compare of two signatures
+        return float(np.mean(_text_minhash(text1_clean) == _text_minhash(text2_clean)))
     
     def calculate_ngram_similarity(self, text1: str, text2: str, n: int = 3) -> float:
         """Calculate n-gram similarity"""
         
-        def get_ngrams(text: str, n: int) -> Set[str]:
-            return set([text[i:i+n] for i in range(len(text) - n + 1)])
-        
         if len(text1) < n or len(text2) < n:
             return 0.0
         
-        ngrams1 = get_ngrams(text1, n)
-        ngrams2 = get_ngrams(text2, n)
+        ngrams1 = _ngram_hashes(text1, n)
+        ngrams2 = _ngram_hashes(text2, n)
         
-        if not ngrams1 or not ngrams2:
-            return 0.0
-        
-        return len(ngrams1.intersection(ngrams2)) / len(ngrams1.union(ngrams2))
+        # Both arrays are already unique, so Jaccard is one sorted intersection
+        shared = len(np.intersect1d(ngrams1, ngrams2, assume_unique=True))
+        return shared / (len(ngrams1) + len(ngrams2) - shared)
     
     async def cleanup_old_duplicates(self, days_old: int = 7) -> Dict[str, Any]:
         """Clean up old duplicate records"""
@@ -565,31 +1014,47 @@ class DeduplicationEngine:
         try:
             # Delete old duplicate stage_results
             stage_cleanup_query = """
-            DELETE FROM stage_results 
-            WHERE status = 'duplicate' 
-            AND inserted_at < NOW() - INTERVAL '%s days'
-            """ % days_old
+            WITH deleted AS (
+                DELETE FROM stage_results
+                WHERE ctid = ANY(ARRAY(
+                    SELECT ctid FROM stage_results
+                    WHERE status = 'duplicate'
+                    AND inserted_at < NOW() - make_interval(days => $1)
+                    LIMIT $2
+                ))
+                RETURNING 1
+            )
+            SELECT COUNT(*) FROM deleted
+            """
             
-            stage_result = await self.db.execute_query(stage_cleanup_query)
+            stage_deleted = await self.delete_in_batches(stage_cleanup_query, days_old)
             
             # Clean up old non-latest final_results
             final_cleanup_query = """
-            DELETE FROM final_results 
-            WHERE is_latest = FALSE 
-            AND scraped_at < NOW() - INTERVAL '%s days'
-            """ % days_old
+            WITH deleted AS (
+                DELETE FROM final_results
+                WHERE ctid = ANY(ARRAY(
+                    SELECT ctid FROM final_results
+                    WHERE is_latest = FALSE
+                    AND scraped_at < NOW() - make_interval(days => $1)
+                    LIMIT $2
+                ))
+                RETURNING 1
+            )
+            SELECT COUNT(*) FROM deleted
+            """
             
-            final_result = await self.db.execute_query(final_cleanup_query)
+            final_deleted = await self.delete_in_batches(final_cleanup_query, days_old)
             
             # Update stats
             self.stats['cleanup_operations'] += 1
             
-            logger.info(f"✅ Cleanup completed: stage_results cleaned, final_results cleaned")
+            logger.info(f"✅ Cleanup completed: {stage_deleted} stage_results, {final_deleted} final_results deleted")
             
             return {
                 'success': True,
-                'stage_records_deleted': 0,  # asyncpg doesn't return rowcount easily
-                'final_records_deleted': 0,
+                'stage_records_deleted': stage_deleted,
+                'final_records_deleted': final_deleted,
                 'timestamp': datetime.now().isoformat()
             }
             
@@ -601,6 +1066,16 @@ class DeduplicationEngine:
                 'timestamp': datetime.now().isoformat()
             }
     
+    async def delete_in_batches(self, query: str, days_old: int) -> int:
+        """Repeat a batched DELETE (params: days, batch size) until it removes nothing; returns the total.
+        Each batch is its own short transaction, so locks and WAL stay bounded."""
+        total_deleted = 0
+        while True:
+            deleted = await self.db.execute_scalar(query, days_old, CLEANUP_BATCH_ROWS)
+            if not deleted:
+                return total_deleted
+            total_deleted += deleted
+    
     async def get_duplicate_statistics(self) -> Dict[str, Any]:
         """Get deduplication statistics"""
         
@@ -619,8 +1094,6 @@ class DeduplicationEngine:
             ORDER BY duplicate_rate DESC
             """
             
-            url_stats = await self.db.execute_query(url_duplicates_query)
-            
             # Content duplicates by competitor
             content_duplicates_query = """
             SELECT 
@@ -635,7 +1108,11 @@ class DeduplicationEngine:
             ORDER BY duplicate_rate DESC
             """
             
-            content_stats = await self.db.execute_query(content_duplicates_query)
+            # Independent aggregates: run them on two pooled connections at once
+            url_stats, content_stats = await asyncio.gather(
+                self.db.execute_query(url_duplicates_query),
+                self.db.execute_query(content_duplicates_query)
+            )
             
             return {
                 'url_duplicates_by_platform': [dict(row) for row in url_stats],
@@ -700,4 +1177,5 @@ if __name__ == "__main__":
             result = await engine.deduplicate_stage_results()
             print(f"Deduplication test result: {result}")
     
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(test_deduplication())
\ No newline at end of file
@@ -5,11 +5,30 @@ Finds URLs from keywords/sources and stores in staging with deduplication
 """
 
 import asyncio
+import functools
 import logging
 import hashlib
-from datetime import datetime, timedelta
+import re
+from itertools import islice
+from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Any, Tuple
+from urllib.parse import urlsplit, urlunsplit
 import json
+import os
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+import asyncpg
 
 import sys
 sys.path.append('..')
@@ -20,6 +39,160 @@ from services.firecrawl_service import get_firecrawl_service
 
 logger = logging.getLogger(__name__)
 
+# Keyword searches in flight at once in the process_keywords pipeline
+KEYWORD_SEARCH_CONCURRENCY = 20
+
+# Keyword pipeline: searched keywords wait on a bounded queue and are staged by
+# STAGE_WRITERS tasks, up to STAGE_BATCH_KEYWORDS keywords per database write
+PIPELINE_QUEUE_DEPTH = 100
+STAGE_WRITERS = 2
+STAGE_BATCH_KEYWORDS = 5
+
+# Tamil news sites searched (concurrently) through Firecrawl
+NEWS_SITES = ('dinamalar.com', 'thanthi.tv', 'polimer.in', 'vikatan.com')
+
+# Due filters: the due_at() form matches the idx_keywords_due/idx_sources_due expression
+# indexes; the inline form is used while the schema predates due_at()
+KEYWORD_DUE_FILTER = "due_at(k.last_searched, k.search_frequency_hours) < NOW()"
+KEYWORD_DUE_FILTER_INLINE = "k.last_searched < NOW() - INTERVAL '1 hour' * k.search_frequency_hours"
+SOURCE_DUE_FILTER = "due_at(s.last_monitored, s.monitoring_frequency_hours) < NOW()"
+SOURCE_DUE_FILTER_INLINE = "s.last_monitored < NOW() - INTERVAL '1 hour' * s.monitoring_frequency_hours"
+
+# Search API responses are cached in Redis for the keyword's search_frequency_hours
+SEARCH_CACHE_PREFIX = 'discovery'
+
+# One statement per batch: new URLs are inserted, already staged ones are marked
+# 'duplicate' (rows already marked are left alone and return nothing); xmax = 0
+# only for freshly inserted rows. keywords_matched and raw_data travel as JSON
+# text because unnest cannot carry nested arrays
+STAGE_UPSERT_SQL = """
+INSERT INTO stage_results (
+    competitor_id, platform_id, keyword_id, url, url_hash,
+    title, snippet, author, author_id, published_at,
+    discovery_method, content_type, language, keywords_matched,
+    status, raw_data
+)
+SELECT
+    r.competitor_id, r.platform_id, r.keyword_id, r.url, r.url_hash,
+    r.title, r.snippet, r.author, r.author_id, r.published_at,
+    r.discovery_method, r.content_type, r.language,
+    ARRAY(SELECT jsonb_array_elements_text(r.keywords_matched::jsonb)),
+    'pending', r.raw_data::jsonb
+FROM unnest(
+    $1::int[], $2::int[], $3::int[], $4::text[], $5::text[],
+    $6::text[], $7::text[], $8::text[], $9::text[], $10::timestamptz[],
+    $11::text[], $12::text[], $13::text[], $14::text[], $15::text[]
+) AS r(
+    competitor_id, platform_id, keyword_id, url, url_hash,
+    title, snippet, author, author_id, published_at,
+    discovery_method, content_type, language, keywords_matched, raw_data
+)
+ON CONFLICT (competitor_id, platform_id, url_hash) DO UPDATE SET status = 'duplicate'
+WHERE stage_results.status IS DISTINCT FROM 'duplicate'
+RETURNING competitor_id, platform_id, url_hash, (xmax = 0) AS inserted
+"""
+
+def _url_hash(url: str) -> str:
+    """Dedup key for a URL: hex SHA-256, the digest the generate_url_hash() trigger stores"""
+    # Not a security use; must stay SHA-256 for the ON CONFLICT key to match the trigger
+    return hashlib.sha256(url.encode(), usedforsecurity=False).hexdigest()
+
+# Query parameters that only carry click/campaign tracking (plus any utm_*)
+_TRACKING_PARAMS = frozenset(['fbclid', 'gclid', 'igshid', 'mc_eid', 'ref_src'])
+
+def _is_tracking_param(param: str) -> bool:
+    """True for a 'name=value' query item whose name is utm_* or a known click id"""
+    name = param.split('=', 1)[0].lower()
+    return name.startswith('utm_') or name in _TRACKING_PARAMS
+
+@functools.lru_cache(maxsize=65536)
+def _strip_url_noise(url: str) -> str:
+    """Drop the #fragment and tracking parameters so the same page stages under one hash"""
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    if not parts.query and not parts.fragment:
+        return url
+    
+    # Filter the raw query string so the remaining parameters keep their order and encoding
+    query = '&'.join(param for param in parts.query.split('&') if param and not _is_tracking_param(param))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))
+
+@functools.lru_cache(maxsize=4096)
+def _site_and_path(url: str) -> Tuple[str, str]:
+    """(site, path) of a URL, where site is the host's last two labels (m.facebook.com -> facebook.com)
+    
+    Cached because author and content type are read from the same URL back to back.
+    """
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return '', ''
+    host = (parts.hostname or '').rsplit('.', 2)
+    return '.'.join(host[-2:]), parts.path
+
+def _first_path_segment(path: str) -> str:
+    """'/name/status/1' -> 'name'"""
+    return path.lstrip('/').split('/', 1)[0]
+
+def _youtube_handle(path: str) -> str:
+    """'/@channel/videos' -> 'channel'"""
+    return path.split('@', 1)[1].split('/', 1)[0] if '@' in path else ''
+
+# site -> author/channel extractor applied to the URL path
+_AUTHOR_EXTRACTORS = {
+    'youtube.com': _youtube_handle,
+    'facebook.com': _first_path_segment,
+    'instagram.com': _first_path_segment,
+    'twitter.com': _first_path_segment,
+    'x.com': _first_path_segment
+}
+
+# site -> (path pattern or None for any path, content type)
+_CONTENT_TYPE_RULES = {
+    'youtube.com': (re.compile(r'^/(?:watch|shorts/)'), 'video'),
+    'youtu.be': (re.compile(r'^/.'), 'video'),
+    'facebook.com': (re.compile(r'/(?:posts|photo)'), 'post'),
+    'instagram.com': (re.compile(r'^/p/'), 'post'),
+    'twitter.com': (None, 'tweet'),
+    'x.com': (None, 'tweet'),
+    'reddit.com': (None, 'post')
+}
+
+# "3 hours ago", "an hour ago", "5 mins ago" (alternatives longest first)
+_RELATIVE_DATE_RE = re.compile(r'(\d+|an?)\s*(second|sec|minute|min|hour|hr|day|week|month|year)s?\s+ago', re.I)
+_RELATIVE_UNIT_SECONDS = {
+    'second': 1, 'sec': 1,
+    'minute': 60, 'min': 60,
+    'hour': 3600, 'hr': 3600,
+    'day': 86400,
+    'week': 7 * 86400,
+    'month': 30 * 86400,
+    'year': 365 * 86400
+}
+
+def _search_cache_key(service: str, query: str, limit: int) -> str:
+    """Redis key for one search API call; the query is digested to keep keys short"""
+    digest = hashlib.blake2b(f"{query}|{limit}".encode(), digest_size=12).hexdigest()
+    return f"{SEARCH_CACHE_PREFIX}:{service}:{digest}"
+
+def _json_text(value: Any) -> str:
+    """JSON text for a jsonb value sent through a text[] parameter (orjson when installed)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(value, default=str, ensure_ascii=False)
+
+def _dump_cached(results: List[Dict]) -> bytes:
+    """Serialize search results for Redis (orjson when installed)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(results, default=str)
+    return json.dumps(results, default=str, ensure_ascii=False).encode('utf-8')
+
+def _load_cached(data: bytes) -> List[Dict]:
+    """Inverse of _dump_cached"""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
 class DiscoveryEngine:
     """Stage 1: URL Discovery Engine with deduplication"""
     
@@ -28,6 +201,9 @@ class DiscoveryEngine:
         self.serpapi = None
         self.brave = None
         self.firecrawl = None
+        self.redis = None
+        # Cleared if the schema predates the due_at() function
+        self.due_at_available = True
         
         self.stats = {
             'total_keywords_processed': 0,
@@ -45,6 +221,7 @@ class DiscoveryEngine:
             self.serpapi = await get_serpapi_service()
             self.brave = await get_brave_service()
             self.firecrawl = await get_firecrawl_service()
+            await self.connect_cache()
             
             logger.info("✅ Discovery Engine initialized")
             return True
@@ -52,6 +229,46 @@ class DiscoveryEngine:
             logger.error(f"❌ Discovery Engine initialization failed: {e}")
             return False
     
+    async def connect_cache(self):
+        """Connect the Redis search cache (skipped when redis is not installed or reachable)"""
+        if not REDIS_AVAILABLE:
+            return
+        
+        try:
+            client = aioredis.from_url(os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+            await client.ping()
+            self.redis = client
+            logger.info("✅ Redis search cache connected")
+        except Exception as e:
+            logger.warning(f"⚠️ Redis search cache unavailable, calling search APIs directly: {e}")
+    
+    async def close(self):
+        """Close the Redis search cache"""
+        if self.redis:
+            await self.redis.close()
+            self.redis = None
+    
+    async def cached_search(self, key: str, ttl: int, search) -> List[Dict]:
+        """Return cached results for key, or await search() and cache non-empty results for ttl seconds"""
+        if self.redis:
+            try:
+                cached = await self.redis.get(key)
+                if cached is not None:
+                    return _load_cached(cached)
+            except Exception as e:
+                logger.debug(f"Redis get failed for {key}: {e}")
+        
+        results = await search()
+        
+        # Empty answers are not cached: services also return [] on transient failures
+        if self.redis and results:
+            try:
+                await self.redis.setex(key, ttl, _dump_cached(results))
+            except Exception as e:
+                logger.debug(f"Redis set failed for {key}: {e}")
+        
+        return results
+    
     async def run_discovery_cycle(self, competitor_ids: List[int] = None, platform_ids: List[int] = None) -> Dict[str, Any]:
         """Run complete discovery cycle"""
         
@@ -69,22 +286,20 @@ class DiscoveryEngine:
                 'errors': []
             }
             
-            # Get keywords to search
-            keywords = await self.get_keywords_to_search(competitor_ids, platform_ids)
+            # Get keywords to search and sources to monitor (independent queries)
+            keywords, sources = await asyncio.gather(
+                self.get_keywords_to_search(competitor_ids, platform_ids),
+                self.get_sources_to_monitor(competitor_ids, platform_ids)
+            )
             logger.info(f"📝 Found {len(keywords)} keywords to search")
-            
-            # Get sources to monitor  
-            sources = await self.get_sources_to_monitor(competitor_ids, platform_ids)
             logger.info(f"📺 Found {len(sources)} sources to monitor")
             
-            # Process keywords in parallel
-            keyword_tasks = []
-            for keyword_batch in self.batch_items(keywords, 5):  # Process 5 keywords at a time
-                keyword_tasks.append(self.process_keyword_batch(keyword_batch))
-            
-            if keyword_tasks:
-                keyword_results = await asyncio.gather(*keyword_tasks, return_exceptions=True)
-                self.process_keyword_results(keyword_results)
+            # Search keywords and stage their results as one pipeline
+            if keywords:
+                try:
+                    await self.process_keywords(keywords)
+                except Exception as e:
+                    self.process_keyword_results([e])
             
             # Process sources in parallel
             source_tasks = []
@@ -122,6 +337,8 @@ class DiscoveryEngine:
     async def get_keywords_to_search(self, competitor_ids: List[int] = None, platform_ids: List[int] = None) -> List[Dict]:
         """Get keywords that need to be searched"""
         
+        # Constant SQL text (NULL filter = all, {due} one of two fixed filters) so one
+        # prepared statement serves every call
         query = """
         SELECT k.*, c.name as competitor_name, p.name as platform_name
         FROM keywords k
@@ -130,24 +347,15 @@ class DiscoveryEngine:
         WHERE k.is_active = TRUE 
         AND c.is_active = TRUE 
         AND p.is_active = TRUE
-        AND (k.last_searched IS NULL OR 
-             k.last_searched < NOW() - INTERVAL '1 hour' * k.search_frequency_hours)
+        AND (k.last_searched IS NULL OR {due})
+        AND ($1::int[] IS NULL OR k.competitor_id = ANY($1))
+        AND ($2::int[] IS NULL OR k.platform_id = ANY($2))
+        ORDER BY k.last_searched ASC NULLS FIRST, c.priority_level ASC
         """
         
-        params = []
-        if competitor_ids:
-            query += f" AND k.competitor_id = ANY($1)"
-            params.append(competitor_ids)
-        
-        if platform_ids:
-            param_num = len(params) + 1
-            query += f" AND k.platform_id = ANY(${param_num})"
-            params.append(platform_ids)
-        
-        query += " ORDER BY k.last_searched ASC NULLS FIRST, c.priority_level ASC"
-        
-        results = await self.db.execute_query(query, tuple(params) if params else ())
-        return [dict(row) for row in results]
+        return await self.fetch_due(
+            query, KEYWORD_DUE_FILTER, KEYWORD_DUE_FILTER_INLINE, (competitor_ids or None, platform_ids or None)
+        )
     
     async def get_sources_to_monitor(self, competitor_ids: List[int] = None, platform_ids: List[int] = None) -> List[Dict]:
         """Get sources that need monitoring"""
@@ -160,112 +368,174 @@ class DiscoveryEngine:
         WHERE s.is_active = TRUE 
         AND c.is_active = TRUE 
         AND p.is_active = TRUE
-        AND (s.last_monitored IS NULL OR 
-             s.last_monitored < NOW() - INTERVAL '1 hour' * s.monitoring_frequency_hours)
+        AND (s.last_monitored IS NULL OR {due})
+        AND ($1::int[] IS NULL OR s.competitor_id = ANY($1))
+        AND ($2::int[] IS NULL OR s.platform_id = ANY($2))
+        ORDER BY s.last_monitored ASC NULLS FIRST, c.priority_level ASC
         """
         
-        params = []
-        if competitor_ids:
-            query += f" AND s.competitor_id = ANY($1)"
-            params.append(competitor_ids)
+        return await self.fetch_due(
+            query, SOURCE_DUE_FILTER, SOURCE_DUE_FILTER_INLINE, (competitor_ids or None, platform_ids or None)
+        )
+    
+    async def fetch_due(self, query: str, due_filter: str, inline_filter: str, params: tuple) -> List[Dict]:
+        """Run a keyword/source query with its {due} filter, via due_at() when the schema has it"""
+        if self.due_at_available:
+            try:
+                results = await self.db.execute_query(query.format(due=due_filter), params)
+                return [dict(row) for row in results]
+            except asyncpg.exceptions.UndefinedFunctionError:
+                logger.warning("due_at() missing; re-run new_schema.py. Using inline due filters")
+                self.due_at_available = False
+        
+        results = await self.db.execute_query(query.format(due=inline_filter), params)
+        return [dict(row) for row in results]
+    
+    async def process_keywords(self, keywords: List[Dict]) -> List[Dict]:
+        """Search keywords and stage their results as a producer/consumer pipeline
+        
+        Searches run concurrently and queue their results; stage writers drain
+        the queue in small batches, so database writes overlap the searches
+        still in flight instead of waiting for a whole batch of them.
+        """
+        results = []
+        queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_DEPTH)
+        semaphore = asyncio.Semaphore(KEYWORD_SEARCH_CONCURRENCY)
         
-        if platform_ids:
-            param_num = len(params) + 1
-            query += f" AND s.platform_id = ANY(${param_num})"
-            params.append(platform_ids)
+        async def search(keyword: Dict):
+            async with semaphore:
+                try:
+                    search_results = await self.search_keyword(keyword)
+                except Exception as e:
+                    results.append(self.keyword_failed(keyword, e))
+                    return
+            await queue.put((keyword, search_results))
         
-        query += " ORDER BY s.last_monitored ASC NULLS FIRST, c.priority_level ASC"
+        async def stage_writer():
+            while (item := await queue.get()) is not None:
+                batch = [item]
+                # Take whatever else is already waiting, without holding up this write
+                while len(batch) < STAGE_BATCH_KEYWORDS and not queue.empty():
+                    item = queue.get_nowait()
+                    if item is None:
+                        results.extend(await self.stage_keyword_results(batch))
+                        return
+                    batch.append(item)
+                results.extend(await self.stage_keyword_results(batch))
         
-        results = await self.db.execute_query(query, tuple(params) if params else ())
-        return [dict(row) for row in results]
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(STAGE_WRITERS):
+                tg.create_task(stage_writer())
+            
+            await asyncio.gather(*(search(keyword) for keyword in keywords))
+            for _ in range(STAGE_WRITERS):
+                await queue.put(None)
+        
+        return results
     
-    async def process_keyword_batch(self, keywords: List[Dict]) -> List[Dict]:
-        """Process a batch of keywords"""
+    async def stage_keyword_results(self, searched: List[Tuple[Dict, List[Dict]]]) -> List[Dict]:
+        """Add (keyword, search results) pairs to stage_results and mark the keywords searched"""
         results = []
         
-        for keyword in keywords:
-            try:
-                # Search using available services
-                search_results = await self.search_keyword(keyword)
-                
-                # Add to stage_results with deduplication
-                for result in search_results:
-                    added = await self.add_to_stage_results(result, keyword)
-                    if added:
-                        self.stats['total_urls_added'] += 1
-                    else:
-                        self.stats['total_duplicates_found'] += 1
-                
-                # Update keyword last_searched
-                await self.update_keyword_searched(keyword['keyword_id'], len(search_results))
-                
-                self.stats['total_keywords_processed'] += 1
-                self.stats['total_urls_found'] += len(search_results)
-                
-                results.append({
-                    'keyword_id': keyword['keyword_id'],
-                    'keyword': keyword['keyword'],
-                    'platform': keyword['platform_name'],
-                    'results_found': len(search_results),
-                    'success': True
-                })
-                
-            except Exception as e:
-                error_msg = f"Keyword search failed: {keyword['keyword']} on {keyword['platform_name']}: {e}"
-                logger.error(error_msg)
-                self.stats['errors'].append(error_msg)
-                
-                results.append({
-                    'keyword_id': keyword['keyword_id'],
-                    'keyword': keyword['keyword'], 
-                    'platform': keyword['platform_name'],
-                    'results_found': 0,
-                    'success': False,
-                    'error': str(e)
-                })
+        # Add the whole batch to stage_results with deduplication
+        batch_results = [result for _, search_results in searched for result in search_results]
+        added = await self.bulk_upsert_stage_results(batch_results)
+        self.count_added(added)
+        
+        # Keywords with results that could not be stored stay due, so the next cycle retries them
+        searched, unstaged = self.split_unstaged(searched, added)
+        results.extend(self.keyword_failed(keyword, Exception("Results could not be staged")) for keyword, _ in unstaged)
+        
+        # Update last_searched for the whole batch
+        try:
+            await self.update_keywords_searched(
+                [(keyword['keyword_id'], len(search_results)) for keyword, search_results in searched]
+            )
+        except Exception as e:
+            results.extend(self.keyword_failed(keyword, e) for keyword, _ in searched)
+            return results
+        
+        for keyword, search_results in searched:
+            self.stats['total_keywords_processed'] += 1
+            self.stats['total_urls_found'] += len(search_results)
+            
+            results.append({
+                'keyword_id': keyword['keyword_id'],
+                'keyword': keyword['keyword'],
+                'platform': keyword['platform_name'],
+                'results_found': len(search_results),
+                'success': True
+            })
         
         return results
     
+    def keyword_failed(self, keyword: Dict, e: Exception) -> Dict:
+        """Log a failed keyword and build its result entry"""
+        error_msg = f"Keyword search failed: {keyword['keyword']} on {keyword['platform_name']}: {e}"
+        logger.error(error_msg)
+        self.stats['errors'].append(error_msg)
+        return {
+            'keyword_id': keyword['keyword_id'],
+            'keyword': keyword['keyword'], 
+            'platform': keyword['platform_name'],
+            'results_found': 0,
+            'success': False,
+            'error': str(e)
+        }
+    
     async def search_keyword(self, keyword: Dict) -> List[Dict]:
         """Search for keyword using available services"""
         platform = keyword['platform_name']
         search_term = keyword['keyword']
         
         results = []
+        cache_ttl = int((keyword.get('search_frequency_hours') or 1) * 3600)
+        
+        def search(service: str, query: str, limit: int, call):
+            return self.cached_search(_search_cache_key(service, query, limit), cache_ttl, call)
         
         try:
             # Choose search method based on platform
             if platform == 'youtube' and self.serpapi:
                 # Use SerpAPI for YouTube search
-                serpapi_results = await self.serpapi.search_youtube(search_term, limit=20)
+                serpapi_results = await search(
+                    'serpapi_youtube', search_term, 20,
+                    lambda: self.serpapi.search_youtube(search_term, limit=20)
+                )
                 results.extend(self.format_serpapi_results(serpapi_results, keyword))
                 
             elif platform in ['facebook', 'instagram', 'twitter'] and self.brave:
                 # Use Brave Search for social media
                 search_query = f"site:{platform}.com {search_term}"
-                brave_results = await self.brave.search(search_query, limit=15)
+                brave_results = await search('brave', search_query, 15, lambda: self.brave.search(search_query, limit=15))
                 results.extend(self.format_brave_results(brave_results, keyword))
                 
             elif platform == 'tamil_news' and self.firecrawl:
                 # Use Firecrawl for news sites
-                news_sites = ['dinamalar.com', 'thanthi.tv', 'polimer.in', 'vikatan.com']
-                for site in news_sites:
-                    try:
-                        site_results = await self.firecrawl.search_site(site, search_term)
+                site_searches = await asyncio.gather(
+                    *(
+                        search(f'firecrawl:{site}', search_term, 0,
+                               lambda site=site: self.firecrawl.search_site(site, search_term))
+                        for site in NEWS_SITES
+                    ),
+                    return_exceptions=True
+                )
+                for site, site_results in zip(NEWS_SITES, site_searches):
+                    if isinstance(site_results, Exception):
+                        logger.warning(f"Firecrawl search failed for {site}: {site_results}")
+                    else:
                         results.extend(self.format_firecrawl_results(site_results, keyword))
-                    except Exception as e:
-                        logger.warning(f"Firecrawl search failed for {site}: {e}")
                         
             elif platform == 'reddit' and self.brave:
                 # Reddit search
                 search_query = f"site:reddit.com {search_term}"
-                reddit_results = await self.brave.search(search_query, limit=10)
+                reddit_results = await search('brave', search_query, 10, lambda: self.brave.search(search_query, limit=10))
                 results.extend(self.format_brave_results(reddit_results, keyword))
             
             # Fallback to Brave Search for any platform
             if not results and self.brave:
                 search_query = f"{search_term} {platform}"
-                fallback_results = await self.brave.search(search_query, limit=10)
+                fallback_results = await search('brave', search_query, 10, lambda: self.brave.search(search_query, limit=10))
                 results.extend(self.format_brave_results(fallback_results, keyword))
             
         except Exception as e:
@@ -276,6 +546,7 @@ class DiscoveryEngine:
     def format_serpapi_results(self, results: List[Dict], keyword: Dict) -> List[Dict]:
         """Format SerpAPI results for stage_results"""
         formatted = []
+        now = datetime.now(timezone.utc)
         
         for item in results:
             formatted.append({
@@ -287,7 +558,7 @@ class DiscoveryEngine:
                 'snippet': item.get('snippet', ''),
                 'author': item.get('channel', {}).get('name', ''),
                 'author_id': item.get('channel', {}).get('id', ''),
-                'published_at': self.parse_date(item.get('published_date')),
+                'published_at': self.parse_date(item.get('published_date'), now),
                 'discovery_method': 'serpapi',
                 'content_type': 'video',
                 'language': keyword.get('language', 'ta'),
@@ -300,6 +571,7 @@ class DiscoveryEngine:
     def format_brave_results(self, results: List[Dict], keyword: Dict) -> List[Dict]:
         """Format Brave Search results for stage_results"""
         formatted = []
+        now = datetime.now(timezone.utc)
         
         for item in results:
             formatted.append({
@@ -310,7 +582,7 @@ class DiscoveryEngine:
                 'title': item.get('title', ''),
                 'snippet': item.get('description', ''),
                 'author': self.extract_author_from_url(item.get('url', '')),
-                'published_at': self.parse_date(item.get('age')),
+                'published_at': self.parse_date(item.get('age'), now),
                 'discovery_method': 'brave',
                 'content_type': self.detect_content_type(item.get('url', '')),
                 'language': keyword.get('language', 'ta'),
@@ -323,6 +595,7 @@ class DiscoveryEngine:
     def format_firecrawl_results(self, results: List[Dict], keyword: Dict) -> List[Dict]:
         """Format Firecrawl results for stage_results"""
         formatted = []
+        now = datetime.now(timezone.utc)
         
         for item in results:
             formatted.append({
@@ -333,7 +606,7 @@ class DiscoveryEngine:
                 'title': item.get('title', ''),
                 'snippet': item.get('excerpt', ''),
                 'author': item.get('author', ''),
-                'published_at': self.parse_date(item.get('published_date')),
+                'published_at': self.parse_date(item.get('published_date'), now),
                 'discovery_method': 'firecrawl',
                 'content_type': 'article',
                 'language': keyword.get('language', 'ta'),
@@ -345,67 +618,99 @@ class DiscoveryEngine:
     
     async def add_to_stage_results(self, result_data: Dict, keyword: Dict = None) -> bool:
         """Add result to stage_results with deduplication check"""
+        added = await self.bulk_upsert_stage_results([result_data])
+        return bool(added[0])
+    
+    async def bulk_upsert_stage_results(self, results: List[Dict]) -> List[Optional[bool]]:
+        """Insert a batch of results into stage_results in one statement
         
+        Returns one flag per result: True if it was added, False if its URL was
+        already staged (the stored row is marked 'duplicate') or repeats an
+        earlier result in the batch, None if it could not be stored. If the
+        batch insert fails it is retried row by row, so a bad row only loses itself.
+        """
         try:
-            # Generate URL hash for deduplication
-            url = result_data['url']
-            url_hash = hashlib.sha256(url.encode()).hexdigest()
-            
-            # Check for existing URL
-            existing_query = """
-            SELECT stage_id FROM stage_results 
-            WHERE competitor_id = $1 AND platform_id = $2 AND url_hash = $3
-            """
-            existing = await self.db.execute_query(existing_query, (
-                result_data['competitor_id'],
-                result_data['platform_id'],
-                url_hash
-            ))
-            
-            if existing:
-                # Mark as duplicate
-                await self.db.execute_query(
-                    "UPDATE stage_results SET status = 'duplicate' WHERE stage_id = $1",
-                    (existing[0]['stage_id'],)
-                )
-                return False
-            
-            # Insert new result
-            insert_query = """
-            INSERT INTO stage_results (
-                competitor_id, platform_id, keyword_id, url, url_hash,
-                title, snippet, author, author_id, published_at,
-                discovery_method, content_type, language, keywords_matched,
-                status, raw_data
-            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16)
-            RETURNING stage_id
-            """
-            
-            stage_result = await self.db.execute_query(insert_query, (
-                result_data['competitor_id'],
-                result_data['platform_id'],
-                result_data.get('keyword_id'),
-                url,
-                url_hash,
-                result_data.get('title'),
-                result_data.get('snippet'),
-                result_data.get('author'),
-                result_data.get('author_id'),
-                result_data.get('published_at'),
-                result_data.get('discovery_method'),
-                result_data.get('content_type'),
-                result_data.get('language'),
-                result_data.get('keywords_matched', []),
-                'pending',
-                json.dumps(result_data.get('raw_data', {}))
-            ))
-            
-            return True
-            
+            return await self.upsert_stage_results(results)
         except Exception as e:
-            logger.error(f"Failed to add result to stage_results: {e}")
-            self.stats['errors'].append(f"Database insert failed: {e}")
-            return False
+            logger.warning(f"Batch insert into stage_results failed, retrying row by row: {e}")
+        
+        added = []
+        for result in results:
+            try:
+                added.extend(await self.upsert_stage_results([result]))
+            except Exception as e:
+                logger.error(f"Failed to add {result.get('url')} to stage_results: {e}")
+                self.stats['errors'].append(f"Database insert failed: {e}")
+                added.append(None)
+        return added
+    
+    async def upsert_stage_results(self, results: List[Dict]) -> List[bool]:
+        """bulk_upsert_stage_results without error handling: database errors propagate"""
+        if not results:
+            return []
+        
+        # Repeats inside the batch never reach the database (ON CONFLICT may not touch
+        # the same row twice in one statement), so only the first result per
+        # (competitor, platform, url_hash) is sent
+        keys = []
+        unique = {}
+        for result in results:
+            url = _strip_url_noise(result['url'])
+            key = (result['competitor_id'], result['platform_id'], _url_hash(url))
+            keys.append(key)
+            if key not in unique:
+                unique[key] = (result, url)
+        
+        # Rows go in key order so concurrent batches sharing URLs take their
+        # row locks in the same order and cannot deadlock on each other
+        staged = sorted(unique.items(), key=lambda item: item[0])
+        rows = [row for _, (row, _) in staged]
+        upserted = await self.db.execute_query(STAGE_UPSERT_SQL, (
+            [row['competitor_id'] for row in rows],
+            [row['platform_id'] for row in rows],
+            [row.get('keyword_id') for row in rows],
+            [url for _, (_, url) in staged],
+            [key[2] for key, _ in staged],
+            [row.get('title') for row in rows],
+            [row.get('snippet') for row in rows],
+            [row.get('author') for row in rows],
+            [row.get('author_id') for row in rows],
+            [row.get('published_at') for row in rows],
+            [row.get('discovery_method') for row in rows],
+            [row.get('content_type') for row in rows],
+            [row.get('language') for row in rows],
+            [_json_text(row.get('keywords_matched') or []) for row in rows],
+            [_json_text(row.get('raw_data') or {}) for row in rows]
+        ))
+        
+        inserted = {
+            (row['competitor_id'], row['platform_id'], row['url_hash']): row['inserted']
+            for row in upserted
+        }
+        
+        added = []
+        sent = set()
+        for key in keys:
+            added.append(key not in sent and inserted.get(key, False))
+            sent.add(key)
+        return added
+    
+    def count_added(self, added: List[Optional[bool]]):
+        """Record added/duplicate counts from bulk_upsert_stage_results (rows that failed count as neither)"""
+        self.stats['total_urls_added'] += added.count(True)
+        self.stats['total_duplicates_found'] += added.count(False)
+    
+    def split_unstaged(self, owners: List[Tuple[Dict, List[Dict]]], added: List[Optional[bool]]):
+        """Split (owner, results) pairs by whether every result was stored, given
+        the bulk_upsert_stage_results flags for their concatenated results"""
+        staged, unstaged = [], []
+        flags = iter(added)
+        for owner, owner_results in owners:
+            if None in islice(flags, len(owner_results)):
+                unstaged.append((owner, owner_results))
+            else:
+                staged.append((owner, owner_results))
+        return staged, unstaged
     
     async def process_manual_queue(self):
         """Process pending manual URL submissions"""
@@ -422,10 +727,13 @@ class DiscoveryEngine:
                 LIMIT 50
             """)
             
+            statuses = {}
+            queued = []
+            batch_results = []
             for manual_url in manual_urls:
                 try:
                     # Create result data for manual URL
-                    result_data = {
+                    batch_results.append({
                         'competitor_id': manual_url['competitor_id'],
                         'platform_id': manual_url['platform_id'],
                         'url': manual_url['url'],
@@ -437,49 +745,43 @@ class DiscoveryEngine:
                         'language': 'ta',
                         'keywords_matched': [],
                         'raw_data': {'manual_submission': True, 'queue_id': manual_url['queue_id']}
-                    }
-                    
-                    # Add to stage_results
-                    added = await self.add_to_stage_results(result_data)
-                    
-                    if added:
-                        # Update manual queue status
-                        await self.db.execute_query(
-                            "UPDATE manual_queue SET status = 'processed', processed_at = NOW() WHERE queue_id = $1",
-                            (manual_url['queue_id'],)
-                        )
-                        logger.info(f"✅ Manual URL processed: {manual_url['url']}")
-                    else:
-                        # Mark as duplicate
-                        await self.db.execute_query(
-                            "UPDATE manual_queue SET status = 'duplicate', processed_at = NOW() WHERE queue_id = $1",
-                            (manual_url['queue_id'],)
-                        )
-                        logger.info(f"🔄 Manual URL duplicate: {manual_url['url']}")
-                
+                    })
+                    queued.append(manual_url)
                 except Exception as e:
-                    # Mark as failed
-                    await self.db.execute_query(
-                        "UPDATE manual_queue SET status = 'failed', processed_at = NOW() WHERE queue_id = $1",
-                        (manual_url['queue_id'],)
-                    )
+                    statuses[manual_url['queue_id']] = 'failed'
                     logger.error(f"❌ Manual URL processing failed: {manual_url['url']}: {e}")
             
+            # Add all submissions to stage_results in one statement
+            try:
+                added = await self.upsert_stage_results(batch_results)
+            except Exception as e:
+                added = None
+                logger.error(f"❌ Manual URL staging failed for {len(queued)} URLs: {e}")
+            
+            for i, manual_url in enumerate(queued):
+                if added is None:
+                    statuses[manual_url['queue_id']] = 'failed'
+                elif added[i]:
+                    statuses[manual_url['queue_id']] = 'processed'
+                    logger.info(f"✅ Manual URL processed: {manual_url['url']}")
+                else:
+                    statuses[manual_url['queue_id']] = 'duplicate'
+                    logger.info(f"🔄 Manual URL duplicate: {manual_url['url']}")
+            
+            # Record every outcome with one UPDATE
+            if statuses:
+                await self.db.execute("""
+                    UPDATE manual_queue SET status = v.status, processed_at = NOW()
+                    FROM unnest($1::bigint[], $2::text[]) AS v(queue_id, status)
+                    WHERE manual_queue.queue_id = v.queue_id
+                """, list(statuses), list(statuses.values()))
+            
             logger.info(f"📎 Processed {len(manual_urls)} manual URLs")
             
         except Exception as e:
             logger.error(f"Manual queue processing failed: {e}")
             self.stats['errors'].append(f"Manual queue processing failed: {e}")
     
-    async def update_keyword_searched(self, keyword_id: int, results_found: int):
-        """Update keyword search timestamp and results count"""
-        await self.db.execute_query("""
-            UPDATE keywords 
-            SET last_searched = NOW(), 
-                total_results_found = total_results_found + $1
-            WHERE keyword_id = $2
-        """, (results_found, keyword_id))
-    
     async def update_source_monitored(self, source_id: int, content_found: int):
         """Update source monitoring timestamp and content count"""
         await self.db.execute_query("""
@@ -489,6 +791,30 @@ class DiscoveryEngine:
             WHERE source_id = $2
         """, (content_found, source_id))
     
+    async def update_keywords_searched(self, counts: List[Tuple[int, int]]):
+        """Set last_searched and add results_found for many (keyword_id, results_found) pairs in one UPDATE"""
+        if not counts:
+            return
+        await self.db.execute("""
+            UPDATE keywords 
+            SET last_searched = NOW(), 
+                total_results_found = total_results_found + v.results_found
+            FROM unnest($1::int[], $2::int[]) AS v(keyword_id, results_found)
+            WHERE keywords.keyword_id = v.keyword_id
+        """, [keyword_id for keyword_id, _ in counts], [found for _, found in counts])
+    
+    async def update_sources_monitored(self, counts: List[Tuple[int, int]]):
+        """Apply update_source_monitored for many (source_id, content_found) pairs in one UPDATE"""
+        if not counts:
+            return
+        await self.db.execute("""
+            UPDATE sources 
+            SET last_monitored = NOW(), 
+                total_content_found = total_content_found + v.content_found
+            FROM unnest($1::int[], $2::int[]) AS v(source_id, content_found)
+            WHERE sources.source_id = v.source_id
+        """, [source_id for source_id, _ in counts], [found for _, found in counts])
+    
     def batch_items(self, items: List, batch_size: int) -> List[List]:
         """Split items into batches"""
         for i in range(0, len(items), batch_size):
@@ -508,95 +834,92 @@ class DiscoveryEngine:
     
     def extract_author_from_url(self, url: str) -> str:
         """Extract author/channel name from URL"""
-        try:
-            if 'youtube.com' in url and '@' in url:
-                return url.split('@')[1].split('/')[0]
-            elif 'facebook.com' in url:
-                return url.split('facebook.com/')[1].split('/')[0]
-            elif 'instagram.com' in url:
-                return url.split('instagram.com/')[1].split('/')[0]
-            elif 'twitter.com' in url or 'x.com' in url:
-                return url.split('/')[-2] if url.count('/') > 3 else ''
-            else:
-                return ''
-        except:
-            return ''
+        site, path = _site_and_path(url)
+        extract = _AUTHOR_EXTRACTORS.get(site)
+        return extract(path) if extract else ''
     
     def detect_content_type(self, url: str) -> str:
         """Detect content type from URL"""
-        if 'youtube.com/watch' in url:
-            return 'video'
-        elif 'facebook.com/posts' in url or 'facebook.com/photo' in url:
-            return 'post'
-        elif 'instagram.com/p/' in url:
-            return 'post'
-        elif 'twitter.com' in url or 'x.com' in url:
-            return 'tweet'
-        elif 'reddit.com' in url:
-            return 'post'
-        else:
-            return 'article'
-    
-    def parse_date(self, date_str: str) -> Optional[datetime]:
-        """Parse various date formats"""
+        site, path = _site_and_path(url)
+        rule = _CONTENT_TYPE_RULES.get(site)
+        if rule and (rule[0] is None or rule[0].search(path)):
+            return rule[1]
+        return 'article'
+    
+    def parse_date(self, date_str: str, now: datetime = None) -> Optional[datetime]:
+        """Parse various date formats; relative dates ("3 hours ago") count back from now (UTC)"""
         if not date_str:
             return None
         
         try:
-            # Handle common date formats
-            if 'ago' in date_str:
-                # Parse relative dates like "2 hours ago"
-                return datetime.now() - timedelta(hours=2)  # Simplified
-            else:
-                # Try ISO format
-                return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        except:
+            # Parse relative dates like "2 hours ago"
+            relative = _RELATIVE_DATE_RE.search(date_str)
+            if relative:
+                amount, unit = relative.groups()
+                count = int(amount) if amount.isdigit() else 1
+                return (now or datetime.now(timezone.utc)) - timedelta(seconds=count * _RELATIVE_UNIT_SECONDS[unit.lower()])
+            
+            # Try ISO format
+            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        except Exception:
             return None
     
     async def process_source_batch(self, sources: List[Dict]) -> List[Dict]:
         """Process a batch of sources for monitoring"""
         results = []
+        monitored = []
+        batch_results = []
+        
+        def failed(source: Dict, e: Exception) -> Dict:
+            error_msg = f"Source monitoring failed: {source['name']}: {e}"
+            logger.error(error_msg)
+            self.stats['errors'].append(error_msg)
+            return {
+                'source_id': source['source_id'],
+                'name': source['name'],
+                'platform': source['platform_name'],
+                'content_found': 0,
+                'success': False,
+                'error': str(e)
+            }
         
         for source in sources:
             try:
                 # Monitor source for new content
                 content_results = await self.monitor_source(source)
-                
-                # Add found content to stage_results
-                for result in content_results:
-                    added = await self.add_to_stage_results(result, None)
-                    if added:
-                        self.stats['total_urls_added'] += 1
-                    else:
-                        self.stats['total_duplicates_found'] += 1
-                
-                # Update source monitoring timestamp
-                await self.update_source_monitored(source['source_id'], len(content_results))
-                
-                self.stats['total_sources_monitored'] += 1
-                self.stats['total_urls_found'] += len(content_results)
-                
-                results.append({
-                    'source_id': source['source_id'],
-                    'name': source['name'],
-                    'platform': source['platform_name'],
-                    'content_found': len(content_results),
-                    'success': True
-                })
-                
+                monitored.append((source, content_results))
+                batch_results.extend(content_results)
             except Exception as e:
-                error_msg = f"Source monitoring failed: {source['name']}: {e}"
-                logger.error(error_msg)
-                self.stats['errors'].append(error_msg)
-                
-                results.append({
-                    'source_id': source['source_id'],
-                    'name': source['name'],
-                    'platform': source['platform_name'],
-                    'content_found': 0,
-                    'success': False,
-                    'error': str(e)
-                })
+                results.append(failed(source, e))
+        
+        # Add found content to stage_results
+        added = await self.bulk_upsert_stage_results(batch_results)
+        self.count_added(added)
+        
+        # Sources with content that could not be stored stay due, so the next cycle retries them
+        monitored, unstaged = self.split_unstaged(monitored, added)
+        results.extend(failed(source, Exception("Content could not be staged")) for source, _ in unstaged)
+        
+        # Update monitoring timestamps for the whole batch
+        try:
+            await self.update_sources_monitored(
+                [(source['source_id'], len(content_results)) for source, content_results in monitored]
+            )
+        except Exception as e:
+            results.extend(failed(source, e) for source, _ in monitored)
+            return results
+        
+        for source, content_results in monitored:
+            self.stats['total_sources_monitored'] += 1
+            self.stats['total_urls_found'] += len(content_results)
+            
+            results.append({
+                'source_id': source['source_id'],
+                'name': source['name'],
+                'platform': source['platform_name'],
+                'content_found': len(content_results),
+                'success': True
+            })
         
         return results
     
@@ -634,6 +957,7 @@ class DiscoveryEngine:
     def format_channel_results(self, results: List[Dict], source: Dict) -> List[Dict]:
         """Format channel monitoring results"""
         formatted = []
+        now = datetime.now(timezone.utc)
         
         for item in results:
             formatted.append({
@@ -645,7 +969,7 @@ class DiscoveryEngine:
                 'snippet': item.get('description', ''),
                 'author': source['name'],
                 'author_id': source.get('identifier'),
-                'published_at': self.parse_date(item.get('published_date')),
+                'published_at': self.parse_date(item.get('published_date'), now),
                 'discovery_method': 'source_monitoring',
                 'content_type': 'video',
                 'language': 'ta',
@@ -658,6 +982,7 @@ class DiscoveryEngine:
     def format_source_search_results(self, results: List[Dict], source: Dict) -> List[Dict]:
         """Format source search results"""
         formatted = []
+        now = datetime.now(timezone.utc)
         
         for item in results:
             formatted.append({
@@ -668,7 +993,7 @@ class DiscoveryEngine:
                 'title': item.get('title', ''),
                 'snippet': item.get('description', ''),
                 'author': source['name'],
-                'published_at': self.parse_date(item.get('age')),
+                'published_at': self.parse_date(item.get('age'), now),
                 'discovery_method': 'source_monitoring',
                 'content_type': self.detect_content_type(item.get('url', '')),
                 'language': 'ta',
@@ -681,6 +1006,7 @@ class DiscoveryEngine:
     def format_news_crawl_results(self, results: List[Dict], source: Dict) -> List[Dict]:
         """Format news crawl results"""
         formatted = []
+        now = datetime.now(timezone.utc)
         
         for item in results:
             formatted.append({
@@ -691,7 +1017,7 @@ class DiscoveryEngine:
                 'title': item.get('title', ''),
                 'snippet': item.get('excerpt', ''),
                 'author': item.get('author', source['name']),
-                'published_at': self.parse_date(item.get('published_date')),
+                'published_at': self.parse_date(item.get('published_date'), now),
                 'discovery_method': 'source_monitoring',
                 'content_type': 'article',
                 'language': 'ta',
@@ -768,4 +1094,5 @@ if __name__ == "__main__":
             result = await engine.run_discovery_cycle()
             print(f"Discovery test result: {result}")
     
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(test_discovery())
\ No newline at end of file
@@ -767,4 +767,5 @@ if __name__ == "__main__":
             result = await engine.run_engagement_cycle(limit=5)
             print(f"Engagement test result: {result}")
     
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(test_engagement())
\ No newline at end of file
@@ -0,0 +1,14 @@
+#!/usr/bin/env python3
+"""
+Environment Loader
+Loads the project .env file once per process, however many modules ask for it
+"""
+
+import functools
+
+from dotenv import load_dotenv
+
+@functools.lru_cache(maxsize=None)
+def load_env() -> bool:
+    """Load variables from .env into os.environ (existing variables win); cached after the first call"""
+    return load_dotenv(override=False)
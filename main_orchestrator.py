@@ -12,10 +12,17 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
+# Optional libuv-based event loop
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from dotenv import load_dotenv
+from env import load_env
 from database.connection import DatabaseConnection
 from engines.discovery_engine import DiscoveryEngine
 from engines.engagement_engine import EngagementEngine
@@ -24,7 +31,7 @@ from queue_system.celery_app import app as celery_app
 from queue_system.tasks import discovery_task, engagement_task, monitoring_task, analytics_task
 
 # Load environment variables
-load_dotenv()
+load_env()
 
 # Configure logging
 logging.basicConfig(
@@ -82,6 +89,16 @@ class PoliticalIntelligenceOrchestrator:
         logger.info("Shutting down orchestrator...")
         self.is_running = False
         
+        if self.dedup_engine:
+            # Releases the similarity worker processes and the Redis cache client
+            await self.dedup_engine.close()
+            logger.info("Deduplication engine closed")
+        
+        if self.discovery_engine:
+            # Releases the Redis search cache client
+            await self.discovery_engine.close()
+            logger.info("Discovery engine closed")
+        
         if self.db:
             await self.db.close()
             logger.info("Database connection closed")
@@ -588,4 +605,6 @@ async def main():
         await orchestrator.shutdown()
 
 if __name__ == '__main__':
+    if UVLOOP_AVAILABLE:
+        uvloop.install()
     asyncio.run(main())
\ No newline at end of file
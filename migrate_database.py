@@ -10,7 +10,7 @@ import sys
 import logging
 from datetime import datetime
 from typing import Dict, List, Any
-from dotenv import load_dotenv
+from env import load_env
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -18,7 +18,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from database.connection import DatabaseConnection
 
 # Load environment variables
-load_dotenv()
+load_env()
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
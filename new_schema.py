@@ -37,6 +37,7 @@ class NewSchemaManager:
         # Pipeline tables (2-stage ETL)
         await self.create_stage_results_table()
         await self.create_final_results_table()
+        await self.create_final_results_signature()
         await self.create_manual_queue_table()
         await self.create_monitoring_schedule_table()
         
@@ -236,12 +237,29 @@ class NewSchemaManager:
             
             -- Multiple snapshots support
             is_latest BOOLEAN DEFAULT TRUE,
-            snapshot_number INTEGER DEFAULT 1
+            snapshot_number INTEGER DEFAULT 1,
+            
+            -- Exact-duplicate probe keys (see create_final_results_signature)
+            content_sig TEXT GENERATED ALWAYS AS (md5(COALESCE(title, '') || '|' || COALESCE(LEFT(content, 500), '') || '|' || COALESCE(author, ''))) STORED,
+            published_at_date DATE GENERATED ALWAYS AS ((published_at AT TIME ZONE 'UTC')::date) STORED
         );
         """
         await self.db_manager.execute_query(query)
         logger.info("✅ Created final_results table")
     
+    async def create_final_results_signature(self):
+        """Stored content signature + UTC publish date, so exact-duplicate probes are index lookups
+        instead of hashing every row (also upgrades tables created before these columns existed)"""
+        query = """
+        ALTER TABLE final_results
+            ADD COLUMN IF NOT EXISTS content_sig TEXT GENERATED ALWAYS AS
+                (md5(COALESCE(title, '') || '|' || COALESCE(LEFT(content, 500), '') || '|' || COALESCE(author, ''))) STORED,
+            ADD COLUMN IF NOT EXISTS published_at_date DATE GENERATED ALWAYS AS
+                ((published_at AT TIME ZONE 'UTC')::date) STORED;
+        """
+        await self.db_manager.execute_query(query)
+        logger.info("✅ Created final_results content signature columns")
+    
     async def create_manual_queue_table(self):
         """Manual URL submission queue"""
         query = """
@@ -471,10 +489,23 @@ class NewSchemaManager:
             "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_keywords_competitor_platform ON keywords(competitor_id, platform_id, is_active);",
             "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sources_competitor_platform ON sources(competitor_id, platform_id, is_active);",
             
+            # Discovery scheduling: due_at() adds whole hours, which does not depend on
+            # the session time zone, so it may be IMMUTABLE and used in expression indexes
+            """
+            CREATE OR REPLACE FUNCTION due_at(last_run TIMESTAMPTZ, every_hours INTEGER)
+            RETURNS TIMESTAMPTZ AS $$
+                SELECT last_run + make_interval(hours => every_hours)
+            $$ LANGUAGE sql IMMUTABLE;
+            """,
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_keywords_due ON keywords(due_at(last_searched, search_frequency_hours)) WHERE is_active = TRUE;",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_keywords_unsearched ON keywords(competitor_id, platform_id) WHERE is_active = TRUE AND last_searched IS NULL;",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sources_due ON sources(due_at(last_monitored, monitoring_frequency_hours)) WHERE is_active = TRUE;",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sources_unmonitored ON sources(competitor_id, platform_id) WHERE is_active = TRUE AND last_monitored IS NULL;",
+            
             # Stage results indexes
             "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_stage_results_status ON stage_results(status, priority DESC);",
             "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_stage_results_competitor_platform ON stage_results(competitor_id, platform_id);",
-            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_stage_results_url_hash ON stage_results(url_hash);",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_stage_results_url_hash_stage ON stage_results(url_hash, stage_id);",
             "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_stage_results_inserted ON stage_results(inserted_at DESC);",
             
             # Final results indexes
@@ -483,6 +514,7 @@ class NewSchemaManager:
             "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_final_results_engagement ON final_results(engagement_rate DESC);",
             "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_final_results_viral ON final_results(viral_score DESC);",
             "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_final_results_latest ON final_results(is_latest, scraped_at DESC);",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_final_results_content_sig ON final_results(competitor_id, platform_id, published_at_date, content_sig);",
             
             # Queue and job indexes
             "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_manual_queue_status ON manual_queue(status, priority DESC);",
@@ -502,6 +534,11 @@ class NewSchemaManager:
             "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_stage_results_fts ON stage_results USING gin(to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(snippet, '')));",
             "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_final_results_fts ON final_results USING gin(to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(content, '')));",
             
+            # Trigram indexes for content deduplication (similarity() / % operator)
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm;",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_final_results_title_trgm ON final_results USING gin(title gin_trgm_ops);",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_final_results_content_trgm ON final_results USING gin((LEFT(content, 500)) gin_trgm_ops);",
+            
             # JSONB indexes
             "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_final_results_hashtags ON final_results USING gin(hashtags);",
             "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_final_results_mentions ON final_results USING gin(mentions);"
@@ -645,4 +682,5 @@ async def main():
         raise
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(main())
\ No newline at end of file
@@ -11,7 +11,7 @@ import logging
 import json
 from datetime import datetime
 
-from aiadmk_intelligence_engine import get_intelligence_engine
+from aiadmk_intelligence_engine import get_intelligence_engine, UVLOOP_AVAILABLE
 from config import get_config, validate_system_config
 
 def setup_logging(verbose: bool = False):
@@ -218,6 +218,10 @@ Examples:
     # Setup logging
     setup_logging(args.verbose)
     
+    if UVLOOP_AVAILABLE:
+        import uvloop
+        uvloop.install()
+    
     # Determine action
     if args.test_config:
         success = asyncio.run(test_configuration())
@@ -46,6 +46,12 @@ class SchemaManager:
         # Create indexes for performance
         await self.create_all_indexes()
         
+        # Trigger-maintained counters for get_statistics
+        await self.create_admk_stats_table()
+        
+        # Server-side polling functions for due channels/keywords
+        await self.create_polling_functions()
+        
         logger.info("✅ All database tables created successfully")
     
     async def create_admk_youtube_table(self):
@@ -373,6 +379,86 @@ class SchemaManager:
         await self.db_manager.execute_query(query)
         logger.info("✅ Created system_metrics table")
     
+    async def create_admk_stats_table(self):
+        """Create per-platform post counters kept current by statement-level triggers"""
+        platforms = ['youtube', 'facebook', 'instagram', 'twitter', 'reddit', 'tamil_news']
+        
+        statements = [
+            """
+            CREATE TABLE IF NOT EXISTS admk_stats (
+                platform TEXT PRIMARY KEY,
+                post_count BIGINT NOT NULL DEFAULT 0,
+                latest_created_at TIMESTAMPTZ
+            );
+            """,
+            # One UPDATE per statement (not per row) using the transition tables, so
+            # multi-row upserts bump the counter once; ON CONFLICT updates are not counted
+            """
+            CREATE OR REPLACE FUNCTION bump_admk_stats() RETURNS trigger
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                IF TG_OP = 'INSERT' THEN
+                    UPDATE admk_stats
+                    SET post_count = post_count + (SELECT COUNT(*) FROM new_rows),
+                        latest_created_at = GREATEST(latest_created_at, (SELECT MAX(created_at) FROM new_rows))
+                    WHERE platform = TG_ARGV[0];
+                ELSE
+                    UPDATE admk_stats
+                    SET post_count = post_count - (SELECT COUNT(*) FROM old_rows)
+                    WHERE platform = TG_ARGV[0];
+                END IF;
+                RETURN NULL;
+            END $$;
+            """
+        ]
+        
+        for platform in platforms:
+            table = f"admk_{platform}"
+            statements += [
+                f"DROP TRIGGER IF EXISTS {table}_stats_insert ON {table};",
+                f"CREATE TRIGGER {table}_stats_insert AFTER INSERT ON {table} "
+                f"REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_admk_stats('{platform}');",
+                f"DROP TRIGGER IF EXISTS {table}_stats_delete ON {table};",
+                f"CREATE TRIGGER {table}_stats_delete AFTER DELETE ON {table} "
+                f"REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION bump_admk_stats('{platform}');",
+                # Backfill after the trigger exists (its lock holds off inserts until COMMIT)
+                f"INSERT INTO admk_stats (platform, post_count, latest_created_at) "
+                f"SELECT '{platform}', COUNT(*), MAX(created_at) FROM {table} "
+                f"ON CONFLICT (platform) DO NOTHING;"
+            ]
+        
+        await self.db_manager.execute("BEGIN;\n" + "\n".join(statements) + "\nCOMMIT;")
+        logger.info("✅ Created admk_stats counters and triggers")
+    
+    async def create_polling_functions(self):
+        """Create the due-channel / due-keyword functions called by the database layer"""
+        # LANGUAGE sql + STABLE lets the planner inline them, so the partial indexes still apply
+        query = """
+        CREATE OR REPLACE FUNCTION fn_channels_due(p_platform TEXT)
+        RETURNS SETOF monitored_channels
+        LANGUAGE sql STABLE AS $$
+            SELECT * FROM monitored_channels
+            WHERE is_active = true
+            AND (p_platform IS NULL OR platform = p_platform)
+            AND (last_checked IS NULL OR
+                 last_checked < NOW() - INTERVAL '1 second' * check_frequency_seconds)
+            ORDER BY priority DESC, last_checked ASC NULLS FIRST
+        $$;
+        
+        CREATE OR REPLACE FUNCTION fn_keywords_due(p_platform TEXT)
+        RETURNS SETOF search_keywords
+        LANGUAGE sql STABLE AS $$
+            SELECT * FROM search_keywords
+            WHERE is_active = true
+            AND (p_platform IS NULL OR platform = p_platform)
+            AND (last_searched IS NULL OR
+                 last_searched < NOW() - INTERVAL '1 second' * search_frequency_seconds)
+            ORDER BY last_searched ASC NULLS FIRST
+        $$;
+        """
+        await self.db_manager.execute(query)
+        logger.info("✅ Created polling functions")
+    
     async def create_all_indexes(self):
         """Create performance indexes for all tables"""
         
@@ -412,9 +498,14 @@ class SchemaManager:
             "CREATE INDEX IF NOT EXISTS idx_url_queue_status ON url_queue(status, priority DESC);",
             "CREATE INDEX IF NOT EXISTS idx_url_queue_platform ON url_queue(platform, status);",
             "CREATE INDEX IF NOT EXISTS idx_url_queue_created ON url_queue(created_at);",
+            # Partial indexes matching get_pending_urls' filter and ORDER BY (with and without platform)
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_url_queue_pending ON url_queue(priority DESC, created_at ASC) WHERE status = 'pending' AND attempts < 3;",
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_url_queue_pending_platform ON url_queue(platform, priority DESC, created_at ASC) WHERE status = 'pending' AND attempts < 3;",
             
             "CREATE INDEX IF NOT EXISTS idx_monitored_channels_platform ON monitored_channels(platform);",
             "CREATE INDEX IF NOT EXISTS idx_monitored_channels_active ON monitored_channels(is_active, last_checked);",
+            # Matches get_channels_to_check: active rows in priority / least-recently-checked order
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_monitored_channels_due ON monitored_channels(priority DESC, last_checked ASC NULLS FIRST) WHERE is_active = true;",
             
             "CREATE INDEX IF NOT EXISTS idx_search_keywords_platform ON search_keywords(platform);",
             "CREATE INDEX IF NOT EXISTS idx_search_keywords_active ON search_keywords(is_active, last_searched);",
@@ -525,4 +616,5 @@ async def main():
         raise
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(main())
\ No newline at end of file
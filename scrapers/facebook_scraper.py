@@ -241,8 +241,7 @@ class FacebookScraper:
             # Step 3: Update URL processing status
             db = await self.get_database()
             pending_urls = await db.get_pending_urls('facebook', limit=10)
-            for record in pending_urls:
-                await db.update_url_status(record['id'], 'completed')
+            await db.update_url_statuses([(record['id'], 'completed', None) for record in pending_urls])
             
             return {
                 'success': True,
@@ -126,7 +126,7 @@ class RedditScraper:
                     'scraped_at': datetime.now().isoformat()
                 }
                 
-                await db.insert_reddit_data(db_data)
+                await db.insert_reddit_data(db_data, return_id=False)
                 storage_results['stored_posts'] += 1
                 
             except Exception as e:
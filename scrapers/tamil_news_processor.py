@@ -285,8 +285,7 @@ class TamilNewsProcessor:
             # Step 3: Update URL processing status
             _, db = await self.get_services()
             pending_urls = await db.get_pending_urls('tamil_news', limit=30)
-            for record in pending_urls:
-                await db.update_url_status(record['id'], 'completed')
+            await db.update_url_statuses([(record['id'], 'completed', None) for record in pending_urls])
             
             return {
                 'success': True,
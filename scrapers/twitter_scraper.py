@@ -127,7 +127,7 @@ class TwitterScraper:
                     'scraped_at': datetime.now().isoformat()
                 }
                 
-                await db.insert_twitter_data(db_data)
+                await db.insert_twitter_data(db_data, return_id=False)
                 storage_results['stored_tweets'] += 1
                 
             except Exception as e:
@@ -309,8 +309,7 @@ class YouTubeScraper:
             # Step 3: Update URL processing status
             db = await self.get_database()
             pending_urls = await db.get_pending_urls('youtube', limit=20)
-            for record in pending_urls:
-                await db.update_url_status(record['id'], 'completed')
+            await db.update_url_statuses([(record['id'], 'completed', None) for record in pending_urls])
             
             return {
                 'success': True,
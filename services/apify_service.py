@@ -76,14 +76,14 @@ class ApifyService:
         
         try:
             logger.info(f"🚀 Starting Facebook scraper for {len(urls)} URLs...")
-            run = self.actors['facebook']['client'].call(run_input=run_input)
+            run = await asyncio.to_thread(self.actors['facebook']['client'].call, run_input=run_input)
             
             if run is None:
                 return {'success': False, 'error': 'Facebook Actor run failed'}
             
             # Fetch results from dataset
             dataset = self.client.dataset(run['defaultDatasetId'])
-            items = list(dataset.iterate_items())
+            items = await asyncio.to_thread(lambda: list(dataset.iterate_items()))
             
             logger.info(f"✅ Facebook scraping completed: {len(items)} posts extracted")
             
@@ -126,13 +126,13 @@ class ApifyService:
         
         try:
             logger.info(f"🚀 Starting YouTube scraper for {len(search_queries or [])} queries...")
-            run = self.actors['youtube']['client'].call(run_input=run_input)
+            run = await asyncio.to_thread(self.actors['youtube']['client'].call, run_input=run_input)
             
             if run is None:
                 return {'success': False, 'error': 'YouTube Actor run failed'}
             
             dataset = self.client.dataset(run['defaultDatasetId'])
-            items = list(dataset.iterate_items())
+            items = await asyncio.to_thread(lambda: list(dataset.iterate_items()))
             
             logger.info(f"✅ YouTube scraping completed: {len(items)} videos extracted")
             
@@ -169,13 +169,13 @@ class ApifyService:
         
         try:
             logger.info(f"🚀 Starting Instagram scraper for {len(direct_urls)} URLs...")
-            run = self.actors['instagram']['client'].call(run_input=run_input)
+            run = await asyncio.to_thread(self.actors['instagram']['client'].call, run_input=run_input)
             
             if run is None:
                 return {'success': False, 'error': 'Instagram Actor run failed'}
             
             dataset = self.client.dataset(run['defaultDatasetId'])
-            items = list(dataset.iterate_items())
+            items = await asyncio.to_thread(lambda: list(dataset.iterate_items()))
             
             logger.info(f"✅ Instagram scraping completed: {len(items)} posts extracted")
             
@@ -227,13 +227,13 @@ class ApifyService:
         
         try:
             logger.info(f"🚀 Starting Twitter scraper for {len(search_terms or [])} terms...")
-            run = self.actors['twitter']['client'].call(run_input=run_input)
+            run = await asyncio.to_thread(self.actors['twitter']['client'].call, run_input=run_input)
             
             if run is None:
                 return {'success': False, 'error': 'Twitter Actor run failed'}
             
             dataset = self.client.dataset(run['defaultDatasetId'])
-            items = list(dataset.iterate_items())
+            items = await asyncio.to_thread(lambda: list(dataset.iterate_items()))
             
             logger.info(f"✅ Twitter scraping completed: {len(items)} tweets extracted")
             
@@ -291,13 +291,13 @@ class ApifyService:
         
         try:
             logger.info(f"🚀 Starting Reddit scraper for {len(start_urls)} URLs...")
-            run = self.actors['reddit']['client'].call(run_input=run_input)
+            run = await asyncio.to_thread(self.actors['reddit']['client'].call, run_input=run_input)
             
             if run is None:
                 return {'success': False, 'error': 'Reddit Actor run failed'}
             
             dataset = self.client.dataset(run['defaultDatasetId'])
-            items = list(dataset.iterate_items())
+            items = await asyncio.to_thread(lambda: list(dataset.iterate_items()))
             
             logger.info(f"✅ Reddit scraping completed: {len(items)} posts extracted")
             
@@ -22,7 +22,7 @@ logger = logging.getLogger(__name__)
 class BraveSearchService:
     """Brave Search API integration for AIADMK web content discovery"""
     
-    def __init__(self):
+    def __init__(self, session: Optional[httpx.AsyncClient] = None):
         self.config = get_config()
         self.api_config = self.config.get_api_config('brave')
         
@@ -39,12 +39,14 @@ class BraveSearchService:
             'User-Agent': 'AIADMK-Intelligence-System/1.0'
         }
         
-        self.session = httpx.AsyncClient(timeout=self.timeout, headers=self.headers)
+        self._owns_session = session is None
+        self.session = session or httpx.AsyncClient(timeout=self.timeout, headers=self.headers)
         logger.info("✅ Brave Search API service initialized")
     
     async def close(self):
         """Close HTTP session"""
-        await self.session.aclose()
+        if self._owns_session:
+            await self.session.aclose()
     
     async def web_search(self, query: str, count: int = 20, offset: int = 0,
                         search_lang: str = 'en', country: str = 'IN',
@@ -66,7 +68,7 @@ class BraveSearchService:
             params['freshness'] = freshness
         
         try:
-            response = await self.session.get(self.base_url, params=params)
+            response = await self.session.get(self.base_url, params=params, headers=self.headers, timeout=self.timeout)
             response.raise_for_status()
             
             data = response.json()
@@ -364,11 +366,11 @@ class BraveSearchService:
 # Global service instance
 brave_service = None
 
-async def get_brave_service():
+async def get_brave_service(session: Optional[httpx.AsyncClient] = None):
     """Get global Brave Search service instance"""
     global brave_service
     if not brave_service:
-        brave_service = BraveSearchService()
+        brave_service = BraveSearchService(session=session)
     return brave_service
 
 async def close_brave_service():
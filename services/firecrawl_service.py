@@ -20,10 +20,13 @@ from database import get_database
 
 logger = logging.getLogger(__name__)
 
+# URLs scraped concurrently per batch in process_tamil_news_urls
+URL_BATCH_SIZE = 8
+
 class FirecrawlService:
     """Firecrawl API integration for Tamil news content extraction"""
     
-    def __init__(self):
+    def __init__(self, session: Optional[httpx.AsyncClient] = None):
         self.config = get_config()
         self.api_config = self.config.get_api_config('firecrawl')
         
@@ -40,7 +43,8 @@ class FirecrawlService:
             'User-Agent': 'AIADMK-Intelligence-System/1.0'
         }
         
-        self.session = httpx.AsyncClient(timeout=self.timeout, headers=self.headers)
+        self._owns_session = session is None
+        self.session = session or httpx.AsyncClient(timeout=self.timeout, headers=self.headers)
         
         # Tamil news sites configuration
         self.tamil_news_sites = {
@@ -80,7 +84,8 @@ class FirecrawlService:
     
     async def close(self):
         """Close HTTP session"""
-        await self.session.aclose()
+        if self._owns_session:
+            await self.session.aclose()
     
     async def scrape_url(self, url: str, formats: List[str] = None,
                         include_tags: List[str] = None,
@@ -100,7 +105,7 @@ class FirecrawlService:
         }
         
         try:
-            response = await self.session.post(f'{self.base_url}/scrape', json=payload)
+            response = await self.session.post(f'{self.base_url}/scrape', json=payload, headers=self.headers, timeout=self.timeout)
             response.raise_for_status()
             
             data = response.json()
@@ -159,7 +164,7 @@ class FirecrawlService:
             payload['excludePaths'] = exclude_paths
         
         try:
-            response = await self.session.post(f'{self.base_url}/crawl', json=payload)
+            response = await self.session.post(f'{self.base_url}/crawl', json=payload, headers=self.headers, timeout=self.timeout)
             response.raise_for_status()
             
             data = response.json()
@@ -172,7 +177,7 @@ class FirecrawlService:
                 for attempt in range(max_attempts):
                     await asyncio.sleep(10)  # Wait 10 seconds between polls
                     
-                    status_response = await self.session.get(f'{self.base_url}/crawl/status/{job_id}')
+                    status_response = await self.session.get(f'{self.base_url}/crawl/status/{job_id}', headers=self.headers, timeout=self.timeout)
                     status_data = status_response.json()
                     
                     if status_data.get('status') == 'completed':
@@ -335,27 +340,47 @@ class FirecrawlService:
             'errors': []
         }
         
-        for url in urls:
+        async def scrape_one(url: str):
             try:
-                scraped = await self.scrape_url(url)
-                
-                if scraped['success']:
-                    article_data = self.extract_article_data(scraped)
-                    results['articles'].append(article_data)
-                    results['successful_extractions'] += 1
+                return url, await self.scrape_url(url)
+            except Exception as e:
+                return url, e
+        
+        # Scrape in small batches; results are recorded as each request lands
+        for start in range(0, len(urls), URL_BATCH_SIZE):
+            batch = urls[start:start + URL_BATCH_SIZE]
+            tasks = [asyncio.create_task(scrape_one(url)) for url in batch]
+            
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    url, scraped = await next_done
                     
-                    logger.info(f"✅ Extracted article: {article_data.get('title', 'No title')[:50]}...")
-                else:
-                    results['errors'].append(scraped)
-                    results['failed_extractions'] += 1
-                
-                # Rate limiting
+                    try:
+                        if isinstance(scraped, Exception):
+                            raise scraped
+                        
+                        if scraped['success']:
+                            article_data = self.extract_article_data(scraped)
+                            logger.info(f"✅ Extracted article: {(article_data.get('title') or 'No title')[:50]}...")
+                            
+                            results['articles'].append(article_data)
+                            results['successful_extractions'] += 1
+                        else:
+                            results['errors'].append(scraped)
+                            results['failed_extractions'] += 1
+                    
+                    except Exception as e:
+                        logger.error(f"Failed to process URL {url}: {e}")
+                        results['errors'].append({'url': url, 'error': str(e)})
+                        results['failed_extractions'] += 1
+            finally:
+                # Only reached with work outstanding if the loop exits early (e.g. cancellation)
+                for task in tasks:
+                    task.cancel()
+            
+            # Rate limiting between batches
+            if start + URL_BATCH_SIZE < len(urls):
                 await asyncio.sleep(2)
-                
-            except Exception as e:
-                logger.error(f"Failed to process URL {url}: {e}")
-                results['errors'].append({'url': url, 'error': str(e)})
-                results['failed_extractions'] += 1
         
         return results
     
@@ -371,57 +396,72 @@ class FirecrawlService:
             'errors': []
         }
         
-        # Get URLs from database queue for Tamil news
-        pending_urls = await db.get_pending_urls('tamil_news', limit=20)
+        # Claim URLs from the database queue for Tamil news (safe with concurrent workers)
+        pending_urls = await db.claim_pending_urls('tamil_news', limit=20)
         
         if pending_urls:
-            url_list = [record['url'] for record in pending_urls]
-            processing_results = await self.process_tamil_news_urls(url_list)
-            
-            # Store successful articles in database
-            for article in processing_results['articles']:
-                try:
-                    # Prepare data for database insertion
-                    db_data = {
-                        'article_url': article['url'],
-                        'title': article['title'],
-                        'content': article['content'],
-                        'author': article['author'],
-                        'published_date': article['published_date'],
-                        'language': article['language'],
-                        'word_count': article['word_count'],
-                        'aiadmk_mentions': json.dumps(article['aiadmk_mentions']),
-                        'images': json.dumps(article.get('images', [])),
-                        'source_domain': urlparse(article['url']).netloc,
-                        'extracted_at': article['extracted_at']
-                    }
-                    
-                    article_id = await db.insert_tamil_news_data(db_data)
-                    
-                    if article_id:
-                        monitoring_results['new_articles'] += 1
-                        logger.info(f"💾 Stored article ID {article_id}: {article['title'][:50]}...")
+            # Claimed rows are 'in_progress'; if this run fails or is cancelled before the
+            # statuses are recorded, hand them back to the queue instead of stranding them
+            statuses_recorded = False
+            try:
+                url_list = [record['url'] for record in pending_urls]
+                processing_results = await self.process_tamil_news_urls(url_list)
                 
-                except Exception as e:
-                    logger.error(f"Failed to store article {article['url']}: {e}")
-                    monitoring_results['errors'].append({
-                        'url': article['url'],
-                        'error': f'Database storage failed: {str(e)}'
-                    })
-            
-            # Update URL processing status
-            for record in pending_urls:
-                url_id = record['id']
-                url = record['url']
+                # Store successful articles in database
+                for article in processing_results['articles']:
+                    try:
+                        # Prepare data for database insertion
+                        db_data = {
+                            'article_url': article['url'],
+                            'title': article['title'],
+                            'content': article['content'],
+                            'author': article['author'],
+                            'published_date': article['published_date'],
+                            'language': article['language'],
+                            'word_count': article['word_count'],
+                            'aiadmk_mentions': json.dumps(article['aiadmk_mentions']),
+                            'images': json.dumps(article.get('images', [])),
+                            'source_domain': urlparse(article['url']).netloc,
+                            'extracted_at': article['extracted_at']
+                        }
+                        
+                        article_id = await db.insert_tamil_news_data(db_data)
+                        
+                        if article_id:
+                            monitoring_results['new_articles'] += 1
+                            logger.info(f"💾 Stored article ID {article_id}: {article['title'][:50]}...")
+                    
+                    except Exception as e:
+                        logger.error(f"Failed to store article {article['url']}: {e}")
+                        monitoring_results['errors'].append({
+                            'url': article['url'],
+                            'error': f'Database storage failed: {str(e)}'
+                        })
                 
-                # Check if URL was processed successfully
-                processed = any(article['url'] == url for article in processing_results['articles'])
+                # Update URL processing status in one batch
+                processed_urls = {article['url'] for article in processing_results['articles']}
+                errors_by_url = {error.get('url'): error for error in processing_results['errors']}
+                status_updates = []
+                for record in pending_urls:
+                    url = record['url']
+                    
+                    # Check if URL was processed successfully
+                    if url in processed_urls:
+                        status_updates.append((record['id'], 'completed', None))
+                    else:
+                        error_info = errors_by_url.get(url, {})
+                        status_updates.append((record['id'], 'failed', error_info.get('error', 'Processing failed')))
                 
-                if processed:
-                    await db.update_url_status(url_id, 'completed')
-                else:
-                    error_info = next((error for error in processing_results['errors'] if error.get('url') == url), {})
-                    await db.update_url_status(url_id, 'failed', error_info.get('error', 'Processing failed'))
+                await db.update_url_statuses(status_updates)
+                statuses_recorded = True
+            finally:
+                if not statuses_recorded:
+                    try:
+                        await db.update_url_statuses(
+                            [(record['id'], 'pending', 'Monitoring run interrupted') for record in pending_urls]
+                        )
+                    except Exception as e:
+                        logger.error(f"Failed to release {len(pending_urls)} claimed URLs: {e}")
             
             monitoring_results.update({
                 'sites_checked': len(set(urlparse(url).netloc for url in url_list)),
@@ -435,11 +475,11 @@ class FirecrawlService:
 # Global service instance
 firecrawl_service = None
 
-async def get_firecrawl_service():
+async def get_firecrawl_service(session: Optional[httpx.AsyncClient] = None):
     """Get global Firecrawl service instance"""
     global firecrawl_service
     if not firecrawl_service:
-        firecrawl_service = FirecrawlService()
+        firecrawl_service = FirecrawlService(session=session)
     return firecrawl_service
 
 async def close_firecrawl_service():
@@ -22,7 +22,7 @@ logger = logging.getLogger(__name__)
 class SerpAPIService:
     """SerpAPI integration for AIADMK content discovery"""
     
-    def __init__(self):
+    def __init__(self, session: Optional[httpx.AsyncClient] = None):
         self.config = get_config()
         self.api_config = self.config.get_api_config('serpapi')
         
@@ -33,12 +33,15 @@ class SerpAPIService:
         self.api_key = self.api_config.api_key
         self.timeout = self.api_config.timeout
         
-        self.session = httpx.AsyncClient(timeout=self.timeout)
+        # Reuse the caller's client (and its connection pool) when one is supplied
+        self._owns_session = session is None
+        self.session = session or httpx.AsyncClient(timeout=self.timeout)
         logger.info("✅ SerpAPI service initialized")
     
     async def close(self):
         """Close HTTP session"""
-        await self.session.aclose()
+        if self._owns_session:
+            await self.session.aclose()
     
     async def search_google(self, query: str, num_results: int = 20, 
                           location: str = "Tamil Nadu, India") -> Dict[str, Any]:
@@ -56,7 +59,7 @@ class SerpAPIService:
         }
         
         try:
-            response = await self.session.get(self.base_url, params=params)
+            response = await self.session.get(self.base_url, params=params, timeout=self.timeout)
             response.raise_for_status()
             
             data = response.json()
@@ -87,7 +90,7 @@ class SerpAPIService:
         }
         
         try:
-            response = await self.session.get('https://serpapi.com/search', params=params)
+            response = await self.session.get('https://serpapi.com/search', params=params, timeout=self.timeout)
             response.raise_for_status()
             
             data = response.json()
@@ -122,7 +125,7 @@ class SerpAPIService:
         }
         
         try:
-            response = await self.session.get('https://serpapi.com/search', params=params)
+            response = await self.session.get('https://serpapi.com/search', params=params, timeout=self.timeout)
             response.raise_for_status()
             
             data = response.json()
@@ -339,11 +342,11 @@ class SerpAPIService:
 # Global service instance
 serpapi_service = None
 
-async def get_serpapi_service():
+async def get_serpapi_service(session: Optional[httpx.AsyncClient] = None):
     """Get global SerpAPI service instance"""
     global serpapi_service
     if not serpapi_service:
-        serpapi_service = SerpAPIService()
+        serpapi_service = SerpAPIService(session=session)
     return serpapi_service
 
 async def close_serpapi_service():